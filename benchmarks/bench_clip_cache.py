@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'sound_server'))
+
+from clip_cache import ClipCache, list_clips  # noqa: E402
+
+# ===================================================================
+# 재생 시작 지연 비교: mixer.music.load (매번 디코딩) vs ClipCache (미리 디코딩)
+#   python benchmarks/bench_clip_cache.py
+#   python benchmarks/bench_clip_cache.py --dir lib/sound_server/mp3 --dummy-audio
+# 기본으로 lib/sound_server/sound/ 의 선수 이름 MP3를 사용합니다.
+# ===================================================================
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'sound_server', 'sound')
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] * 1000
+
+
+def run(paths, repeat=5):
+    import pygame
+
+    # 콜드 재생: 예전 main.py 방식 (재생 순간에 파일 읽기 + 디코딩 시작)
+    cold = []
+    for _ in range(repeat):
+        for path in paths:
+            started = time.perf_counter()
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play()
+            cold.append(time.perf_counter() - started)
+            pygame.mixer.music.stop()
+
+    # 시작 시 미리 디코딩 (부팅 때 한 번 드는 비용)
+    cache = ClipCache()
+    started = time.perf_counter()
+    cache.preload(paths)
+    preload = time.perf_counter() - started
+
+    # 캐시 재생: 이미 디코딩된 Sound를 채널에 넣기만 함
+    channel = pygame.mixer.Channel(0)
+    cached = []
+    for _ in range(repeat):
+        for path in paths:
+            started = time.perf_counter()
+            channel.play(cache.get(path))
+            cached.append(time.perf_counter() - started)
+            channel.stop()
+
+    return {
+        'clips': len(paths),
+        'preload_s': preload,
+        'memory_mb': cache.stats()['used_mb'],
+        'cold_p50_ms': percentile(cold, 50),
+        'cold_max_ms': percentile(cold, 100),
+        'cached_p50_ms': percentile(cached, 50),
+        'cached_max_ms': percentile(cached, 100),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="효과음 캐시 재생 지연 벤치마크")
+    parser.add_argument('--dir', default=DEFAULT_DIR, help="MP3 폴더 (기본: lib/sound_server/sound)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--dummy-audio', action='store_true', help="사운드 장치 없이 실행 (SDL dummy 드라이버)")
+    args = parser.parse_args()
+
+    if args.dummy_audio:
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    import pygame
+    pygame.mixer.pre_init(44100, -16, 1, 2048)
+    pygame.mixer.init()
+
+    paths = list_clips(args.dir)
+    if not paths:
+        print(f"❌ 소리 파일이 없습니다: {args.dir}")
+        return
+
+    stats = run(paths, args.repeat)
+    print(f"클립 {stats['clips']}개 / 미리 디코딩 {stats['preload_s'] * 1000:.0f} ms ({stats['memory_mb']:.1f}MB)")
+    print(f"  재생 시작 (music.load): p50 {stats['cold_p50_ms']:.2f} ms / 최대 {stats['cold_max_ms']:.2f} ms")
+    print(f"  재생 시작 (ClipCache):  p50 {stats['cached_p50_ms']:.3f} ms / 최대 {stats['cached_max_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
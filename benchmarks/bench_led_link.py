@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'sound_server'))
+
+from led_emulator import EmulatedBoard  # noqa: E402
+from led_protocol import BAUDRATE, LedBoard, LedLink, encode_frame, state_commands  # noqa: E402
+
+# ===================================================================
+# LED 시리얼 전송량 비교 (demo/scenario.json 한 경기 분량)
+#   python benchmarks/bench_led_link.py
+#   python benchmarks/bench_led_link.py --burst 5     (이벤트 5개씩 몰려서 합쳐질 때)
+# 예전: 이벤트마다 한 글자 (주자/BSO/점수는 못 보냄)
+# 지금: 바뀐 값만 한 프레임 (몰리면 출력 분배기가 최신 상태 하나로 합침)
+# 에뮬레이터에 그대로 넣어 받은 상태가 서버 상태와 같은지도 확인합니다.
+# ===================================================================
+SCENARIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'demo', 'scenario.json')
+BITS_PER_BYTE = 10  # 시작/정지 비트 포함
+
+
+def replay(items, framed=True, burst=1):
+    board = LedBoard()
+    emulator = EmulatedBoard()
+    link = LedLink(emulator.feed, framed=framed)
+    pending = None
+    for i, item in enumerate(items, 1):
+        state = board.apply(item.get('led'), item.get('data'))
+        pending = state or pending
+        if pending is not None and i % burst == 0:
+            link.send(pending)
+            pending = None
+    if pending is not None:
+        link.send(pending)
+    if framed:
+        final = board.state
+        assert (emulator.bases, emulator.balls, emulator.strikes, emulator.outs, emulator.home) == \
+            (final.bases, final.balls, final.strikes, final.outs, final.home)
+    return {'frames': link.frames, 'bytes': link.bytes, 'errors': emulator.decoder.errors,
+            'airtime_ms': link.bytes * BITS_PER_BYTE / BAUDRATE * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LED 시리얼 프로토콜 전송량 벤치마크")
+    parser.add_argument('--scenario', default=SCENARIO)
+    parser.add_argument('--burst', type=int, default=1, help="이벤트 N개를 한 번에 합쳐 보냄")
+    args = parser.parse_args()
+
+    with open(args.scenario, 'r', encoding='utf-8') as f:
+        items = sorted(json.load(f), key=lambda item: item['time'])
+
+    legacy = replay(items, framed=False, burst=args.burst)
+    framed = replay(items, framed=True, burst=args.burst)
+    board = LedBoard()
+    states = [s for s in (board.apply(i.get('led'), i.get('data')) for i in items) if s]
+    full = sum(len(encode_frame(state_commands(None, s))) for s in states)
+    per_frame_us = min(timeit.repeat(lambda: [encode_frame(state_commands(None, s)) for s in states],
+                                     number=20, repeat=5)) / 20 / len(states) * 1e6
+
+    print(f"이벤트 {len(items)}개, LED 상태 변화 {len(states)}번 (합치기 {args.burst}개씩)")
+    print(f"  예전 한 글자:     {legacy['frames']:4d}번 {legacy['bytes']:5d}바이트 ({legacy['airtime_ms']:.1f}ms) - 주자/BSO/점수 없음")
+    print(f"  프레임 (변화분): {framed['frames']:4d}번 {framed['bytes']:5d}바이트 ({framed['airtime_ms']:.1f}ms), "
+          f"수신 오류 {framed['errors']}")
+    print(f"  프레임 (전체):   {len(states):4d}번 {full:5d}바이트 ({full * BITS_PER_BYTE / BAUDRATE * 1000:.1f}ms)")
+    print(f"  프레임 만들기: {per_frame_us:.1f}us/개")
+
+
+if __name__ == "__main__":
+    main()
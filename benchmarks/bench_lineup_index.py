@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'crawl'))
+
+from crawl_baseball import get_player_name_by_pcode  # noqa: E402
+from fake_relay_server import generate_game  # noqa: E402
+from lineup_index import LineupIndex  # noqa: E402
+from relay_model import EventType, Play  # noqa: E402
+
+# ===================================================================
+# pcode 조회 비용 비교: get_player_name_by_pcode (매번 전체 탐색) vs LineupIndex
+#   python benchmarks/bench_lineup_index.py
+#   python benchmarks/bench_lineup_index.py --payload recorded_game.json
+# 한 번의 폴링에서 하는 조회(플레이마다 타자 1번 + 상황판 투수/타자 2번)를 재현합니다.
+# ===================================================================
+
+
+def load_result(path):
+    """저장된 game-polling 응답(JSON) 또는 가상 경기 한 개 분량의 result를 돌려줍니다."""
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('result', data)
+
+    game = generate_game('BENCH')
+    return {
+        'textRelayData': {
+            'homeLineup': game['homeLineup'],
+            'awayLineup': game['awayLineup'],
+            'currentGameState': game['atBats'][-1]['textOptions'][-1]['currentGameState'],
+            'textRelays': game['atBats'],
+        },
+    }
+
+
+def poll_before(result_data, plays, state):
+    for play in plays:
+        get_player_name_by_pcode(result_data, play.get('currentGameState', {}).get('batter'))
+    get_player_name_by_pcode(result_data, state.get('pitcher'))
+    get_player_name_by_pcode(result_data, state.get('batter'))
+
+
+def poll_after(index, result_data, plays, state):
+    index.update(result_data['textRelayData'], plays)
+    for play in plays:
+        index.name(play.batter)
+    index.name(state.get('pitcher'))
+    index.name(state.get('batter'))
+
+
+def run(result_data, repeat=20):
+    data = result_data['textRelayData']
+    plays = [p for ab in data.get('textRelays', []) for p in ab.get('textOptions', [])]
+    # 플레이는 수집 단계에서 한 번만 Play로 변환되므로 측정에서 제외
+    # 교체 이벤트는 첫 폴링에서만 색인 재생성을 일으키도록 (이후 폴링은 같은 플레이 재조회)
+    decoded = [Play.from_json(p) for p in plays]
+    steady_plays = [p for p in decoded if p.type != EventType.SUBSTITUTION]
+    state = data.get('currentGameState', {})
+    index = LineupIndex()
+    index.update(data, decoded)
+
+    before = min(timeit.repeat(lambda: poll_before(result_data, plays, state), number=1, repeat=repeat))
+    after = min(timeit.repeat(lambda: poll_after(index, result_data, steady_plays, state), number=1, repeat=repeat))
+    return {
+        'plays': len(plays),
+        'players': len(index.players),
+        'before_ms': before * 1000,
+        'after_ms': after * 1000,
+        'speedup': before / after if after else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pcode 색인 마이크로 벤치마크")
+    parser.add_argument('--payload', help="저장된 game-polling 응답 JSON (없으면 가상 경기)")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    stats = run(load_result(args.payload), args.repeat)
+    print(f"플레이 {stats['plays']}개 / 선수 {stats['players']}명")
+    print(f"  폴링 1회 (전체 탐색): {stats['before_ms']:.3f} ms")
+    print(f"  폴링 1회 (LineupIndex): {stats['after_ms']:.3f} ms")
+    print(f"  → {stats['speedup']:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
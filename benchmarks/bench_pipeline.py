@@ -0,0 +1,330 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+CRAWL_DIR = os.path.join(ROOT_DIR, 'lib', 'crawl')
+SOUND_DIR = os.path.join(ROOT_DIR, 'lib', 'sound_server')
+SERVER_DIRS = {'server': SOUND_DIR, 'demo': os.path.join(ROOT_DIR, 'demo')}
+sys.path.insert(0, CRAWL_DIR)
+sys.path.insert(0, SOUND_DIR)
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')   # main.py가 pygame을 import함 (stdout은 JSON 전용)
+
+from bench_scenario_load import make_scenario  # noqa: E402
+
+# ===================================================================
+# 이벤트 파이프라인 전체 벤치마크 (네트워크/장치 없이, 결과는 JSON)
+#   python benchmarks/bench_pipeline.py > result.json
+#   python benchmarks/bench_pipeline.py --only crawl pi --events 20000
+#   python benchmarks/bench_pipeline.py --out new.json --baseline result.json   (이전 결과와 비교)
+# 구간:
+#   crawl    가상 경기 전체를 한 플레이씩 공개하며 crawl_baseball의 응답 처리 (json 파싱 / process_relay_result)
+#   timeline 가상 rasptimeline.txt를 main.parse_timeline으로 로드 (처음 컴파일 / 캐시 사용)
+#   server   lib/sound_server/server.py의 time_update / seek_event 처리 (Socket.IO 테스트 클라이언트)
+#   demo     demo/server.py (같은 측정, 두 서버 모두 모듈 이름이 server라서 각각 별도 프로세스)
+#   pi       TimelineScheduler + FakeMixer로 타임라인을 빨리 감아 실행했을 때 예정 시각 대비 지연
+# 같은 --seed면 같은 데이터. p50/p99가 --tolerance 이상 늘어나면 --baseline 비교에서 느려짐으로 표시
+# (값이 1ms 안쪽이라 다른 작업에 쉽게 흔들림: 같은 PC에서, 다른 작업이 없을 때 비교하세요)
+# ===================================================================
+SECTIONS = ('crawl', 'timeline', 'server', 'demo', 'pi')
+COMPARED = ('p50_ms', 'p99_ms')     # 기준 결과와 비교할 값 (평균/최댓값은 한두 번 튄 값에 흔들림)
+CLIPS = ('홈런함성', '응원가', '안타', '삼진', '박수', '타자소개')
+TIMELINE_OPTIONS = ('', '|x2', '|8s', '|@crowd', '|@callout', '|5s|@crowd')
+UPDATE_HZ = 4.0     # 브라우저가 time_update를 보내는 빈도 (templates/index.html)
+
+
+def summarize(values_ms):
+    """ms 목록 -> 개수 / 평균 / p50 / p99 / 최댓값"""
+    if not values_ms:
+        return {'count': 0}
+    values = sorted(values_ms)
+
+    def pick(p):
+        return round(values[min(len(values) - 1, int(len(values) * p / 100))], 4)
+
+    return {'count': len(values), 'mean_ms': round(sum(values) / len(values), 4),
+            'p50_ms': pick(50), 'p99_ms': pick(99), 'max_ms': round(values[-1], 4)}
+
+
+@contextlib.contextmanager
+def quiet():
+    """측정하는 코드의 print는 버림 (터미널 출력 비용은 bench_status_board.py에서 따로 잼)"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def make_timeline_lines(n, seed=1, gap=(0.5, 5.0)):
+    """경기 전체 분량의 가상 rasptimeline.txt 줄 (가끔 STOP)"""
+    rng = random.Random(seed)
+    lines = ["# bench_pipeline.py가 만든 가상 타임라인"]
+    t = 0.0
+    for _ in range(n):
+        t += rng.uniform(*gap)
+        if rng.random() < 0.05:
+            lines.append(f"{t:.2f}|STOP{rng.choice(('', '|@crowd'))}")
+        else:
+            lines.append(f"{t:.2f}|{rng.choice(CLIPS)}{rng.choice(TIMELINE_OPTIONS)}")
+    return lines
+
+
+# ------------------------------------------------------------
+# 구간별 측정
+# ------------------------------------------------------------
+def bench_crawl(args):
+    from crawl_baseball import GameState, process_relay_result
+    from fake_relay_server import build_payload, generate_game
+
+    parse_ms, process_ms = [], []
+    plays = 0
+    for index in range(args.games):
+        game_id = f"G{index}"
+        game = generate_game(game_id, seed=args.seed + index, innings=args.innings)
+        # 공개할 플레이마다 그 플레이가 나온 이닝을 요청 (중계 화면처럼 현재 이닝을 따라감)
+        innings = [at_bat['inn'] for at_bat in game['atBats'] for _ in at_bat['textOptions']]
+        state = GameState(game_id)
+        with quiet():
+            for revealed, inning in enumerate(innings, 1):
+                # 응답 만들기는 네이버 쪽 일이므로 시간에서 뺌
+                body = json.dumps(build_payload(game_id, game, inning, revealed),
+                                  ensure_ascii=False).encode('utf-8')
+                started = time.perf_counter()
+                data = json.loads(body)
+                parsed = time.perf_counter()
+                process_relay_result(state, data['result'], clear=False)
+                done = time.perf_counter()
+                parse_ms.append((parsed - started) * 1000)
+                process_ms.append((done - parsed) * 1000)
+        plays += len(state.play_log)
+
+    busy = (sum(parse_ms) + sum(process_ms)) / 1000
+    return {'games': args.games, 'innings': args.innings, 'polls': len(process_ms), 'plays': plays,
+            'polls_per_sec': round(len(process_ms) / busy, 1) if busy else None,
+            'parse': summarize(parse_ms), 'process': summarize(process_ms)}
+
+
+def bench_timeline(args):
+    import main as pi_main
+    from scenario_compiler import compiled_path, parse_timeline_lines
+
+    lines = make_timeline_lines(args.events, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rasptimeline.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        cold, warm, parse_only = [], [], []
+        with quiet():
+            for _ in range(args.repeat):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(compiled_path(path))
+                started = time.perf_counter()
+                events = pi_main.parse_timeline(path)     # 검사 + 캐시 저장까지
+                cold.append((time.perf_counter() - started) * 1000)
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                pi_main.parse_timeline(path)               # .scenario_cache에서 읽기만
+                warm.append((time.perf_counter() - started) * 1000)
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                parse_timeline_lines(lines)
+                parse_only.append((time.perf_counter() - started) * 1000)
+
+    return {'events': len(events), 'cold': summarize(cold), 'warm': summarize(warm),
+            'parse_lines': summarize(parse_only)}
+
+
+def bench_pi(args):
+    from scenario_compiler import parse_timeline_lines
+    from timeline_scheduler import DriftStats, FakeMixer, TimelineScheduler
+
+    timeline, _ = parse_timeline_lines(make_timeline_lines(args.pi_events, args.seed))
+    cycle_length = timeline[-1]['time'] + 1.0
+    speed = cycle_length / args.pi_seconds      # 경기 전체를 --pi-seconds초 안에 실행
+    mixer = FakeMixer()
+    with tempfile.TemporaryDirectory() as mp3_dir:
+        scheduler = TimelineScheduler(timeline, mixer, mp3_dir, cycle_length, speed=speed)
+        scheduler.drift = DriftStats(window=len(timeline))   # 벤치마크는 모든 지연을 보관해서 분위수 계산
+        with quiet():
+            started = time.perf_counter()
+            scheduler.run_cycle()
+            elapsed = time.perf_counter() - started
+
+    drift = scheduler.drift.samples
+    return {'events': len(timeline), 'speed': round(speed, 2), 'wall_sec': round(elapsed, 3),
+            'mean_gap_ms': round(args.pi_seconds * 1000 / len(timeline), 3),
+            'plays': sum(1 for call in mixer.calls if call[1] == 'play'),
+            'drift': summarize(drift)}
+
+
+def bench_server(args, which):
+    """서버 모듈은 import할 때 UDP 포트를 열고 scenario.json을 읽으므로 별도 프로세스에서 실행"""
+    command = [sys.executable, os.path.abspath(__file__), '--worker', which, '--seed', str(args.seed),
+               '--events', str(args.events), '--updates', str(args.updates), '--seeks', str(args.seeks)]
+    result = subprocess.run(command, cwd=SERVER_DIRS[which], capture_output=True, text=True,
+                            encoding='utf-8', timeout=600)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        return {'error': (result.stderr.strip().splitlines() or ['결과 없음'])[-1]}
+    return json.loads(lines[-1])
+
+
+def run_server_worker(args):
+    """--worker: 현재 폴더(cwd)의 server.py를 import해서 time_update / seek_event를 처리하는 시간을 잼"""
+    sys.path.insert(0, os.getcwd())
+    with quiet():
+        import server
+        server.RPI_IP = '127.0.0.1'     # 설정 전 자리표시 IP로 보내면 전송 오류만 쌓임
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scenario.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(make_scenario(args.events, args.seed), f, ensure_ascii=False)
+            server.reload_scenario(path)
+        end_time = server.timeline.times[-1] + 1.0 if len(server.timeline) else 0.0
+        client = server.socketio.test_client(server.app)
+        client.emit('seek_event', {'time': 0.0})
+
+        # 한 화면이 처음부터 끝까지 재생 (--updates번의 time_update로 나눔, 이벤트는 모두 한 번씩 나감)
+        step = end_time / args.updates
+        update_ms = []
+        for i in range(1, args.updates + 1):
+            payload = {'time': i * step, 'at': time.time(), 'rate': 1.0}
+            started = time.perf_counter()
+            client.emit('time_update', payload)
+            update_ms.append((time.perf_counter() - started) * 1000)
+
+        rng = random.Random(args.seed)
+        seek_ms = []
+        for _ in range(args.seeks):
+            payload = {'time': rng.uniform(0, end_time)}
+            started = time.perf_counter()
+            client.emit('seek_event', payload)
+            seek_ms.append((time.perf_counter() - started) * 1000)
+        client.disconnect()
+        stats = server.outputs.stats()
+
+    busy = sum(update_ms) / 1000
+    result = {
+        'events': len(server.timeline),
+        'video_sec_per_update': round(step, 3),
+        'time_update': dict(summarize(update_ms), per_sec=round(len(update_ms) / busy, 1) if busy else None,
+                            realtime_clients=round(len(update_ms) / busy / UPDATE_HZ) if busy else None),
+        'seek': dict(summarize(seek_ms), per_sec=round(len(seek_ms) / (sum(seek_ms) / 1000), 1) if seek_ms else None),
+        'outputs': {name: {key: stats[name][key] for key in ('sent', 'dropped', 'coalesced', 'errors')}
+                    for name in stats},
+    }
+    sys.__stdout__.write(json.dumps(result, ensure_ascii=False) + '\n')
+    sys.__stdout__.flush()
+    os._exit(0)     # 서버의 시나리오 감시 / 출력 스레드를 기다리지 않음
+
+
+# ------------------------------------------------------------
+# 결과 기록 / 비교
+# ------------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def flatten(tree, prefix=''):
+    """{'crawl': {'process': {'p99_ms': 1}}} -> {'crawl.process.p99_ms': 1}"""
+    flat = {}
+    for key, value in tree.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(results, baseline, tolerance):
+    """COMPARED 값이 baseline보다 tolerance 비율 이상 늘어난 항목 -> [(이름, 이전, 지금)]"""
+    old = flatten(baseline.get('results', {}))
+    slower = []
+    for name, value in flatten(results).items():
+        before = old.get(name)
+        if (name.endswith(COMPARED) and isinstance(value, (int, float)) and isinstance(before, (int, float))
+                and before > 0 and value > before * (1 + tolerance)):
+            slower.append((name, before, value))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이벤트 파이프라인 / 동기화 서버 벤치마크 (결과 JSON)")
+    parser.add_argument('--only', nargs='+', choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--games', type=int, default=3, help="crawl: 가상 경기 수")
+    parser.add_argument('--innings', type=int, default=9, help="crawl: 경기당 이닝 수")
+    parser.add_argument('--events', type=int, default=5000, help="timeline/server: 시나리오 이벤트 수")
+    parser.add_argument('--repeat', type=int, default=5, help="timeline: 로드 반복 횟수")
+    parser.add_argument('--updates', type=int, default=20000, help="server: 경기 전체를 나눌 time_update 수")
+    parser.add_argument('--seeks', type=int, default=2000, help="server: seek_event 수")
+    parser.add_argument('--pi-events', type=int, default=1000, help="pi: 타임라인 이벤트 수")
+    parser.add_argument('--pi-seconds', type=float, default=5.0, help="pi: 타임라인 전체를 실행할 실제 시간 (초)")
+    parser.add_argument('--out', help="결과 JSON 파일 (없으면 stdout)")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="이 비율 이상 느려지면 표시 (기본 20%%)")
+    parser.add_argument('--worker', choices=tuple(SERVER_DIRS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_server_worker(args)
+        return
+
+    runners = {'crawl': bench_crawl, 'timeline': bench_timeline, 'pi': bench_pi,
+               'server': lambda a: bench_server(a, 'server'), 'demo': lambda a: bench_server(a, 'demo')}
+    results = {}
+    for section in SECTIONS:
+        if section in args.only:
+            print(f"⏱️ {section} ...", file=sys.stderr)
+            results[section] = runners[section](args)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'args': {k: v for k, v in vars(args).items() if k not in ('out', 'baseline', 'worker')},
+        },
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"📝 결과 저장: {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        old_args = baseline.get('meta', {}).get('args', {})
+        changed = [key for key, value in report['meta']['args'].items()
+                   if key not in ('only', 'tolerance') and key in old_args and old_args[key] != value]
+        if changed:
+            print(f"⚠️ 기준 결과와 데이터 크기 옵션이 다름 ({', '.join(changed)}): 비교 값이 맞지 않을 수 있음",
+                  file=sys.stderr)
+        slower = compare(results, baseline, args.tolerance)
+        for name, before, value in slower:
+            print(f"⚠️ 느려짐: {name} {before} → {value}", file=sys.stderr)
+        if slower:
+            sys.exit(1)
+        print("✅ 기준 결과 대비 느려진 항목 없음", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'crawl'))
+
+from fake_relay_server import FakeRelayServer  # noqa: E402
+from relay_proxy import RelayProxy  # noqa: E402
+
+# ===================================================================
+# 중계 프록시 부하 테스트 (가짜 네이버 서버 + 프록시를 한 프로세스에서 실행)
+#   python benchmarks/bench_relay_proxy.py --clients 10 100 500 --games 3
+#   python benchmarks/bench_relay_proxy.py --subscribers 200     (SSE 구독자도 같이)
+# 화면(클라이언트)마다 my_relay.html처럼 --poll-interval초마다 /api/relay를 요청합니다.
+# 프록시가 없으면 네이버 요청 수 = 클라이언트 요청 수, 프록시를 거치면 경기 수에 비례해야 함
+# ===================================================================
+UPSTREAM_PORT = 8093
+PROXY_PORT = 3093
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def poll_client(session, url, interval, stop, result):
+    await asyncio.sleep(random.uniform(0, interval))    # 화면마다 시작 시점이 다름
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                if response.status != 200:
+                    result['errors'] += 1
+        except aiohttp.ClientError:
+            result['errors'] += 1
+        result['latency'].append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def sse_client(session, url, stop, result):
+    try:
+        async with session.get(url) as response:
+            async for line in response.content:
+                if line.startswith(b'data: '):
+                    message = json.loads(line[6:])
+                    result['messages'] += 1
+                    result['plays'] += len(message['plays'])
+                if stop.is_set():
+                    return
+    except aiohttp.ClientError:
+        result['errors'] += 1
+
+
+async def measure(clients, games, subscribers, poll_interval, duration, play_interval):
+    fake = FakeRelayServer(play_interval=play_interval)
+    upstream = web.AppRunner(fake.make_app())
+    await upstream.setup()
+    await web.TCPSite(upstream, '127.0.0.1', UPSTREAM_PORT).start()
+    proxy = RelayProxy(f"http://127.0.0.1:{UPSTREAM_PORT}")
+    runner = web.AppRunner(proxy.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', PROXY_PORT).start()
+
+    stop = asyncio.Event()
+    result = {'latency': [], 'errors': 0, 'messages': 0, 'plays': 0}
+    base = f"http://127.0.0.1:{PROXY_PORT}"
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [asyncio.create_task(poll_client(session, f"{base}/api/relay?gameId=G{i % games}&inning=1",
+                                                 poll_interval, stop, result)) for i in range(clients)]
+        tasks += [asyncio.create_task(sse_client(session, f"{base}/api/stream/G{i % games}", stop, result))
+                  for i in range(subscribers)]
+        await asyncio.sleep(poll_interval)  # 시작 구간은 빼고 측정
+        result['latency'].clear()
+        upstream_before = fake.request_count
+        client_before = proxy.client_requests
+        started = time.perf_counter()
+        await asyncio.sleep(duration)
+        elapsed = time.perf_counter() - started
+        upstream_count = fake.request_count - upstream_before
+        client_count = proxy.client_requests - client_before
+        latency = list(result['latency'])
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    await runner.cleanup()
+    await upstream.cleanup()
+    return {
+        'clients': clients,
+        'subscribers': subscribers,
+        'client_rps': client_count / elapsed,
+        'upstream_rps': upstream_count / elapsed,
+        'latency_p50_ms': percentile(latency, 50),
+        'latency_p99_ms': percentile(latency, 99),
+        'sse_messages': result['messages'],
+        'errors': result['errors'],
+        'cache': proxy.cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="중계 프록시 부하 테스트")
+    parser.add_argument('--clients', nargs='+', type=int, default=[10, 100, 500])
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--subscribers', type=int, default=0, help="SSE 구독자 수")
+    parser.add_argument('--poll-interval', type=float, default=3.0, help="화면 하나의 요청 간격 (초)")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--play-interval', type=float, default=0.5, help="가짜 경기에서 플레이가 나오는 간격 (초)")
+    args = parser.parse_args()
+
+    print(f"경기 {args.games}개, 화면당 {args.poll_interval}초마다 요청, SSE 구독자 {args.subscribers}명")
+    for clients in args.clients:
+        row = asyncio.run(measure(clients, args.games, args.subscribers, args.poll_interval,
+                                  args.duration, args.play_interval))
+        cache = row['cache']
+        print(f"  화면 {clients:4d}: 요청 {row['client_rps']:7.1f}/초 → 네이버 {row['upstream_rps']:5.2f}/초 "
+              f"(캐시 적중 {cache['hits']}, 합침 {cache['coalesced']}), "
+              f"지연 p50 {row['latency_p50_ms']:.1f}ms / p99 {row['latency_p99_ms']:.1f}ms, "
+              f"SSE 메시지 {row['sse_messages']}, 오류 {row['errors']}")
+
+
+if __name__ == "__main__":
+    main()
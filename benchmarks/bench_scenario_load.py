@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'sound_server'))
+
+import scenario_compiler  # noqa: E402
+from scenario_model import ScenarioEvent, ScenarioEvents  # noqa: E402
+from scenario_timeline import ScenarioTimeline  # noqa: E402
+
+# ===================================================================
+# 시나리오 / 타임라인 로드 시간 비교
+#   python benchmarks/bench_scenario_load.py --events 20000
+# 예전: json.load + 정렬 (서버 시작마다), 줄마다 split 파싱 (라즈베리파이)
+# 지금: 처음 한 번 컴파일(검사 포함) → 이후 .scenario_cache의 pickle만 읽음
+#       (시간 배열 + 이벤트별 bytes라서 이벤트 수가 늘어도 로드 시간이 거의 그대로)
+# ===================================================================
+LEDS = ('RESET', 'STRIKE_RED', 'BALL_YELLOW', 'HIT_GREEN', 'HOMERUN', 'BASE_1_2')
+SOUNDS = ('opening.mp3', 'cheer.mp3', 'hit_big.mp3', None)
+
+
+def make_scenario(n, seed=1):
+    """경기 전체 분량의 가짜 scenario.json 항목"""
+    rng = random.Random(seed)
+    items = []
+    t = 0.0
+    for i in range(n):
+        t += rng.uniform(0.5, 5.0)
+        items.append({
+            'time': round(t, 2), 'type': 'pitch', 'text': f"{i}번째 투구",
+            'led': rng.choice(LEDS), 'sound': rng.choice(SOUNDS),
+            'data': {'inning': f"{i // 500 + 1}회초", 'b': i % 4, 's': i % 3, 'o': i % 3, 'batter': f"타자{i % 9}"},
+        })
+    return items
+
+
+def make_timeline(n, seed=1):
+    rng = random.Random(seed)
+    lines = []
+    t = 0
+    for i in range(n):
+        t += rng.randint(1, 10)
+        lines.append(f"{t}|clip{i % 50}|{rng.choice(['x2', '8s', '@crowd', '@callout'])}")
+    return "\n".join(lines) + "\n"
+
+
+def load_scenario_legacy(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    events = [ScenarioEvent.from_json(item) for item in items]
+    return ScenarioTimeline(events)
+
+
+def run(n_events=20000, repeat=5):
+    work = tempfile.mkdtemp()
+    scenario_path = os.path.join(work, "scenario.json")
+    timeline_path = os.path.join(work, "rasptimeline.txt")
+    with open(scenario_path, 'w', encoding='utf-8') as f:
+        json.dump(make_scenario(n_events), f, ensure_ascii=False)
+    with open(timeline_path, 'w', encoding='utf-8') as f:
+        f.write(make_timeline(n_events))
+    mp3_dir = os.path.join(work, "mp3")
+
+    def best(fn):
+        return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+    def compiled_scenario():
+        packed, _, cached = scenario_compiler.load_compiled(
+            scenario_path, lambda: scenario_compiler.pack_scenario(scenario_path))
+        return ScenarioTimeline(ScenarioEvents(packed)), cached
+
+    def compiled_timeline():
+        return scenario_compiler.load_compiled(
+            timeline_path, lambda: scenario_compiler.compile_timeline(timeline_path, mp3_dir), (mp3_dir,))
+
+    def compile_only():
+        return scenario_compiler.compile_scenario(scenario_path)
+
+    compiled_scenario()
+    compiled_timeline()
+    assert compiled_scenario()[1] and compiled_timeline()[2]   # 두 번째부터는 캐시
+    return {
+        'events': n_events,
+        'scenario_legacy_ms': best(lambda: load_scenario_legacy(scenario_path)),
+        'scenario_compile_ms': best(compile_only),
+        'scenario_cached_ms': best(compiled_scenario),
+        'timeline_compile_ms': best(lambda: scenario_compiler.compile_timeline(timeline_path, mp3_dir)),
+        'timeline_cached_ms': best(compiled_timeline),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시나리오 로드 벤치마크")
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    stats = run(args.events, args.repeat)
+    print(f"이벤트 {stats['events']}개")
+    print(f"  scenario.json  json.load+정렬: {stats['scenario_legacy_ms']:.1f} ms")
+    print(f"                 컴파일(검사):   {stats['scenario_compile_ms']:.1f} ms")
+    print(f"                 캐시 로드:      {stats['scenario_cached_ms']:.1f} ms")
+    print(f"  타임라인       컴파일(검사):   {stats['timeline_compile_ms']:.1f} ms")
+    print(f"                 캐시 로드:      {stats['timeline_cached_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import socketio
+
+# ===================================================================
+# 서버 실행 방식 비교: Flask 개발 서버(스레드) vs aiohttp 비동기 서버
+#   python benchmarks/bench_server_modes.py --clients 25 50 100 200
+#   python benchmarks/bench_server_modes.py --modes async --cue-threads 4
+#   python benchmarks/bench_server_modes.py --sync push      (playback_state + cue_window)
+# 클라이언트마다 time_update 4Hz + clock_ping 2Hz를 보내고,
+# (push: 재생 상태는 처음 한 번, 이벤트 구간은 다 볼 때쯤 한 번씩만 요청)
+# clock_ping → clock_pong 왕복 시간(서버가 밀리면 길어짐)의 p99를 잽니다.
+# "유지 가능" = p99가 --target-ms(기본 50ms) 이하인 가장 많은 클라이언트 수
+# (부하 발생기도 같은 PC에서 돌기 때문에 절대값보다는 두 방식의 차이를 보세요)
+# ===================================================================
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'sound_server')
+PING_HZ = 2.0
+CUE_PREFETCH = 10.0     # templates/index.html과 같게: 받은 구간이 이만큼 남으면 다음 구간 요청
+
+
+def server_command(mode, port, cue_threads):
+    if mode == 'threading':
+        return [sys.executable, 'server.py', '--port', str(port)]
+    return [sys.executable, 'async_server.py', '--port', str(port), '--cue-threads', str(cue_threads)]
+
+
+def wait_for_port(port, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def viewer(url, index, rate, speed, stop, result, sync='time_update'):
+    client = socketio.AsyncClient(reconnection=False)
+
+    @client.on('clock_pong')
+    def on_pong(data):
+        result['rtt'].append((time.time() - data['t0']) * 1000)
+
+    @client.on('update_ui')
+    def on_update(data, at=None):
+        result['ui'] += 1
+
+    try:
+        await client.connect(url, transports=['websocket'], wait_timeout=10)
+    except Exception:
+        result['failed'] += 1
+        return
+    video_time = index * 7.0 % 100
+    if sync == 'push':
+        await client.emit('playback_state', {'time': video_time, 'at': time.time(), 'rate': speed, 'seek': True})
+        window = await client.call('cue_window', {'from': video_time, 'reset': True})
+    else:
+        await client.emit('seek_event', {'time': video_time})
+    interval = 1.0 / rate
+    ping_every = max(1, int(rate / PING_HZ))
+    tick = 0
+    next_tick = time.perf_counter() + (index % 10) * interval / 10   # 클라이언트마다 조금씩 어긋나게
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+        video_time += interval * speed
+        if sync == 'push':
+            if not window['last'] and window['to'] - video_time < CUE_PREFETCH:
+                window = await client.call('cue_window', {'from': window['to']})
+                result['sent'] += 1
+        else:
+            await client.emit('time_update', {'time': video_time, 'at': time.time(), 'rate': 1.0})
+            result['sent'] += 1
+        if tick % ping_every == 0:
+            await client.emit('clock_ping', {'t0': time.time()})
+        tick += 1
+        next_tick += interval
+    await client.disconnect()
+
+
+async def measure(url, clients, rate, speed, duration, sync='time_update'):
+    stop = asyncio.Event()
+    result = {'rtt': [], 'ui': 0, 'sent': 0, 'failed': 0}
+    tasks = [asyncio.create_task(viewer(url, i, rate, speed, stop, result, sync)) for i in range(clients)]
+    await asyncio.sleep(1.5)    # 연결 + 안정화
+    result['rtt'].clear()
+    result['sent'] = 0
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - started
+    sent = result['sent']
+    rtt = list(result['rtt'])
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        'clients': clients,
+        'failed': result['failed'],
+        'events_per_sec': sent / elapsed,
+        'rtt_p50_ms': percentile(rtt, 50),
+        'rtt_p99_ms': percentile(rtt, 99),
+        'pongs': len(rtt),
+    }
+
+
+def run_mode(mode, levels, port, cue_threads, rate, speed, duration, sync='time_update'):
+    proc = subprocess.Popen(server_command(mode, port, cue_threads), cwd=SERVER_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError(f"{mode} 서버가 시작되지 않았습니다.")
+        url = f"http://127.0.0.1:{port}"
+        return [asyncio.run(measure(url, n, rate, speed, duration, sync)) for n in levels]
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 실행 방식별 동시 접속 벤치마크")
+    parser.add_argument('--modes', nargs='+', default=['threading', 'async'], choices=['threading', 'async'])
+    parser.add_argument('--clients', nargs='+', type=int, default=[25, 50, 100, 200])
+    parser.add_argument('--cue-threads', type=int, default=0, help="async 모드의 --cue-threads")
+    parser.add_argument('--sync', default='time_update', choices=['time_update', 'push'],
+                        help="time_update: 매 프레임 전송 / push: 재생 상태 변화 + 이벤트 구간만")
+    parser.add_argument('--rate', type=float, default=4.0, help="클라이언트당 time_update 횟수/초")
+    parser.add_argument('--speed', type=float, default=10.0, help="영상 재생 배속")
+    parser.add_argument('--duration', type=float, default=5.0, help="단계별 측정 시간 (초)")
+    parser.add_argument('--port', type=int, default=5077)
+    parser.add_argument('--target-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        rows = run_mode(mode, args.clients, args.port, args.cue_threads, args.rate, args.speed, args.duration, args.sync)
+        print(f"[{mode} / {args.sync}]")
+        sustained = 0
+        for row in rows:
+            ok = row['rtt_p99_ms'] <= args.target_ms and not row['failed']
+            if ok:
+                sustained = max(sustained, row['clients'])
+            failed = f", 연결 실패 {row['failed']}" if row['failed'] else ""
+            print(f"  클라이언트 {row['clients']:4d}: {args.sync} {row['events_per_sec']:7.1f}건/초, "
+                  f"ping p50 {row['rtt_p50_ms']:6.1f}ms / p99 {row['rtt_p99_ms']:7.1f}ms{failed} {'✅' if ok else '❌'}")
+        print(f"  → p99 {args.target_ms:.0f}ms 이하 유지: 클라이언트 {sustained}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'crawl'))
+
+import crawl_baseball  # noqa: E402
+from crawl_baseball import GameState, process_relay_result  # noqa: E402
+from fake_relay_server import build_payload, generate_game  # noqa: E402
+from status_board import StatusBoard  # noqa: E402
+
+# ===================================================================
+# 터미널 출력 비용 비교: 예전 (clear 프로세스 + 전체 다시 출력) vs status_board (바뀐 칸만)
+#   python benchmarks/bench_status_board.py --games 1 4 10
+#   python benchmarks/bench_status_board.py --pitch-gap 0.05   (투구가 몰려 들어올 때)
+# 가상 경기들을 번갈아 한 플레이씩 공개하며, 응답 한 건이 --pitch-gap초마다 온다고 가정합니다.
+# 응답은 미리 만들어 디코딩해 두고 (공개한 플레이의 이닝을 요청) 두 방식에 똑같이 넣습니다.
+# 시간은 응답을 받은 뒤 상태 갱신 + 화면 출력에 걸린 시간만 잽니다.
+# 예전 방식의 clear 비용은 실제로 clear를 띄워 잰 평균값을 곱해서 계산합니다.
+# ===================================================================
+TERMINAL_SIZE = (170, 50)
+
+
+def make_results(games, plays):
+    """경기 games개를 번갈아 한 플레이씩 공개한 응답 -> [(경기 ID, 응답 JSON 문자열)]
+    요청 이닝은 방금 공개한 플레이의 이닝 (두 방식이 같은 플레이를 받도록)"""
+    sources = []
+    for i in range(games):
+        game = generate_game(f"G{i}")
+        innings = [at_bat['inn'] for at_bat in game['atBats'] for _ in at_bat['textOptions']]
+        sources.append((f"G{i}", game, innings))
+    steps = []
+    for revealed in range(1, plays + 1):
+        for game_id, game, innings in sources:
+            inning = innings[min(revealed, len(innings)) - 1]
+            steps.append((game_id, json.dumps(build_payload(game_id, game, inning, revealed)['result'])))
+    return steps
+
+
+def spawn_cost(samples=20):
+    """clear 프로세스 한 번 띄우는 데 걸리는 시간 (초)"""
+    command = ['clear'] if shutil.which('clear') else [sys.executable, '-c', '']
+    env = dict(os.environ, TERM=os.environ.get('TERM', 'xterm'))
+    started = time.perf_counter()
+    for _ in range(samples):
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    return (time.perf_counter() - started) / samples
+
+
+def run_legacy(steps, clear):
+    states = {}
+    out = io.StringIO()
+    clears = 0
+
+    def count_clear():
+        nonlocal clears
+        clears += 1
+
+    results = [(game_id, json.loads(body)) for game_id, body in steps]
+    original = crawl_baseball.clear_terminal
+    crawl_baseball.clear_terminal = count_clear   # 화면 지우기는 횟수만 세고 비용은 따로 잼
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(out):
+            for game_id, result in results:
+                if game_id not in states:
+                    states[game_id] = GameState(game_id)
+                process_relay_result(states[game_id], result, clear=clear)
+    finally:
+        crawl_baseball.clear_terminal = original
+    elapsed = time.perf_counter() - started
+    return {'bytes': len(out.getvalue().encode('utf-8')), 'clears': clears, 'elapsed': elapsed,
+            'plays': sum(len(state.play_log) for state in states.values())}
+
+
+def run_board(steps, pitch_gap):
+    states = {}
+    now = 0.0
+    board = StatusBoard(out=io.StringIO(), size=TERMINAL_SIZE, clock=lambda: now)
+    results = [(game_id, json.loads(body)) for game_id, body in steps]
+    started = time.perf_counter()
+    for game_id, result in results:
+        if game_id not in states:
+            states[game_id] = GameState(game_id)
+        board.on_result(states[game_id], result)
+        now += pitch_gap
+        board.render()     # StatusBoard.run()이 모으는 시간(due)이 끝나면 하는 일
+    board.render(force=True)
+    elapsed = time.perf_counter() - started
+    return {'bytes': board.bytes_written, 'redraws': board.redraws, 'cells': board.cells_written,
+            'elapsed': elapsed, 'plays': sum(len(state.play_log) for state in states.values())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="터미널 상황판 출력 비용 벤치마크")
+    parser.add_argument('--games', nargs='+', type=int, default=[1, 4, 10])
+    parser.add_argument('--plays', type=int, default=200, help="경기마다 공개할 플레이 수")
+    parser.add_argument('--pitch-gap', type=float, default=0.05, help="응답 사이 간격 (초, 가상 시계)")
+    args = parser.parse_args()
+
+    clear_ms = spawn_cost() * 1000
+    print(f"clear 프로세스 1회: {clear_ms:.2f}ms, 터미널 {TERMINAL_SIZE[0]}x{TERMINAL_SIZE[1]}, "
+          f"응답 간격 {args.pitch_gap}초")
+    for games in args.games:
+        steps = make_results(games, args.plays)
+        legacy = run_legacy(steps, clear=games == 1)   # 여러 경기일 때는 예전에도 지우지 않고 이어서 출력
+        board = run_board(steps, args.pitch_gap)
+        legacy_ms = legacy['elapsed'] * 1000 + legacy['clears'] * clear_ms
+        print(f"  경기 {games:3d}개 (응답 {len(steps)}건, 플레이 예전 {legacy['plays']} / 상황판 {board['plays']})")
+        print(f"    예전:      {legacy_ms:8.1f}ms, 출력 {legacy['bytes']:8d}바이트, clear {legacy['clears']}번")
+        print(f"    상황판:    {board['elapsed'] * 1000:8.1f}ms, 출력 {board['bytes']:8d}바이트, "
+              f"그리기 {board['redraws']}번 (칸 {board['cells']}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import math
+import os
+import struct
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'sound_server'))
+
+import tone_synth  # noqa: E402
+
+# ===================================================================
+# 부팅음 합성 시간 비교
+#   python benchmarks/bench_tone_synth.py
+# 예전 make_tone (샘플마다 math.sin + struct.pack) / numpy / array('h') / 디스크 캐시
+# 예전 부팅음은 합성 외에도 음마다 time.sleep(0.6)으로 1.8초를 기다렸습니다.
+# 지금은 한 버퍼로 재생만 걸어두고 바로 다음 준비로 넘어갑니다.
+# ===================================================================
+
+
+def make_tone_legacy(freq, duration):
+    """예전 main.py의 make_tone (Sound로 만들기 직전까지)"""
+    sample_rate = 44100
+    n_samples = int(sample_rate * duration)
+    buffer = bytearray()
+    for i in range(n_samples):
+        val = int(32767.0 * math.sin(2.0 * math.pi * freq * i / sample_rate))
+        buffer += struct.pack('h', val)
+    return buffer
+
+
+def chime_legacy():
+    return [make_tone_legacy(freq, tone_synth.STARTUP_TONE_SEC) for (freq,) in tone_synth.STARTUP_CHIME]
+
+
+def chime_render():
+    return tone_synth.render_sequence(tone_synth.STARTUP_CHIME, tone_synth.STARTUP_TONE_SEC,
+                                      tone_synth.STARTUP_GAP_SEC, attack=tone_synth.STARTUP_ATTACK_SEC,
+                                      release=tone_synth.STARTUP_RELEASE_SEC)
+
+
+def chime_array():
+    np = tone_synth.np
+    tone_synth.np = None
+    try:
+        return chime_render()
+    finally:
+        tone_synth.np = np
+
+
+def run(repeat=5):
+    cache_dir = tempfile.mkdtemp()
+    tone_synth.startup_chime(cache_dir=cache_dir)   # 디스크 캐시 채우기
+
+    def best(fn, n=repeat):
+        return min(timeit.repeat(fn, number=1, repeat=n)) * 1000
+
+    stats = {
+        'legacy_ms': best(chime_legacy, max(1, repeat // 2)),
+        'array_ms': best(chime_array, max(1, repeat // 2)),
+        'cached_ms': best(lambda: tone_synth.startup_chime(cache_dir=cache_dir)),
+    }
+    if tone_synth.np is not None:
+        stats['numpy_ms'] = best(chime_render)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부팅음 합성 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    stats = run(args.repeat)
+    print("부팅음 (도-레-미) 합성")
+    print(f"  예전 make_tone 3회: {stats['legacy_ms']:.1f} ms (+ 대기 1800 ms)")
+    print(f"  array('h'):        {stats['array_ms']:.1f} ms")
+    if 'numpy_ms' in stats:
+        print(f"  numpy:             {stats['numpy_ms']:.2f} ms")
+    print(f"  디스크 캐시:       {stats['cached_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
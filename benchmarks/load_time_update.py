@@ -0,0 +1,99 @@
+import argparse
+import statistics
+import threading
+import time
+
+import socketio
+
+# ===================================================================
+# 동기화 서버 부하 테스트: N개의 Socket.IO 클라이언트가 4Hz로 time_update 전송
+#   (서버 먼저 실행: cd lib/sound_server && python server.py)
+#   python benchmarks/load_time_update.py --clients 50 --duration 30
+#   python benchmarks/load_time_update.py --clients 20 --room stage   (모두 같은 방)
+# update_ui 지연 = 시간을 넘긴 time_update를 보낸 뒤 update_ui를 받을 때까지 걸린 시간
+# ===================================================================
+
+
+class FakeViewer:
+    """영상을 보는 브라우저 한 개를 흉내내는 클라이언트"""
+
+    def __init__(self, url, start_time, speed, room=None):
+        self.url = url
+        self.video_time = start_time
+        self.speed = speed
+        self.room = room
+        self.sent = 0
+        self.received = 0
+        self.latencies = []
+        self.last_emit = None
+        self.client = socketio.Client(reconnection=False)
+        self.client.on('update_ui', self.on_update)
+
+    def on_update(self, event, at=None):
+        self.received += 1
+        if self.last_emit is not None:
+            self.latencies.append(time.perf_counter() - self.last_emit)
+
+    def run(self, rate, stop):
+        self.client.connect(self.url)
+        if self.room:
+            self.client.emit('join_room', {'room': self.room})
+        self.client.emit('seek_event', {'time': self.video_time})
+        interval = 1.0 / rate
+        next_tick = time.perf_counter()
+        while not stop.is_set():
+            self.video_time += interval * self.speed
+            self.last_emit = time.perf_counter()
+            self.client.emit('time_update', {'time': self.video_time})
+            self.sent += 1
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+        self.client.disconnect()
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time_update 부하 테스트")
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--rate', type=float, default=4.0, help="클라이언트당 time_update 횟수/초")
+    parser.add_argument('--duration', type=float, default=20.0, help="측정 시간 (초)")
+    parser.add_argument('--speed', type=float, default=10.0, help="영상 재생 배속 (이벤트를 빨리 만나도록)")
+    parser.add_argument('--room', help="모든 클라이언트를 이 방에 넣음 (없으면 각자 재생)")
+    args = parser.parse_args()
+
+    # 각자 재생이면 서로 다른 위치에서, 같은 방이면 같은 위치에서 시작
+    viewers = [FakeViewer(args.url, 0.0 if args.room else i * 7.0 % 100, args.speed, args.room)
+               for i in range(args.clients)]
+    stop = threading.Event()
+    threads = [threading.Thread(target=v.run, args=(args.rate, stop), daemon=True) for v in viewers]
+
+    print(f"🧪 클라이언트 {args.clients}개 x {args.rate}Hz, {args.duration}초 측정")
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=5)
+    elapsed = time.perf_counter() - started
+
+    sent = sum(v.sent for v in viewers)
+    received = sum(v.received for v in viewers)
+    latencies = [x * 1000 for v in viewers for x in v.latencies]
+    print(f"  보낸 time_update: {sent}건 ({sent / elapsed:.0f}건/초)")
+    print(f"  받은 update_ui: {received}건")
+    if latencies:
+        print(f"  update_ui 지연 ms: 평균 {statistics.mean(latencies):.1f} / "
+              f"p50 {percentile(latencies, 50):.1f} / p95 {percentile(latencies, 95):.1f} / "
+              f"p99 {percentile(latencies, 99):.1f} / 최대 {max(latencies):.1f}")
+
+
+if __name__ == "__main__":
+    main()
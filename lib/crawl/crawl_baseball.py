@@ -1,209 +1,333 @@
-import requests
-import time
-import json
-import os
-import re 
-
-# ===================================================================
-# 설정 변수: 이 URL만 변경하면 다른 경기도 모니터링 가능
-# ===================================================================
-USER_INPUT_URL = "https://m.sports.naver.com/game/88881115KRJP02025/relay#0"
-POLLING_INTERVAL = 3  # 갱신 주기 (3초)
-# ===================================================================
-
-
-def extract_game_id(url):
-    """입력받은 URL에서 Game ID를 추출합니다."""
-    # Game ID에 문자가 포함될 수 있으므로 (\d+) -> ([\w]+)로 수정
-    match = re.search(r'/game/([\w]+)/relay', url)
-    
-    if match:
-        return match.group(1)
-    else:
-        return None
-
-# GAME_ID와 API URL, 헤더 자동 설정
-GAME_ID = extract_game_id(USER_INPUT_URL)
-if not GAME_ID:
-    print(f"오류: 입력한 URL에서 Game ID를 찾을 수 없습니다.\nURL 형식: .../game/GAME_ID/relay...")
-    exit()
-
-HEADERS = {
-    "Referer": f"https://m.sports.naver.com/game/{GAME_ID}/relay",
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
-}
-
-# 전역 변수 설정
-last_processed_seqno = 0
-current_inning = 1 
-current_pitcher_name = "---"
-current_batter_name = "---"
-first_run = True # ⚾ [추가] 첫 번째 실행인지 확인하는 플래그
-
-def clear_terminal():
-    """터미널 화면을 지웁니다."""
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def get_player_name_by_pcode(result_data, pcode):
-    """pcode를 받아서 선수 이름을 찾아 반환하는 헬퍼 함수"""
-    lineups = [
-        result_data.get('textRelayData', {}).get('homeLineup', {}).get('batter', []),
-        result_data.get('textRelayData', {}).get('homeLineup', {}).get('pitcher', []),
-        result_data.get('textRelayData', {}).get('awayLineup', {}).get('batter', []),
-        result_data.get('textRelayData', {}).get('awayLineup', {}).get('pitcher', [])
-    ]
-    
-    for lineup in lineups:
-        for player in lineup:
-            if player.get('pcode') == pcode:
-                return player.get('name', 'Unknown')
-    return 'Unknown'
-
-
-def print_current_status(result_data):
-    """현재 게임 상황을 터미널에 출력합니다."""
-    global current_batter_name, current_pitcher_name, current_inning
-    
-    try:
-        game = result_data['game']
-        data = result_data['textRelayData']
-        state = data['currentGameState']
-        
-        current_inning = data.get('inn', current_inning) 
-        
-        is_home_attack = (data['homeOrAway'] == "1")
-        defense_lineup = data['awayLineup'] if is_home_attack else data['homeLineup']
-        attack_lineup = data['homeLineup'] if is_home_attack else data['awayLineup']
-
-        pitcher_pcode = state.get('pitcher')
-        batter_pcode = state.get('batter')
-
-        current_pitcher_name = get_player_name_by_pcode(result_data, pitcher_pcode)
-        current_batter_name = get_player_name_by_pcode(result_data, batter_pcode)
-
-        # ⚾ [수정] 화면을 지우는 clear_terminal()이 여기로 이동
-        clear_terminal()
-        print(f"⚾ [{GAME_ID}] 실시간 중계 모니터링 중...")
-        print(f"   (원본 URL: {USER_INPUT_URL})")
-        print("=====================================================")
-        print(f"   {game['awayTeamName']} {state['awayScore']} : {state['homeScore']} {game['homeTeamName']}")
-        print(f"   {game['statusInfo']} (B:{state['ball']} S:{state['strike']} O:{state['out']})")
-        print("-----------------------------------------------------")
-        print(f"   투수: {current_pitcher_name}")
-        print(f"   타자: {current_batter_name}")
-        print("=====================================================\n")
-
-    except KeyError as e:
-        print(f"상태 업데이트 중 오류: 키 {e}를 찾을 수 없습니다.")
-    except Exception as e:
-        print(f"상태 업데이트 중 알 수 없는 오류: {e}")
-
-
-def check_for_new_events(plays, latest_seqno, result_data, is_first_run): # ⚾ is_first_run 파라미터 추가
-    """모든 새 이벤트를 선수 이름과 함께 출력합니다."""
-    
-    global last_processed_seqno
-    new_events_found = False
-
-    new_plays = [p for p in plays if p.get('seqno', 0) > last_processed_seqno]
-    
-    if new_plays:
-        new_plays.sort(key=lambda p: p.get('seqno', 0))
-        
-        # ⚾ [수정] 첫 실행이 아닐 때만 "새 이벤트 감지" 문구 출력
-        if not is_first_run: 
-            print("[새 이벤트 감지!]")
-        
-        for play in new_plays:
-            play_text = play.get('text', '')
-            event_type = play.get('type', 0)
-
-            batter_pcode = play.get('currentGameState', {}).get('batter')
-            batter_name = get_player_name_by_pcode(result_data, batter_pcode)
-            
-            # --- 모든 주요 이벤트 출력 ---
-            
-            # type 1: 투구 (볼, 스트라이크, 파울, 헛스윙)
-            if event_type == 1:
-                print(f"  [{batter_name}]: {play_text}")
-                new_events_found = True
-            
-            # type 13: 타석 결과 (안타, 아웃, 볼넷, 사구)
-            # type 23: 홈런
-            # type 2: 교체
-            # type 14: 주루
-            # type 24: 득점
-            # type 7: 기타 이벤트 (투수판 이탈 등)
-            elif event_type in [13, 23, 2, 14, 24, 7]:
-                clean_text = play_text.replace(' : ', ': ')
-                print(f"  [GAME]: {clean_text}")
-                new_events_found = True
-            
-        last_processed_seqno = latest_seqno
-    
-    return new_events_found
-
-# 7. 메인 루프 (3초마다 반복)
-try:
-    while True:
-        try:
-            API_URL = f"https://api-gw.sports.naver.com/schedule/games/{GAME_ID}/game-polling?inning={current_inning}&isHighlight=false"
-            
-            response = requests.get(API_URL, headers=HEADERS, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            if not data.get('success') or 'result' not in data:
-                # ⚾ [수정] 오류 발생 시 화면을 지우지 않고 현재 시간만 출력
-                print(f"[{time.strftime('%H:%M:%S')}] API 오류: {data.get('message', '알 수 없는 오류')}")
-                time.sleep(POLLING_INTERVAL)
-                continue
-
-            result_data = data['result']
-
-            # 8. ⚾ [수정] 새 이벤트가 있는지 *먼저* 확인
-            all_plays = []
-            current_max_seqno = last_processed_seqno
-            
-            relays = result_data.get('textRelayData', {}).get('textRelays', [])
-            if not relays:
-                if first_run: # 처음 실행인데 데이터가 없으면
-                     print(f"[{time.strftime('%H:%M:%S')}] 중계 데이터가 없습니다. (경기 종료 또는 대기 중)")
-                # (이미 실행 중이었다면, 마지막 상태를 유지하고 아무것도 안함)
-                time.sleep(POLLING_INTERVAL)
-                continue
-
-            for at_bat in relays:
-                for play in at_bat.get('textOptions', []):
-                    all_plays.append(play)
-                    current_max_seqno = max(current_max_seqno, play.get('seqno', 0))
-
-            # 9. ⚾ [수정] 마지막 seqno와 비교하여 갱신할지 결정
-            if current_max_seqno > last_processed_seqno or first_run:
-                
-                # 10. 터미널에 현재 상황판 출력 (이 함수 안에서 clear_terminal() 호출)
-                print_current_status(result_data)
-
-                # 11. 새로운 이벤트가 있는지 확인 및 출력 (first_run 플래그 전달)
-                check_for_new_events(all_plays, current_max_seqno, result_data, first_run)
-                
-                first_run = False # 첫 실행 플래그 비활성화
-            
-            # else:
-            #   (새 이벤트가 없으면 아무것도 하지 않음)
-
-            # 12. 3초 대기
-            time.sleep(POLLING_INTERVAL)
-
-        except requests.exceptions.RequestException as e:
-            print(f"[{time.strftime('%H:%M:%S')}] 네트워크 오류: {e}")
-            time.sleep(POLLING_INTERVAL)
-        except json.JSONDecodeError:
-            print(f"[{time.strftime('%H:%M:%S')}] JSON 파싱 오류. (데이터 형식 문제)")
-            time.sleep(POLLING_INTERVAL)
-        except Exception as e:
-            print(f"[{time.strftime('%H:%M:%S')}] 알 수 없는 오류: {e}")
-            time.sleep(POLLING_INTERVAL)
-
-except KeyboardInterrupt:
-    print("\n👋 모니터링을 종료합니다.")
\ No newline at end of file
+import requests
+import time
+import json
+import os
+import re
+import sys
+
+# 지표(metrics.py)는 서버/라즈베리파이와 같은 것을 씀 (lib/sound_server)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sound_server'))
+
+from lineup_index import LineupIndex
+from metrics import COUNT_BUCKETS, FAST_BUCKETS_MS, LOG, REGISTRY, Timer, setup as setup_metrics
+from play_store import PlayStore
+from polling_scheduler import PollingScheduler
+from relay_capture import CaptureRecorder
+from relay_ingest import RelayIngestor
+from relay_model import EventType, GAME_EVENT_TYPES
+
+# ===================================================================
+# 설정 변수: 이 URL만 변경하면 다른 경기도 모니터링 가능
+# ===================================================================
+USER_INPUT_URL = "https://m.sports.naver.com/game/88881115KRJP02025/relay#0"
+POLLING_INTERVAL = 3  # 기본 갱신 주기 (3초, 경기 상황에 따라 polling_scheduler.py가 조절)
+API_BASE = "https://api-gw.sports.naver.com"  # 로컬 가짜 서버 테스트 시 변경
+CAPTURE_FILE = None  # 예: "capture.jsonl.gz" 로 지정하면 응답을 기록 (relay_capture.py로 재생)
+PLAY_STORE = None  # 예: "plays.db" 로 지정하면 플레이/경기 상태/라인업을 저장 (play_store.py로 조회)
+METRICS_PORT = None  # 예: 9100 으로 지정하면 http://localhost:9100/metrics 에 지표 (요청/파싱 시간 등)
+JSON_LOG = None  # 예: "crawl.log" 로 지정하면 폴링마다 JSON 한 줄 기록
+# ===================================================================
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"  # 화면 지우기 + 커서를 왼쪽 위로
+_ansi_enabled = False
+
+# 크롤러 지표 (relay_poller.py / live_events.py도 같은 것을 씀)
+FETCH_MS = REGISTRY.histogram('crawl_fetch_ms', "game-polling 요청 한 번 (응답 본문까지, ms)")
+PARSE_MS = REGISTRY.histogram('crawl_parse_ms', "응답 JSON 파싱 (ms)", FAST_BUCKETS_MS)
+PROCESS_MS = REGISTRY.histogram('crawl_process_ms', "응답 처리: 새 플레이 골라내기 + 출력/신호 (ms)", FAST_BUCKETS_MS)
+PLAYS_PER_POLL = REGISTRY.histogram('crawl_plays_per_poll', "폴링 한 번에 새로 나온 플레이 수", COUNT_BUCKETS)
+PLAYS_TOTAL = REGISTRY.counter('crawl_plays_total', "새로 처리한 플레이 수")
+
+
+def count_poll(result):
+    """폴링 결과별 횟수 (ok / unchanged / api_error / network_error / parse_error / error)"""
+    REGISTRY.counter('crawl_polls_total', "폴링 횟수 (결과별)", result=result).inc()
+
+
+def observe_poll(state, new_plays, fetch_ms, parse_ms, process_ms):
+    """새 응답 한 건을 처리한 뒤 지표/로그 기록"""
+    count_poll('ok')
+    PROCESS_MS.observe(process_ms)
+    PLAYS_PER_POLL.observe(len(new_plays))
+    PLAYS_TOTAL.inc(len(new_plays))
+    LOG('poll', game=state.game_id, inning=state.current_inning, plays=len(new_plays),
+        seqno=state.last_processed_seqno, fetch_ms=round(fetch_ms, 2), parse_ms=round(parse_ms, 3),
+        process_ms=round(process_ms, 3), phase=state.scheduler.phase)
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
+
+
+def extract_game_id(url):
+    """입력받은 URL에서 Game ID를 추출합니다."""
+    # Game ID에 문자가 포함될 수 있으므로 (\d+) -> ([\w]+)로 수정
+    match = re.search(r'/game/([\w]+)/relay', url)
+
+    if match:
+        return match.group(1)
+    else:
+        return None
+
+
+def build_headers(game_id):
+    """네이버 모바일 페이지에서 요청한 것처럼 헤더를 만듭니다."""
+    return {
+        "Referer": f"https://m.sports.naver.com/game/{game_id}/relay",
+        "User-Agent": USER_AGENT
+    }
+
+
+def build_api_url(game_id, inning, api_base=API_BASE):
+    """game-polling API 주소를 만듭니다."""
+    return f"{api_base}/schedule/games/{game_id}/game-polling?inning={inning}&isHighlight=false"
+
+
+class GameState:
+    """경기 하나의 진행 상태 (예전 전역 변수들을 경기별 객체로 분리)"""
+
+    def __init__(self, game_id, source_url=None):
+        self.game_id = game_id
+        self.source_url = source_url or f"https://m.sports.naver.com/game/{game_id}/relay"
+        self.headers = build_headers(game_id)
+        self.last_processed_seqno = 0
+        self.current_inning = 1
+        self.current_pitcher_name = "---"
+        self.current_batter_name = "---"
+        self.first_run = True # ⚾ 첫 번째 실행인지 확인하는 플래그
+        self.ingestor = RelayIngestor() # 타석별 seqno 워터마크 + 응답 변경 감지
+        self.lineup = LineupIndex() # pcode -> 선수 색인 (교체 때만 갱신)
+        self.scheduler = PollingScheduler(default_interval=POLLING_INTERVAL, backoff_base=POLLING_INTERVAL)
+        self.play_log = [] # 지금까지 처리한 Play 목록 (seqno 순)
+
+
+def clear_terminal():
+    """터미널 화면을 지웁니다. (ANSI 이스케이프, 예전처럼 clear 프로세스를 띄우지 않음)"""
+    global _ansi_enabled
+    if not _ansi_enabled and os.name == 'nt':
+        os.system('')  # 윈도우 콘솔에서 ANSI 이스케이프 켜기 (처음 한 번만)
+    _ansi_enabled = True
+    print(CLEAR_SCREEN, end='', flush=True)
+
+def get_player_name_by_pcode(result_data, pcode):
+    """pcode를 받아서 선수 이름을 찾아 반환하는 헬퍼 함수 (매번 전체 탐색, 반복 조회는 LineupIndex 사용)"""
+    lineups = [
+        result_data.get('textRelayData', {}).get('homeLineup', {}).get('batter', []),
+        result_data.get('textRelayData', {}).get('homeLineup', {}).get('pitcher', []),
+        result_data.get('textRelayData', {}).get('awayLineup', {}).get('batter', []),
+        result_data.get('textRelayData', {}).get('awayLineup', {}).get('pitcher', [])
+    ]
+
+    for lineup in lineups:
+        for player in lineup:
+            if player.get('pcode') == pcode:
+                return player.get('name', 'Unknown')
+    return 'Unknown'
+
+
+def print_current_status(state, result_data, clear=True):
+    """현재 게임 상황을 터미널에 출력합니다."""
+    try:
+        game = result_data['game']
+        data = result_data['textRelayData']
+        game_state = data['currentGameState']
+
+        is_home_attack = (data['homeOrAway'] == "1")
+        defense_lineup = data['awayLineup'] if is_home_attack else data['homeLineup']
+        attack_lineup = data['homeLineup'] if is_home_attack else data['awayLineup']
+
+        pitcher_pcode = game_state.get('pitcher')
+        batter_pcode = game_state.get('batter')
+
+        state.current_pitcher_name = state.lineup.name(pitcher_pcode)
+        state.current_batter_name = state.lineup.name(batter_pcode)
+
+        # ⚾ 여러 경기를 동시에 볼 때는 화면을 지우지 않음 (clear=False)
+        if clear:
+            clear_terminal()
+        print(f"⚾ [{state.game_id}] 실시간 중계 모니터링 중...")
+        print(f"   (원본 URL: {state.source_url})")
+        print("=====================================================")
+        print(f"   {game['awayTeamName']} {game_state['awayScore']} : {game_state['homeScore']} {game['homeTeamName']}")
+        print(f"   {game['statusInfo']} (B:{game_state['ball']} S:{game_state['strike']} O:{game_state['out']})")
+        print("-----------------------------------------------------")
+        print(f"   투수: {state.current_pitcher_name}")
+        print(f"   타자: {state.current_batter_name}")
+        print("=====================================================\n")
+
+    except KeyError as e:
+        print(f"상태 업데이트 중 오류: 키 {e}를 찾을 수 없습니다.")
+    except Exception as e:
+        print(f"상태 업데이트 중 알 수 없는 오류: {e}")
+
+
+def check_for_new_events(state, new_plays, result_data, is_first_run): # ⚾ is_first_run 파라미터 추가
+    """새 이벤트(이미 seqno 순으로 걸러진 플레이)를 선수 이름과 함께 출력합니다."""
+    new_events_found = False
+
+    if new_plays:
+        # ⚾ [수정] 첫 실행이 아닐 때만 "새 이벤트 감지" 문구 출력
+        if not is_first_run:
+            print("[새 이벤트 감지!]")
+
+        for play in new_plays:
+            # --- 모든 주요 이벤트 출력 ---
+
+            # type 1: 투구 (볼, 스트라이크, 파울, 헛스윙)
+            if play.type == EventType.PITCH:
+                print(f"  [{state.lineup.name(play.batter)}]: {play.text}")
+                new_events_found = True
+
+            # type 13: 타석 결과 (안타, 아웃, 볼넷, 사구)
+            # type 23: 홈런
+            # type 2: 교체
+            # type 14: 주루
+            # type 24: 득점
+            # type 7: 기타 이벤트 (투수판 이탈 등)
+            elif play.type in GAME_EVENT_TYPES:
+                clean_text = play.text.replace(' : ', ': ')
+                print(f"  [GAME]: {clean_text}")
+                new_events_found = True
+
+    return new_events_found
+
+
+def apply_relay_result(state, result_data):
+    """API 결과 한 건으로 경기 상태만 갱신 (출력 없음) -> 새 플레이 목록
+    터미널 출력 / 폴러 / 프록시 / 실시간 이벤트 / 저장이 모두 이 함수로 상태를 바꿈"""
+    relay_data = result_data.get('textRelayData', {})
+    relays = relay_data.get('textRelays', [])
+    # 다음 요청의 이닝은 응답마다 갱신 (새 플레이가 없어도: 이닝이 바뀌면 지난 이닝 조회에는 새 플레이가 안 나옴)
+    state.current_inning = relay_data.get('inn', state.current_inning)
+    if not relays:
+        state.scheduler.record_result(result_data)
+        return []
+
+    # 8. ⚾ [수정] 변화가 있는 타석에서만 새 플레이를 골라냄 (relay_ingest.py)
+    new_plays, current_max_seqno = state.ingestor.ingest(relays, state.last_processed_seqno)
+    state.play_log.extend(new_plays)
+    state.lineup.update(relay_data, new_plays)
+    state.scheduler.record_result(result_data, new_plays)
+    state.last_processed_seqno = current_max_seqno
+    state.first_run = False
+    return new_plays
+
+
+def process_relay_result(state, result_data, clear=True):
+    """API 결과 한 건을 처리합니다. 화면을 갱신했으면 True를 반환합니다."""
+    first_run = state.first_run
+    new_plays = apply_relay_result(state, result_data)
+    if not result_data.get('textRelayData', {}).get('textRelays'):
+        if first_run: # 처음 실행인데 데이터가 없으면
+             print(f"[{time.strftime('%H:%M:%S')}] [{state.game_id}] 중계 데이터가 없습니다. (경기 종료 또는 대기 중)")
+        # (이미 실행 중이었다면, 마지막 상태를 유지하고 아무것도 안함)
+        return False
+
+    # 9. ⚾ [수정] 새 플레이가 있거나 첫 실행일 때만 갱신
+    if new_plays or first_run:
+
+        # 10. 터미널에 현재 상황판 출력 (clear=True면 clear_terminal() 호출)
+        print_current_status(state, result_data, clear=clear)
+
+        # 11. 새로운 이벤트 출력 (first_run 플래그 전달)
+        check_for_new_events(state, new_plays, result_data, first_run)
+        return True
+
+    # (새 이벤트가 없으면 아무것도 하지 않음)
+    return False
+
+
+# 7. 메인 루프 (경기 상황에 따라 주기 조절, polling_scheduler.py)
+def main():
+    # GAME_ID와 API URL, 헤더 자동 설정
+    game_id = extract_game_id(USER_INPUT_URL)
+    if not game_id:
+        print(f"오류: 입력한 URL에서 Game ID를 찾을 수 없습니다.\nURL 형식: .../game/GAME_ID/relay...")
+        return
+
+    state = GameState(game_id, USER_INPUT_URL)
+    recorder = CaptureRecorder(CAPTURE_FILE) if CAPTURE_FILE else None
+    store = PlayStore(PLAY_STORE) if PLAY_STORE else None
+    setup_metrics(METRICS_PORT, JSON_LOG)
+
+    # ⚾ 화면을 지우고 전부 다시 출력하지 않고, 상황판(status_board.py)으로 바뀐 줄만 다시 씀
+    from status_board import StatusBoard
+    board = StatusBoard()
+
+    def log(message):
+        board.log(f"[{time.strftime('%H:%M:%S')}] {message}")
+        board.flush()
+
+    try:
+        while not state.scheduler.finished:
+            try:
+                api_url = build_api_url(state.game_id, state.current_inning)
+
+                headers = dict(state.headers, **state.ingestor.conditional_headers())
+                with Timer(FETCH_MS) as fetch:
+                    response = requests.get(api_url, headers=headers, timeout=5)
+
+                # ⚾ 응답이 지난번과 같으면 (304 또는 같은 내용) JSON 파싱 없이 대기
+                if response.status_code == 304:
+                    state.scheduler.record_unchanged()
+                    count_poll('unchanged')
+                else:
+                    response.raise_for_status()
+                    if state.ingestor.is_unchanged(response.content, response.headers.get('ETag')):
+                        state.scheduler.record_unchanged()
+                        count_poll('unchanged')
+                    else:
+                        with Timer(PARSE_MS) as parse:
+                            data = json.loads(response.content)
+                        if recorder:
+                            recorder.record(state.game_id, state.current_inning, data)
+
+                        if not data.get('success') or 'result' not in data:
+                            # ⚾ [수정] 오류 발생 시 화면을 지우지 않고 맨 아래 줄에 현재 시간만 출력
+                            log(f"API 오류: {data.get('message', '알 수 없는 오류')}")
+                            state.scheduler.record_error()
+                            count_poll('api_error')
+                        else:
+                            state.ingestor.accept()
+                            before = len(state.play_log)
+                            started = time.perf_counter()
+                            board.on_result(state, data['result'])
+                            board.flush()
+                            process_ms = (time.perf_counter() - started) * 1000
+                            new_plays = state.play_log[before:]
+                            if store:
+                                store.save(state, data['result'], new_plays)
+                            observe_poll(state, new_plays, fetch.ms, parse.ms, process_ms)
+                            if state.first_run:
+                                log(f"[{state.game_id}] 중계 데이터가 없습니다. (경기 종료 또는 대기 중)")
+
+            except requests.exceptions.RequestException as e:
+                log(f"네트워크 오류: {e}")
+                state.scheduler.record_error()
+                count_poll('network_error')
+            except json.JSONDecodeError:
+                log("JSON 파싱 오류. (데이터 형식 문제)")
+                state.scheduler.record_error()
+                count_poll('parse_error')
+            except Exception as e:
+                log(f"알 수 없는 오류: {e}")
+                state.scheduler.record_error()
+                count_poll('error')
+
+            # 12. 다음 폴링까지 대기 (타석 중 2초, 공수교대 10초, 오류 시 백오프 ...)
+            if not state.scheduler.finished:
+                time.sleep(state.scheduler.next_interval())
+
+        log("🏁 경기가 종료되어 모니터링을 마칩니다.")
+
+    except KeyboardInterrupt:
+        board.log("👋 모니터링을 종료합니다.")
+    finally:
+        board.close()
+        if recorder:
+            recorder.close()
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import random
+import time
+
+from aiohttp import web
+
+# ===================================================================
+# 로컬 테스트용 가짜 game-polling API 서버
+#   python fake_relay_server.py --port 8080 --play-interval 1
+#   python relay_poller.py --api-base http://127.0.0.1:8080 G1 G2 G3 ...
+# 경기 ID마다 같은 시드로 가상의 경기를 만들고, 시간이 지날수록 중계가 진행됩니다.
+# ===================================================================
+HOME_TEAM = "한국"
+AWAY_TEAM = "일본"
+
+
+def make_lineup(prefix):
+    """가상 라인업 (타자 9명 + 투수 5명)"""
+    return {
+        'batter': [{'pcode': f"{prefix}B{i}", 'name': f"{prefix}타자{i}", 'batOrder': i} for i in range(1, 10)],
+        'pitcher': [{'pcode': f"{prefix}P{i}", 'name': f"{prefix}투수{i}"} for i in range(1, 6)],
+    }
+
+
+def generate_game(game_id, seed=None, innings=9):
+    """경기 한 개 분량의 가상 문자중계(타석 목록)를 만듭니다."""
+    rng = random.Random(seed if seed is not None else game_id)
+    home, away = make_lineup('H'), make_lineup('A')
+    at_bats = []
+    seqno = 0
+    score = {'0': 0, '1': 0}     # homeOrAway: "0" 원정 공격, "1" 홈 공격
+    order = {'0': 0, '1': 0}
+    pitcher_idx = {'0': 0, '1': 0}
+
+    for inn in range(1, innings + 1):
+        for half in ('0', '1'):
+            attack = away if half == '0' else home
+            defense = home if half == '0' else away
+            outs = 0
+            bases = 0
+            while outs < 3:
+                batter = attack['batter'][order[half] % 9]
+                order[half] += 1
+                options = []
+                ball = strike = 0
+
+                def game_state():
+                    return {
+                        'homeScore': score['1'], 'awayScore': score['0'],
+                        'ball': ball, 'strike': strike, 'out': outs,
+                        'base1': bases & 1, 'base2': (bases >> 1) & 1, 'base3': (bases >> 2) & 1,
+                        'pitcher': defense['pitcher'][pitcher_idx[half] % 5]['pcode'],
+                        'batter': batter['pcode'],
+                    }
+
+                # 가끔 투수 교체 (type 2)
+                if rng.random() < 0.05:
+                    pitcher_idx[half] += 1
+                    seqno += 1
+                    new_pitcher = defense['pitcher'][pitcher_idx[half] % 5]
+                    options.append({'seqno': seqno, 'type': 2, 'text': f"투수 교체 : {new_pitcher['name']}",
+                                    'currentGameState': game_state()})
+
+                # 투구 (type 1)
+                result = None
+                while result is None:
+                    seqno += 1
+                    roll = rng.random()
+                    if roll < 0.35:
+                        ball += 1
+                        text = f"{ball}구 볼"
+                    elif roll < 0.7:
+                        strike += 1
+                        text = f"{strike}스트라이크"
+                        if strike >= 3:
+                            result = 'strikeout'
+                    elif roll < 0.85:
+                        result = 'out'
+                        text = "타격"
+                    else:
+                        result = 'homerun' if roll > 0.98 else 'hit'
+                        text = "타격"
+                    if ball >= 4:
+                        result = 'walk'
+                    options.append({'seqno': seqno, 'type': 1, 'text': text, 'currentGameState': game_state()})
+
+                # 타석 결과 (type 13 / 23 / 24)
+                seqno += 1
+                if result in ('strikeout', 'out'):
+                    outs += 1
+                    text = f"{batter['name']} : {'삼진 아웃' if result == 'strikeout' else '내야 땅볼 아웃'}"
+                    options.append({'seqno': seqno, 'type': 13, 'text': text, 'currentGameState': game_state()})
+                elif result == 'homerun':
+                    runs = 1 + bin(bases).count('1')
+                    bases = 0
+                    score[half] += runs
+                    options.append({'seqno': seqno, 'type': 23, 'text': f"{batter['name']} : 홈런",
+                                    'currentGameState': game_state()})
+                else:
+                    runs = 1 if bases & 4 else 0
+                    bases = ((bases << 1) | 1) & 7
+                    options.append({'seqno': seqno, 'type': 13,
+                                    'text': f"{batter['name']} : {'볼넷' if result == 'walk' else '1루타'}",
+                                    'currentGameState': game_state()})
+                    if runs:
+                        score[half] += runs
+                        seqno += 1
+                        options.append({'seqno': seqno, 'type': 24, 'text': "3루주자 홈인",
+                                        'currentGameState': game_state()})
+
+                at_bats.append({
+                    'no': len(at_bats) + 1,
+                    'inn': inn,
+                    'homeOrAway': half,
+                    'title': f"{batter['name']}",
+                    'textOptions': options,
+                })
+
+    return {'homeLineup': home, 'awayLineup': away, 'atBats': at_bats}
+
+
+def build_payload(game_id, game, inning, revealed):
+    """공개된 플레이 수(revealed)까지만 담은 game-polling 응답을 만듭니다."""
+    visible = []
+    count = 0
+    last_state = None
+    last_at_bat = None
+    for at_bat in game['atBats']:
+        if count >= revealed:
+            break
+        options = at_bat['textOptions'][:revealed - count]
+        count += len(options)
+        last_at_bat = at_bat
+        last_state = options[-1]['currentGameState']
+        if at_bat['inn'] == inning:
+            visible.append(dict(at_bat, textOptions=options))
+
+    finished = count >= sum(len(ab['textOptions']) for ab in game['atBats'])
+    if last_at_bat is None:
+        status_info, status_code, half, cur_inn = "경기전", "BEFORE", "0", 1
+        last_state = {'homeScore': 0, 'awayScore': 0, 'ball': 0, 'strike': 0, 'out': 0,
+                      'pitcher': None, 'batter': None}
+    else:
+        cur_inn, half = last_at_bat['inn'], last_at_bat['homeOrAway']
+        status_code = "RESULT" if finished else "STARTED"
+        status_info = "경기종료" if finished else f"{cur_inn}회{'말' if half == '1' else '초'}"
+
+    visible.reverse()  # 네이버 API처럼 최신 타석이 앞에 오도록
+    return {
+        'success': True,
+        'result': {
+            'game': {
+                'gameId': game_id,
+                'homeTeamName': HOME_TEAM,
+                'awayTeamName': AWAY_TEAM,
+                'statusCode': status_code,
+                'statusInfo': status_info,
+            },
+            'textRelayData': {
+                'inn': cur_inn,
+                'homeOrAway': half,
+                'currentGameState': last_state,
+                'homeLineup': game['homeLineup'],
+                'awayLineup': game['awayLineup'],
+                'textRelays': visible,
+            },
+        },
+    }
+
+
+class FakeRelayServer:
+    """경기 ID별 가상 경기를 시간 흐름에 맞춰 공개하는 aiohttp 앱"""
+
+    def __init__(self, play_interval=1.0):
+        self.play_interval = play_interval
+        self.games = {}
+        self.request_count = 0
+
+    def get_game(self, game_id):
+        if game_id not in self.games:
+            self.games[game_id] = (generate_game(game_id), time.monotonic())
+        return self.games[game_id]
+
+    async def handle_polling(self, request):
+        self.request_count += 1
+        game_id = request.match_info['game_id']
+        inning = int(request.query.get('inning', 1))
+        game, started = self.get_game(game_id)
+        revealed = int((time.monotonic() - started) / self.play_interval) + 1
+        # 공개된 플레이 수가 같으면 내용도 같으므로 ETag로 304 응답 가능
+        etag = f'"{inning}-{revealed}"'
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.json_response(build_payload(game_id, game, inning, revealed), headers={'ETag': etag})
+
+    async def handle_stats(self, request):
+        return web.json_response({'requests': self.request_count, 'games': len(self.games)})
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get('/schedule/games/{game_id}/game-polling', self.handle_polling)
+        app.router.add_get('/stats', self.handle_stats)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 game-polling API 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--play-interval', type=float, default=1.0, help="플레이 1개가 공개되는 간격 (초)")
+    args = parser.parse_args()
+
+    server = FakeRelayServer(play_interval=args.play_interval)
+    print(f"🧪 가짜 중계 API 서버: http://{args.host}:{args.port}/schedule/games/<GAME_ID>/game-polling")
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# ===================================================================
+# pcode -> 선수 정보 색인
+# get_player_name_by_pcode()는 부를 때마다 라인업 4개를 처음부터 훑지만,
+# LineupIndex는 경기당 한 번 만들고 교체(type 2)가 있을 때만 다시 만듭니다.
+# ===================================================================
+from relay_model import EventType
+
+LINEUP_SECTIONS = (
+    ('homeLineup', 'batter'),
+    ('homeLineup', 'pitcher'),
+    ('awayLineup', 'batter'),
+    ('awayLineup', 'pitcher'),
+)
+
+
+class LineupIndex:
+    """경기 하나의 pcode -> 선수 레코드(dict) 색인"""
+
+    def __init__(self):
+        self.players = {}
+        self.rebuild_count = 0
+        self._text_relay_data = None
+        self._missing = set()   # 다시 만들어도 없던 pcode (같은 pcode로 계속 재생성하지 않도록)
+
+    def rebuild(self, text_relay_data):
+        """라인업 섹션 전체로 색인을 새로 만듭니다."""
+        players = {}
+        for side, role in LINEUP_SECTIONS:
+            for player in text_relay_data.get(side, {}).get(role, []):
+                pcode = player.get('pcode')
+                # 먼저 나온 섹션 우선 (get_player_name_by_pcode와 같은 순서)
+                if pcode is not None and pcode not in players:
+                    players[pcode] = player
+        self.players = players
+        self._missing.clear()
+        self.rebuild_count += 1
+
+    def update(self, text_relay_data, new_plays=()):
+        """처음이거나 새 플레이(Play 목록)에 교체가 있으면 색인을 갱신합니다."""
+        self._text_relay_data = text_relay_data
+        if not self.players or any(p.type == EventType.SUBSTITUTION for p in new_plays):
+            self.rebuild(text_relay_data)
+
+    def get(self, pcode):
+        """pcode에 해당하는 선수 레코드 (없으면 None)"""
+        player = self.players.get(pcode)
+        if player is None and pcode is not None and pcode not in self._missing:
+            # 교체 이벤트 없이 라인업이 바뀐 경우를 대비해 한 번만 다시 만들어 봄
+            if self._text_relay_data is not None:
+                self.rebuild(self._text_relay_data)
+                player = self.players.get(pcode)
+            if player is None:
+                self._missing.add(pcode)
+        return player
+
+    def name(self, pcode, default='Unknown'):
+        """pcode에 해당하는 선수 이름"""
+        player = self.get(pcode)
+        if player is None:
+            return default
+        return player.get('name', default)
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+
+from crawl_baseball import API_BASE, apply_relay_result, process_relay_result
+from relay_model import EventType
+from relay_poller import MultiGamePoller
+
+# ===================================================================
+# 실시간 중계 → scenario.json 형식 이벤트
+#   폴러가 받은 새 플레이(Play)를 {time, type, text, led, sound, data} 로 바꿔
+#   서버(server.py / demo/server.py)의 dispatch_event로 바로 흘려보냅니다.
+#   - time   : 피드 시작 후 경과 초 (영상 시간 대신)
+#   - arrived: 이 플레이가 담긴 응답을 받은 시각 (epoch 초) → 신호까지의 지연 측정용
+#   - 첫 응답에 들어있는 지난 플레이는 신호를 내지 않음 (상황판만 맞춤)
+# ===================================================================
+
+# 투구(type 1) 문구 → (이벤트 종류, LED)
+PITCH_KEYWORDS = (
+    ('헛스윙', 'strike', 'STRIKE_RED'),
+    ('스트라이크', 'strike', 'STRIKE_RED'),
+    ('파울', 'foul', 'STRIKE_RED'),
+    ('볼', 'ball', 'BALL_YELLOW'),
+)
+
+# 타석 결과(type 13) 문구 → (이벤트 종류, LED, 소리). 위에서부터 먼저 맞는 것
+RESULT_KEYWORDS = (
+    ('아웃', 'out', 'RESET', None),
+    ('볼넷', 'walk', 'BASE_1', 'cheer.mp3'),
+    ('몸에 맞는', 'walk', 'BASE_1', 'cheer.mp3'),
+    ('사구', 'walk', 'BASE_1', 'cheer.mp3'),
+    ('루타', 'hit', 'HIT_GREEN', 'hit_big.mp3'),
+    ('안타', 'hit', 'HIT_GREEN', 'hit_big.mp3'),
+)
+
+
+def inning_label(inning, home_or_away):
+    """3, "1" -> "3회말" """
+    return f"{inning}회{'말' if str(home_or_away) == '1' else '초'}"
+
+
+def classify_play(play):
+    """Play -> (이벤트 종류, LED, 소리). 신호를 낼 필요가 없으면 LED/소리가 None"""
+    if play.type == EventType.PITCH:
+        for keyword, kind, led in PITCH_KEYWORDS:
+            if keyword in play.text:
+                return kind, led, None
+        return 'pitch', None, None
+    if play.type == EventType.RESULT:
+        for keyword, kind, led, sound in RESULT_KEYWORDS:
+            if keyword in play.text:
+                return kind, led, sound
+        return 'result', None, None
+    if play.type == EventType.HOMERUN:
+        return 'homerun', 'HOMERUN', 'hit_big.mp3'
+    if play.type == EventType.SCORE:
+        return 'score', 'HIT_GREEN', 'cheer.mp3'
+    if play.type == EventType.SUBSTITUTION:
+        return 'substitution', None, None
+    if play.type == EventType.RUNNER:
+        return 'runner', None, None
+    return 'other', None, None
+
+
+def map_play(play, lineup, inning, elapsed=0.0, arrived=None, game_id=None):
+    """Play 한 개를 scenario.json 이벤트 dict로 바꿉니다."""
+    kind, led, sound = classify_play(play)
+    data = {
+        'inning': inning,
+        'b': play.ball,
+        's': play.strike,
+        'o': play.out,
+        'batter': lineup.name(play.batter),
+        'pitcher': lineup.name(play.pitcher),
+        'base1': play.bases & 1,
+        'base2': (play.bases >> 1) & 1,
+        'base3': (play.bases >> 2) & 1,
+        'home_score': play.home_score,
+        'away_score': play.away_score,
+    }
+    event = {
+        'time': round(elapsed, 3),
+        'type': kind,
+        'text': play.text.replace(' : ', ': '),
+        'led': led,
+        'data': data,
+        'seqno': play.seqno,
+        'game': game_id,
+        'arrived': arrived,
+    }
+    if sound:
+        event['sound'] = sound
+    return event
+
+
+class LiveFeed:
+    """MultiGamePoller를 별도 스레드의 이벤트 루프에서 돌리고, 새 플레이를 이벤트로 넘겨줍니다.
+    on_event(event_dict)는 폴러 스레드에서 호출됩니다."""
+
+    def __init__(self, game_ids, on_event, api_base=API_BASE, interval=None, verbose=False,
+                 clock=time.time):
+        self.on_event = on_event
+        self.verbose = verbose      # True면 crawl_baseball처럼 상황판도 출력
+        self.clock = clock
+        self.started = None
+        self.emitted = 0
+        self.live_games = set()     # 지난 플레이를 한 번 받아 맞춘 경기 (이후 새 플레이부터 신호)
+        self.poller = MultiGamePoller(game_ids, api_base=api_base, interval=interval,
+                                      on_result=self.handle_result)
+        self.thread = None
+
+    def handle_result(self, state, result_data):
+        """폴러 콜백: 기존 처리(색인/스케줄러)를 그대로 한 뒤 새 플레이만 이벤트로 변환"""
+        arrived = self.clock()
+        if self.started is None:
+            self.started = arrived
+        relay_data = result_data.get('textRelayData', {})
+        # 처음 받은 응답의 플레이는 이미 지나간 것 (경기 시작 전이라 비어 있었다면 다음부터 모두 새 플레이)
+        history = state.game_id not in self.live_games and bool(relay_data.get('textRelays'))
+        self.live_games.add(state.game_id)
+        before = len(state.play_log)
+        if self.verbose:
+            process_relay_result(state, result_data, clear=False)
+        else:
+            apply_relay_result(state, result_data)
+        if history:
+            return
+
+        # 밀린 플레이를 한 번에 받으면 공수교대를 걸칠 수 있으므로 이닝은 플레이마다 자기 타석 것으로
+        current = (relay_data.get('inn', state.current_inning), relay_data.get('homeOrAway'))
+        for play in state.play_log[before:]:
+            inning = inning_label(*current) if play.inning is None else inning_label(play.inning, play.half)
+            event = map_play(play, state.lineup, inning, arrived - self.started, arrived, state.game_id)
+            self.emitted += 1
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"⚠️ [{state.game_id}] 실시간 이벤트 전송 실패 (seqno {play.seqno}): {e}")
+
+    def run(self):
+        asyncio.run(self.poller.run())
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="live-feed", daemon=True)
+        self.thread.start()
+        return self.thread
@@ -0,0 +1,294 @@
+import argparse
+import json
+import sqlite3
+import time
+
+from relay_model import EventType, Play
+
+# ===================================================================
+# 문자중계 저장소 (SQLite)
+#  - 플레이: (경기 ID, seqno)가 기본 키 → 같은 플레이를 다시 넣어도 한 줄 (재폴링/재수집 안전)
+#  - 폴링 한 번에 트랜잭션 한 번 (새 플레이 + 바뀐 경기 상태 + 교체된 라인업)
+#  - 새 플레이가 없고 상태도 같으면 DB에 아무것도 쓰지 않음
+#   python relay_poller.py --store plays.db G1 G2                     (실시간 저장)
+#   python play_store.py plays.db ingest season/*.jsonl.gz            (캡처 파일 일괄 저장)
+#   python play_store.py plays.db homeruns --pcode 12345              (홈런 목록)
+#   python play_store.py plays.db at-bat GAME_ID 17                   (타석 하나의 투구 순서)
+# ===================================================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id      TEXT PRIMARY KEY,
+    home_team    TEXT,
+    away_team    TEXT,
+    status_code  TEXT,
+    status_info  TEXT,
+    inning       INTEGER,
+    half         INTEGER,
+    home_score   INTEGER,
+    away_score   INTEGER,
+    ball         INTEGER,
+    strike       INTEGER,
+    out          INTEGER,
+    bases        INTEGER,
+    pitcher      TEXT,
+    batter       TEXT,
+    last_seqno   INTEGER NOT NULL DEFAULT 0,
+    updated_at   REAL
+);
+CREATE TABLE IF NOT EXISTS plays (
+    game_id      TEXT NOT NULL,
+    seqno        INTEGER NOT NULL,
+    inning       INTEGER,
+    half         INTEGER,
+    at_bat       INTEGER,
+    type         INTEGER NOT NULL,
+    text         TEXT NOT NULL,
+    batter       TEXT,
+    pitcher      TEXT,
+    ball         INTEGER,
+    strike       INTEGER,
+    out          INTEGER,
+    home_score   INTEGER,
+    away_score   INTEGER,
+    bases        INTEGER,
+    PRIMARY KEY (game_id, seqno)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS plays_at_bat ON plays (game_id, at_bat, seqno);
+CREATE INDEX IF NOT EXISTS plays_batter ON plays (batter, type);
+CREATE INDEX IF NOT EXISTS plays_pitcher ON plays (pitcher, type);
+CREATE INDEX IF NOT EXISTS plays_type ON plays (type, game_id);
+CREATE TABLE IF NOT EXISTS players (
+    game_id      TEXT NOT NULL,
+    pcode        TEXT NOT NULL,
+    side         TEXT NOT NULL,     -- home / away
+    role         TEXT NOT NULL,     -- batter / pitcher
+    name         TEXT,
+    bat_order    INTEGER,
+    data         TEXT,              -- 라인업 항목 원본 (JSON)
+    PRIMARY KEY (game_id, pcode, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_pcode ON players (pcode);
+"""
+
+PLAY_COLUMNS = ('seqno', 'inning', 'half', 'at_bat', 'type', 'text', 'batter', 'pitcher',
+                'ball', 'strike', 'out', 'home_score', 'away_score', 'bases')
+GAME_COLUMNS = ('home_team', 'away_team', 'status_code', 'status_info', 'inning', 'half',
+                'home_score', 'away_score', 'ball', 'strike', 'out', 'bases', 'pitcher', 'batter', 'last_seqno')
+LINEUP_SECTIONS = (('homeLineup', 'home'), ('awayLineup', 'away'))
+
+# 같은 seqno가 다시 오면 내용만 덮어씀 (네이버가 문구를 고치는 경우)
+UPSERT_PLAY = (
+    f"INSERT INTO plays (game_id, {', '.join(PLAY_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(PLAY_COLUMNS) + 1))}) "
+    f"ON CONFLICT (game_id, seqno) DO UPDATE SET "
+    + ', '.join(f"{c} = excluded.{c}" for c in PLAY_COLUMNS[1:])
+)
+UPSERT_GAME = (
+    f"INSERT INTO games (game_id, {', '.join(GAME_COLUMNS)}, updated_at) "
+    f"VALUES ({', '.join('?' * (len(GAME_COLUMNS) + 2))}) "
+    f"ON CONFLICT (game_id) DO UPDATE SET "
+    + ', '.join(f"{c} = excluded.{c}" for c in GAME_COLUMNS if c != 'last_seqno')
+    + ", last_seqno = MAX(games.last_seqno, excluded.last_seqno), updated_at = excluded.updated_at"
+)
+UPSERT_PLAYER = (
+    "INSERT INTO players (game_id, pcode, side, role, name, bat_order, data) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (game_id, pcode, role) DO UPDATE SET "
+    "side = excluded.side, name = excluded.name, bat_order = excluded.bat_order, data = excluded.data"
+)
+
+
+def game_row(game_id, result_data, last_seqno):
+    """game-polling 결과 -> games 테이블 한 줄 (game_id 제외, GAME_COLUMNS 순서)"""
+    game = result_data.get('game', {})
+    data = result_data.get('textRelayData', {})
+    state = data.get('currentGameState') or {}
+    half = data.get('homeOrAway')
+    return (
+        game.get('homeTeamName'), game.get('awayTeamName'), game.get('statusCode'), game.get('statusInfo'),
+        data.get('inn'), int(half) if str(half).isdigit() else None,
+        state.get('homeScore'), state.get('awayScore'),
+        state.get('ball'), state.get('strike'), state.get('out'),
+        (1 if state.get('base1') else 0) | (2 if state.get('base2') else 0) | (4 if state.get('base3') else 0),
+        state.get('pitcher'), state.get('batter'), last_seqno,
+    )
+
+
+def lineup_rows(game_id, text_relay_data):
+    rows = []
+    for section, side in LINEUP_SECTIONS:
+        for role, players in (text_relay_data.get(section) or {}).items():
+            if not isinstance(players, list):
+                continue
+            for player in players:
+                pcode = player.get('pcode')
+                if pcode is None:
+                    continue
+                rows.append((game_id, pcode, side, role, player.get('name'), player.get('batOrder'),
+                             json.dumps(player, ensure_ascii=False, separators=(',', ':'))))
+    return rows
+
+
+def row_to_play(row):
+    """plays 테이블 한 줄 -> Play"""
+    values = dict(zip(PLAY_COLUMNS, row))
+    values['type'] = EventType.coerce(values['type'])
+    return Play(**values)
+
+
+class PlayStore:
+    """문자중계 저장소. save()는 폴러의 on_result 다음에 (같은 스레드에서) 호출합니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")      # 저장 중에도 다른 프로세스가 조회 가능
+        self.conn.execute("PRAGMA synchronous = NORMAL")    # 트랜잭션마다 fsync 하지 않음 (WAL이라 안전)
+        self.conn.executescript(SCHEMA)
+        self.saved_states = {}      # 경기 ID -> 마지막으로 쓴 games 줄 (같으면 쓰지 않음)
+        self.saved_lineups = {}     # 경기 ID -> 마지막으로 쓴 LineupIndex.rebuild_count
+        self.transactions = 0
+        self.plays_written = 0
+
+    def save(self, state, result_data, new_plays=()):
+        """폴링 한 번의 결과를 트랜잭션 하나로 저장 -> 쓴 것이 있으면 True"""
+        game_id = state.game_id
+        data = result_data.get('textRelayData', {})
+        row = game_row(game_id, result_data, state.last_processed_seqno)
+        state_changed = self.saved_states.get(game_id) != row
+        lineup_changed = bool(data) and self.saved_lineups.get(game_id) != state.lineup.rebuild_count
+        if not new_plays and not state_changed and not lineup_changed:
+            return False
+
+        with self.conn:
+            if new_plays:
+                self.conn.executemany(UPSERT_PLAY, [
+                    (game_id, *(getattr(play, c) for c in PLAY_COLUMNS)) for play in new_plays
+                ])
+            if state_changed:
+                self.conn.execute(UPSERT_GAME, (game_id, *row, time.time()))
+            if lineup_changed:
+                self.conn.executemany(UPSERT_PLAYER, lineup_rows(game_id, data))
+        self.saved_states[game_id] = row
+        if lineup_changed:
+            self.saved_lineups[game_id] = state.lineup.rebuild_count
+        self.transactions += 1
+        self.plays_written += len(new_plays)
+        return True
+
+    # --- 조회 ---
+
+    def plays(self, game_id, after_seqno=0, types=None):
+        """경기 하나의 플레이 (seqno 순)"""
+        sql = f"SELECT {', '.join(PLAY_COLUMNS)} FROM plays WHERE game_id = ? AND seqno > ?"
+        params = [game_id, after_seqno]
+        if types:
+            sql += f" AND type IN ({', '.join('?' * len(types))})"
+            params.extend(int(t) for t in types)
+        return [row_to_play(r) for r in self.conn.execute(sql + " ORDER BY seqno", params)]
+
+    def at_bat_pitches(self, game_id, at_bat):
+        """타석 하나의 투구 순서"""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(PLAY_COLUMNS)} FROM plays "
+            "WHERE game_id = ? AND at_bat = ? AND type = ? ORDER BY seqno",
+            (game_id, at_bat, int(EventType.PITCH)))
+        return [row_to_play(r) for r in rows]
+
+    def plays_by_batter(self, pcode, types=None):
+        """선수(타자) 한 명의 플레이 -> [(경기 ID, Play)] (예: 홈런만 types=[EventType.HOMERUN])"""
+        sql = f"SELECT game_id, {', '.join(PLAY_COLUMNS)} FROM plays WHERE batter = ?"
+        params = [pcode]
+        if types:
+            sql += f" AND type IN ({', '.join('?' * len(types))})"
+            params.extend(int(t) for t in types)
+        return [(r[0], row_to_play(r[1:])) for r in self.conn.execute(sql + " ORDER BY game_id, seqno", params)]
+
+    def home_runs(self, pcode=None):
+        """홈런 목록 -> [(경기 ID, Play)] (pcode가 없으면 모든 선수)"""
+        if pcode is not None:
+            return self.plays_by_batter(pcode, [EventType.HOMERUN])
+        rows = self.conn.execute(
+            f"SELECT game_id, {', '.join(PLAY_COLUMNS)} FROM plays WHERE type = ? ORDER BY game_id, seqno",
+            (int(EventType.HOMERUN),))
+        return [(r[0], row_to_play(r[1:])) for r in rows]
+
+    def game(self, game_id):
+        """games 테이블 한 줄 (dict, 없으면 None)"""
+        cursor = self.conn.execute("SELECT * FROM games WHERE game_id = ?", (game_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], row))
+
+    def lineup(self, game_id):
+        """경기 하나의 라인업 -> [{pcode, side, role, name, bat_order}]"""
+        rows = self.conn.execute(
+            "SELECT pcode, side, role, name, bat_order FROM players WHERE game_id = ? "
+            "ORDER BY side, role, bat_order", (game_id,))
+        return [dict(zip(('pcode', 'side', 'role', 'name', 'bat_order'), r)) for r in rows]
+
+    def player_name(self, pcode):
+        row = self.conn.execute("SELECT name FROM players WHERE pcode = ? LIMIT 1", (pcode,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self.conn.close()
+
+
+def ingest_captures(store, paths):
+    """캡처 파일들을 대기 없이 재생하며 저장 -> (응답 수, 경기 수)"""
+    # crawl_baseball이 play_store를 import하므로 순환 import를 피해 여기서 import
+    from crawl_baseball import apply_relay_result
+    from relay_capture import replay
+
+    def on_result(state, result_data):
+        store.save(state, result_data, apply_relay_result(state, result_data))
+
+    records = games = 0
+    for path in paths:
+        stats = replay(path, speed=0, on_result=on_result)
+        records += stats['records']
+        games += stats['games']
+    return records, games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문자중계 저장소 (SQLite)")
+    parser.add_argument('db', help="DB 파일 경로")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = sub.add_parser('ingest', help="캡처 파일(relay_capture.py) 저장")
+    ingest_parser.add_argument('paths', nargs='+')
+
+    hr_parser = sub.add_parser('homeruns', help="홈런 목록")
+    hr_parser.add_argument('--pcode', help="선수 pcode (없으면 전체)")
+
+    at_bat_parser = sub.add_parser('at-bat', help="타석 하나의 투구 순서")
+    at_bat_parser.add_argument('game')
+    at_bat_parser.add_argument('no', type=int, help="타석 번호 (textRelay의 no)")
+
+    args = parser.parse_args()
+    store = PlayStore(args.db)
+    try:
+        if args.command == 'ingest':
+            started = time.perf_counter()
+            records, games = ingest_captures(store, args.paths)
+            elapsed = time.perf_counter() - started
+            print(f"✅ 저장 완료: 경기 {games}개, 응답 {records}건, 플레이 {store.plays_written}개 반영 (같은 seqno는 덮어씀), "
+                  f"트랜잭션 {store.transactions}번, {elapsed:.2f}초")
+        elif args.command == 'homeruns':
+            for game_id, play in store.home_runs(args.pcode):
+                name = store.player_name(play.batter) or play.batter
+                print(f"⚾ [{game_id}] {play.inning}회{'말' if play.half else '초'} {name}: {play.text}")
+        elif args.command == 'at-bat':
+            pitches = store.at_bat_pitches(args.game, args.no)
+            if not pitches:
+                print(f"[{args.game}] {args.no}번 타석의 투구가 없습니다.")
+            for n, play in enumerate(pitches, 1):
+                print(f"  {n}구 (B{play.ball} S{play.strike} O{play.out}) {play.text}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
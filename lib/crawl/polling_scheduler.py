@@ -0,0 +1,91 @@
+import random
+
+from relay_model import EventType
+
+# ===================================================================
+# 경기 상황에 따라 갱신 주기를 바꾸는 스케줄러
+#  - 타석 진행 중: 짧게 / 공수교대·투수 교체·경기 전·중단: 길게 / 경기 종료: 폴링 중단
+#  - 네트워크·JSON 오류, success: false 는 지터를 섞은 지수 백오프
+# ===================================================================
+PHASE_PREGAME = 'pregame'     # 경기 전
+PHASE_ACTIVE = 'active'       # 타석 진행 중
+PHASE_CHANGE = 'change'       # 투수 교체 등 (type 2)
+PHASE_BREAK = 'break'         # 공수교대 (3아웃)
+PHASE_DELAY = 'delay'         # 우천 중단 등
+PHASE_FINAL = 'final'         # 경기 종료 / 취소
+
+PHASE_INTERVALS = {
+    PHASE_PREGAME: 30,
+    PHASE_ACTIVE: 2,
+    PHASE_CHANGE: 6,
+    PHASE_BREAK: 10,
+    PHASE_DELAY: 30,
+}
+
+DEFAULT_INTERVAL = 3        # 경기 단계를 아직 모를 때 (crawl_baseball.POLLING_INTERVAL과 같음)
+BACKOFF_MAX = 60            # 오류 시 최대 대기 (초)
+FINAL_STATUS_CODES = ('RESULT', 'CANCEL')
+
+
+def classify_phase(result_data, new_plays=()):
+    """game-polling 결과로 현재 경기 단계를 판단합니다."""
+    game = result_data.get('game', {})
+    status_code = game.get('statusCode')
+    status_info = game.get('statusInfo', '') or ''
+
+    if status_code in FINAL_STATUS_CODES or game.get('cancel'):
+        return PHASE_FINAL
+    if status_code == 'BEFORE':
+        return PHASE_PREGAME
+    if game.get('suspended') or '중단' in status_info or '지연' in status_info:
+        return PHASE_DELAY
+
+    state = result_data.get('textRelayData', {}).get('currentGameState', {})
+    if state.get('out') == 3:
+        return PHASE_BREAK
+    if new_plays and new_plays[-1].type == EventType.SUBSTITUTION:
+        return PHASE_CHANGE
+    return PHASE_ACTIVE
+
+
+class PollingScheduler:
+    """경기 하나의 다음 폴링까지 대기 시간을 정합니다."""
+
+    def __init__(self, default_interval=DEFAULT_INTERVAL, intervals=None, backoff_base=DEFAULT_INTERVAL,
+                 backoff_max=BACKOFF_MAX, rng=None):
+        self.default_interval = default_interval
+        self.intervals = dict(PHASE_INTERVALS, **(intervals or {}))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rng = rng or random.Random()
+        self.phase = None
+        self.failures = 0
+
+    @property
+    def finished(self):
+        """경기가 끝나서 더 이상 폴링할 필요가 없으면 True"""
+        return self.phase == PHASE_FINAL
+
+    def record_result(self, result_data, new_plays=()):
+        """정상 응답을 받았을 때 호출 (백오프 초기화 + 경기 단계 갱신)"""
+        self.failures = 0
+        self.phase = classify_phase(result_data, new_plays)
+
+    def record_unchanged(self):
+        """응답이 지난번 정상 응답과 같을 때(304 포함) 호출. 정상 응답이므로 백오프는 초기화하고 경기 단계는 유지
+        (비교 기준은 success: true였던 응답만 저장되므로 같은 오류가 반복돼서 여기로 오지는 않음)"""
+        self.failures = 0
+
+    def record_error(self):
+        """네트워크/JSON 오류 또는 success: false 일 때 호출"""
+        self.failures += 1
+
+    def next_interval(self):
+        """다음 폴링까지 기다릴 시간 (초)"""
+        if self.failures:
+            # 지수 백오프 + 지터 (여러 경기가 동시에 재시도하지 않도록 0.5~1배 사이에서 랜덤)
+            backoff = min(self.backoff_max, self.backoff_base * (2 ** (self.failures - 1)))
+            return backoff * self.rng.uniform(0.5, 1.0)
+        if self.phase is None:
+            return self.default_interval
+        return self.intervals.get(self.phase, self.default_interval)
@@ -0,0 +1,168 @@
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import time
+
+# ===================================================================
+# game-polling 응답 기록(record) / 재생(replay)
+#  - 기록: 응답 한 건 = JSON 한 줄을 gzip으로 압축해 파일 끝에 덧붙임 (gzip 멤버 이어붙이기)
+#          같은 경기·이닝에서 seqno 범위와 경기 상태가 같으면 저장하지 않음
+#  - 재생: 기록된 시간 간격대로 (또는 N배속으로) process_relay_result에 다시 넣어줌
+#   python relay_capture.py replay capture.jsonl.gz --speed 10
+#   python relay_capture.py replay capture.jsonl.gz --speed 0 --quiet   (최대 속도 부하 테스트)
+# ===================================================================
+
+
+def seqno_range(result_data):
+    """응답에 담긴 플레이의 (최소 seqno, 최대 seqno)"""
+    low, high = None, None
+    for at_bat in result_data.get('textRelayData', {}).get('textRelays', []):
+        options = at_bat.get('textOptions') or []
+        if not options:
+            continue
+        first = options[0].get('seqno', 0)
+        last = options[-1].get('seqno', 0)
+        a, b = min(first, last), max(first, last)
+        low = a if low is None else min(low, a)
+        high = b if high is None else max(high, b)
+    return low, high
+
+
+class CaptureRecorder:
+    """응답을 캡처 파일에 덧붙여 저장합니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'ab')
+        self.last_keys = {}   # (game_id, inning) -> 마지막으로 저장한 (seqno 범위, 상태)
+        self.written = 0
+        self.skipped = 0
+
+    def record(self, game_id, inning, data, timestamp=None):
+        """응답(dict) 한 건을 기록합니다. 중복이면 False."""
+        result_data = data.get('result') or {}
+        key = (seqno_range(result_data), result_data.get('game', {}).get('statusCode'))
+        if self.last_keys.get((game_id, inning)) == key:
+            self.skipped += 1
+            return False
+        self.last_keys[(game_id, inning)] = key
+
+        line = json.dumps({
+            't': time.time() if timestamp is None else timestamp,
+            'game': game_id,
+            'inning': inning,
+            'seq': list(key[0]),
+            'data': data,
+        }, ensure_ascii=False, separators=(',', ':'))
+        # 한 줄씩 독립된 gzip 멤버로 써서, 중간에 프로그램이 꺼져도 앞부분은 읽을 수 있게 함
+        self.file.write(gzip.compress(line.encode('utf-8') + b'\n'))
+        self.file.flush()
+        self.written += 1
+        return True
+
+    def close(self):
+        self.file.close()
+
+
+def read_capture(path):
+    """캡처 파일의 기록을 순서대로 돌려줍니다."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplaySource:
+    """캡처 파일을 원래 시간 간격(또는 배속)대로 재생합니다. speed=0이면 대기 없이 재생."""
+
+    def __init__(self, path, speed=1.0, game_ids=None):
+        self.path = path
+        self.speed = speed
+        self.game_ids = set(game_ids) if game_ids else None
+
+    def __iter__(self):
+        first_t = None
+        started = time.monotonic()
+        for record in read_capture(self.path):
+            if self.game_ids and record['game'] not in self.game_ids:
+                continue
+            if first_t is None:
+                first_t = record['t']
+            if self.speed > 0:
+                due = started + (record['t'] - first_t) / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield record
+
+
+def replay(path, speed=1.0, game_ids=None, on_result=None, clear=False):
+    """캡처를 재생해서 경기별 GameState로 처리합니다. 처리 통계를 돌려줍니다."""
+    # crawl_baseball이 CaptureRecorder를 가져다 쓰므로 순환 import를 피해 여기서 import
+    from crawl_baseball import GameState, process_relay_result
+
+    states = {}
+    if on_result is None:
+        on_result = lambda state, result: process_relay_result(state, result, clear=clear)
+
+    records = 0
+    started = time.perf_counter()
+    for record in ReplaySource(path, speed, game_ids):
+        data = record['data']
+        if not data.get('success') or 'result' not in data:
+            continue
+        state = states.get(record['game'])
+        if state is None:
+            state = states[record['game']] = GameState(record['game'])
+        on_result(state, data['result'])
+        records += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        'records': records,
+        'games': len(states),
+        'elapsed': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="game-polling 캡처 재생")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = sub.add_parser('replay', help="캡처 파일 재생")
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--speed', type=float, default=1.0, help="배속 (0이면 대기 없이 최대 속도)")
+    replay_parser.add_argument('--game', action='append', help="특정 경기만 재생 (여러 번 지정 가능)")
+    replay_parser.add_argument('--quiet', action='store_true', help="터미널 출력 없이 처리 속도만 측정")
+
+    info_parser = sub.add_parser('info', help="캡처 파일 요약")
+    info_parser.add_argument('path')
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        games = {}
+        for record in read_capture(args.path):
+            games.setdefault(record['game'], []).append(record['t'])
+        for game_id, times in games.items():
+            print(f"⚾ {game_id}: 기록 {len(times)}건, {times[-1] - times[0]:.0f}초 분량")
+        return
+
+    try:
+        if args.quiet:
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = replay(args.path, args.speed, args.game)
+        else:
+            stats = replay(args.path, args.speed, args.game)
+    except KeyboardInterrupt:
+        print("\n👋 재생을 종료합니다.")
+        return
+
+    rate = stats['records'] / stats['elapsed'] if stats['elapsed'] else 0
+    print(f"✅ 재생 완료: 경기 {stats['games']}개, 응답 {stats['records']}건, {stats['elapsed']:.2f}초 ({rate:.0f}건/초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import hashlib
+
+from relay_model import Play
+
+# ===================================================================
+# 증분 수집(ingest): 매 폴링마다 전체 중계를 다시 훑지 않고 새 플레이만 골라냄
+#  1) 응답 본문이 이전과 같으면 (ETag 304 또는 내용 해시) JSON 파싱 자체를 생략
+#  2) 타석(textRelay)별 seqno 워터마크를 기억해서, 변화 없는 타석은 건너뜀
+#  3) 새 플레이만 Play 객체로 한 번 변환 (relay_model.py)
+# ===================================================================
+
+
+def at_bat_key(at_bat):
+    """타석을 구분하는 키 (이닝, 초/말, 타석 번호)"""
+    return (at_bat.get('inn'), at_bat.get('homeOrAway'), at_bat.get('no'))
+
+
+class RelayIngestor:
+    """경기 하나의 응답 변경 여부와 타석별 seqno 워터마크를 관리합니다."""
+
+    def __init__(self):
+        self.etag = None
+        self.payload_hash = None
+        self.pending = None    # is_unchanged로 본 마지막 응답의 (해시, ETag), accept() 전까지는 비교 기준이 아님
+        self.watermarks = {}   # at_bat_key -> 마지막으로 처리한 seqno
+
+    def conditional_headers(self):
+        """서버가 ETag를 준 적이 있으면 If-None-Match 헤더를 붙입니다."""
+        if self.etag:
+            return {'If-None-Match': self.etag}
+        return {}
+
+    def is_unchanged(self, body, etag=None):
+        """응답 본문(bytes)이 지난번 정상 응답과 같으면 True. (같으면 JSON 파싱 생략 가능)"""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        self.pending = (digest, etag)
+        return digest == self.payload_hash
+
+    def accept(self):
+        """방금 is_unchanged로 본 응답이 파싱되고 success: true일 때 호출 -> 다음 비교 기준으로 저장
+        (오류 응답을 저장하면 같은 오류가 반복될 때 '변화 없음'으로 보여 백오프가 멈춤)"""
+        if self.pending is None:
+            return
+        self.payload_hash, etag = self.pending
+        if etag:
+            self.etag = etag
+        self.pending = None
+
+    def ingest(self, relays, floor_seqno):
+        """floor_seqno 이후의 새 플레이만 seqno 순 Play 목록으로 돌려줍니다. (새 플레이 목록, 최대 seqno)"""
+        new_plays = []
+        max_seqno = floor_seqno
+        watermarks = {}
+
+        for at_bat in relays:
+            options = at_bat.get('textOptions') or []
+            if not options:
+                continue
+
+            key = at_bat_key(at_bat)
+            first = options[0].get('seqno', 0)
+            last = options[-1].get('seqno', 0)
+            top = max(first, last)
+            mark = max(self.watermarks.get(key, floor_seqno), floor_seqno)
+            watermarks[key] = max(top, mark)
+            max_seqno = max(max_seqno, top)
+
+            # 변화 없는 타석은 textOptions를 아예 보지 않음
+            if top <= mark:
+                continue
+
+            # 타석 안의 플레이는 시간순이므로, 끝에서부터 워터마크까지만 거슬러 올라감
+            ordered = reversed(options) if first <= last else options
+            for play in ordered:
+                if play.get('seqno', 0) <= mark:
+                    break
+                new_plays.append(Play.from_json(play, at_bat))
+
+        # 이번 응답에 있는 타석만 남김 (지난 이닝 워터마크는 자동으로 정리)
+        self.watermarks = watermarks
+
+        new_plays.sort(key=lambda p: p.seqno)
+        return new_plays, max_seqno
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from enum import IntEnum
+
+# ===================================================================
+# 문자중계 플레이 모델
+# textOptions의 dict를 새로 들어온 순간 한 번만 Play 객체로 바꾸고,
+# 이후 처리(출력, 색인, 스케줄러)는 속성으로 접근합니다. (__slots__로 메모리 절약)
+# ===================================================================
+
+
+class EventType(IntEnum):
+    """textOptions의 type 코드"""
+    PITCH = 1           # 투구 (볼, 스트라이크, 파울, 헛스윙)
+    SUBSTITUTION = 2    # 교체
+    OTHER = 7           # 기타 이벤트 (투수판 이탈 등)
+    RESULT = 13         # 타석 결과 (안타, 아웃, 볼넷, 사구)
+    RUNNER = 14         # 주루
+    HOMERUN = 23        # 홈런
+    SCORE = 24          # 득점
+
+    @classmethod
+    def coerce(cls, value):
+        """알려진 코드는 EventType으로, 모르는 코드는 int 그대로 돌려줍니다."""
+        try:
+            return cls(value)
+        except ValueError:
+            return value
+
+
+# 터미널에 [GAME]으로 출력하는 이벤트
+GAME_EVENT_TYPES = frozenset((
+    EventType.RESULT, EventType.HOMERUN, EventType.SUBSTITUTION,
+    EventType.RUNNER, EventType.SCORE, EventType.OTHER,
+))
+
+
+@dataclass(slots=True)
+class Play:
+    """플레이 한 개 (textOptions 항목 + 그 시점의 currentGameState 요약)"""
+    seqno: int
+    type: int
+    text: str
+    batter: str = None
+    pitcher: str = None
+    ball: int = 0
+    strike: int = 0
+    out: int = 0
+    home_score: int = 0
+    away_score: int = 0
+    bases: int = 0          # 비트마스크: 1루=1, 2루=2, 3루=4
+    inning: int = None      # 이 플레이가 속한 타석 (textRelay의 inn / homeOrAway / no)
+    half: int = None        # 0: 초(원정 공격), 1: 말(홈 공격)
+    at_bat: int = None
+
+    @classmethod
+    def from_json(cls, option, at_bat=None):
+        """textOptions의 dict 하나(와 그 플레이가 속한 textRelay)를 Play로 변환합니다."""
+        state = option.get('currentGameState') or {}
+        at_bat = at_bat or {}
+        half = at_bat.get('homeOrAway')
+        return cls(
+            seqno=option.get('seqno', 0),
+            type=EventType.coerce(option.get('type', 0)),
+            text=option.get('text', ''),
+            batter=state.get('batter'),
+            pitcher=state.get('pitcher'),
+            ball=state.get('ball', 0) or 0,
+            strike=state.get('strike', 0) or 0,
+            out=state.get('out', 0) or 0,
+            home_score=state.get('homeScore', 0) or 0,
+            away_score=state.get('awayScore', 0) or 0,
+            bases=(1 if state.get('base1') else 0) | (2 if state.get('base2') else 0) | (4 if state.get('base3') else 0),
+            inning=at_bat.get('inn'),
+            half=int(half) if str(half).isdigit() else None,
+            at_bat=at_bat.get('no'),
+        )
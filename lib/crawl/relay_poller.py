@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from crawl_baseball import (
+    API_BASE,
+    FETCH_MS,
+    PARSE_MS,
+    POLLING_INTERVAL,
+    GameState,
+    Timer,
+    build_api_url,
+    count_poll,
+    extract_game_id,
+    observe_poll,
+    process_relay_result,
+    setup_metrics,
+)
+from play_store import PlayStore
+from relay_capture import CaptureRecorder
+from status_board import StatusBoard
+
+# ===================================================================
+# 여러 경기를 한 프로세스(이벤트 루프 1개)에서 동시에 폴링
+#   python relay_poller.py GAME_ID1 GAME_ID2 ...
+#   python relay_poller.py --api-base http://127.0.0.1:8080 G1 G2   (가짜 서버)
+#   python relay_poller.py --record capture.jsonl.gz G1 G2           (응답 기록)
+#   python relay_poller.py --board G1 G2 G3 G4                       (격자 상황판, status_board.py)
+#   python relay_poller.py --store plays.db G1 G2                    (플레이 저장, play_store.py)
+#   python relay_poller.py --metrics-port 9100 --json-log poll.log G1 (지표 /metrics + 폴링별 JSON 로그)
+# ===================================================================
+REQUEST_TIMEOUT = 5       # 요청 1건당 제한 시간 (초)
+MAX_CONNECTIONS = 20      # 공유 커넥션 풀 크기 (keep-alive)
+KEEPALIVE_TIMEOUT = 30    # 쉬는 커넥션을 유지할 시간 (초)
+
+
+class MultiGamePoller:
+    """경기 ID 목록을 받아 하나의 세션(커넥션 풀)으로 game-polling을 반복 요청합니다."""
+
+    def __init__(self, game_ids, api_base=API_BASE, interval=None,
+                 clear=False, on_result=None, recorder=None, log=print, store=None):
+        self.states = {gid: GameState(gid) for gid in game_ids}
+        self.api_base = api_base
+        self.interval = interval   # None이면 경기 상황별 가변 주기 (state.scheduler)
+        self.clear = clear
+        # on_result(state, result_data): 기본은 crawl_baseball의 터미널 출력
+        self.on_result = on_result or (lambda state, result: process_relay_result(state, result, clear=self.clear))
+        self.recorder = recorder   # CaptureRecorder (응답 기록용, 선택)
+        self.log = log             # 오류/종료 알림 출력 (상황판을 쓸 때는 StatusBoard.log)
+        self.store = store         # PlayStore (플레이/상태/라인업 저장용, 선택)
+        self.session = None
+
+    async def fetch(self, state):
+        """경기 하나의 현재 이닝 데이터를 요청 -> (JSON(dict), 요청 ms, 파싱 ms). 변화가 없으면 data는 None."""
+        url = build_api_url(state.game_id, state.current_inning, self.api_base)
+        headers = dict(state.headers, **state.ingestor.conditional_headers())
+        body = None
+        with Timer(FETCH_MS) as fetch:
+            async with self.session.get(url, headers=headers) as response:
+                if response.status != 304:
+                    response.raise_for_status()
+                    body = await response.read()
+                    etag = response.headers.get('ETag')
+        # 304 또는 지난번과 같은 본문이면 JSON 파싱을 생략
+        if body is None or state.ingestor.is_unchanged(body, etag):
+            return None, fetch.ms, 0.0
+        with Timer(PARSE_MS) as parse:
+            data = json.loads(body)
+        if self.recorder:
+            self.recorder.record(state.game_id, state.current_inning, data)
+        return data, fetch.ms, parse.ms
+
+    async def poll_game(self, state):
+        """경기 하나를 interval 간격으로 계속 폴링합니다. (요청 시간만큼 대기 시간을 줄여 주기 유지)"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        while True:
+            try:
+                data, fetch_ms, parse_ms = await self.fetch(state)
+
+                if data is None:
+                    state.scheduler.record_unchanged()
+                    count_poll('unchanged')
+                elif not data.get('success') or 'result' not in data:
+                    self.log(f"[{time.strftime('%H:%M:%S')}] [{state.game_id}] API 오류: {data.get('message', '알 수 없는 오류')}")
+                    state.scheduler.record_error()
+                    count_poll('api_error')
+                else:
+                    state.ingestor.accept()
+                    before = len(state.play_log)
+                    started = time.perf_counter()
+                    self.on_result(state, data['result'])
+                    process_ms = (time.perf_counter() - started) * 1000
+                    new_plays = state.play_log[before:]
+                    if self.store:
+                        self.store.save(state, data['result'], new_plays)
+                    observe_poll(state, new_plays, fetch_ms, parse_ms, process_ms)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.log(f"[{time.strftime('%H:%M:%S')}] [{state.game_id}] 네트워크 오류: {e!r}")
+                state.scheduler.record_error()
+                count_poll('network_error')
+            except json.JSONDecodeError:
+                self.log(f"[{time.strftime('%H:%M:%S')}] [{state.game_id}] JSON 파싱 오류. (데이터 형식 문제)")
+                state.scheduler.record_error()
+                count_poll('parse_error')
+            except Exception as e:
+                self.log(f"[{time.strftime('%H:%M:%S')}] [{state.game_id}] 알 수 없는 오류: {e}")
+                state.scheduler.record_error()
+                count_poll('error')
+
+            if state.scheduler.finished:
+                self.log(f"[{time.strftime('%H:%M:%S')}] [{state.game_id}] 🏁 경기 종료, 폴링을 멈춥니다.")
+                return
+
+            if self.interval is None or state.scheduler.failures:
+                next_tick += state.scheduler.next_interval()
+            else:
+                next_tick += self.interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # 요청이 주기보다 오래 걸렸으면 밀린 틱은 건너뜀
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def run(self):
+        """모든 경기의 폴링 작업을 하나의 이벤트 루프에서 실행합니다."""
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            self.session = session
+            # 경기마다 시작 시점을 조금씩 어긋나게 해서 요청이 한 번에 몰리지 않게 함
+            stagger = (self.interval or POLLING_INTERVAL) / max(len(self.states), 1)
+            tasks = []
+            for i, state in enumerate(self.states.values()):
+                tasks.append(asyncio.create_task(self._start_later(state, i * stagger)))
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                self.session = None
+
+    async def _start_later(self, state, delay):
+        await asyncio.sleep(delay)
+        await self.poll_game(state)
+
+
+async def run_with_board(poller, board):
+    """폴링과 상황판 그리기(미뤄진 변경 처리)를 같은 이벤트 루프에서 실행합니다."""
+    drawer = asyncio.create_task(board.run())
+    try:
+        await poller.run()
+    finally:
+        drawer.cancel()
+
+
+def parse_game_ids(values):
+    """경기 ID 또는 네이버 중계 URL 목록을 경기 ID 목록으로 바꿉니다."""
+    game_ids = []
+    for value in values:
+        game_id = extract_game_id(value) if '/' in value else value
+        if not game_id:
+            print(f"오류: '{value}'에서 Game ID를 찾을 수 없습니다.")
+            continue
+        game_ids.append(game_id)
+    return game_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 경기 동시 문자중계 모니터링")
+    parser.add_argument('games', nargs='+', help="경기 ID 또는 중계 URL")
+    parser.add_argument('--api-base', default=API_BASE, help="API 주소 (가짜 서버 테스트용)")
+    parser.add_argument('--record', help="응답을 기록할 캡처 파일 경로 (relay_capture.py로 재생)")
+    parser.add_argument('--interval', type=float, default=None, help="고정 갱신 주기 (초, 없으면 경기 상황별 가변)")
+    parser.add_argument('--store', help="플레이/경기 상태/라인업을 저장할 SQLite 파일 (play_store.py)")
+    parser.add_argument('--board', action='store_true', help="경기별 상황판을 한 화면에 격자로 (바뀐 칸만 다시 그림)")
+    parser.add_argument('--metrics-port', type=int, help="지표(/metrics)를 내보낼 포트 (예: 9100)")
+    parser.add_argument('--json-log', help="폴링별 JSON 로그 파일 ('-'면 stderr)")
+    args = parser.parse_args()
+
+    game_ids = parse_game_ids(args.games)
+    if not game_ids:
+        return
+
+    interval_text = f"{args.interval}초" if args.interval else "경기 상황별 가변"
+    print(f"⚾ {len(game_ids)}개 경기 동시 모니터링 시작 (주기 {interval_text})")
+    recorder = CaptureRecorder(args.record) if args.record else None
+    store = PlayStore(args.store) if args.store else None
+    setup_metrics(args.metrics_port, args.json_log)
+    board = None
+    if args.board:
+        board = StatusBoard()
+        poller = MultiGamePoller(game_ids, api_base=args.api_base, interval=args.interval, recorder=recorder,
+                                 on_result=board.on_result, log=board.log, store=store)
+    else:
+        poller = MultiGamePoller(game_ids, api_base=args.api_base, interval=args.interval, recorder=recorder,
+                                 store=store)
+    try:
+        asyncio.run(run_with_board(poller, board) if board else poller.run())
+    except KeyboardInterrupt:
+        print("\n👋 모니터링을 종료합니다.")
+    finally:
+        if board:
+            board.close()
+        if recorder:
+            recorder.close()
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+import argparse
+import asyncio
+import dataclasses
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+
+import aiohttp
+from aiohttp import web
+
+from crawl_baseball import (
+    API_BASE, FETCH_MS, PARSE_MS, USER_INPUT_URL, GameState, Timer, apply_relay_result, build_api_url,
+    build_headers, extract_game_id,
+)
+from polling_scheduler import (
+    PHASE_ACTIVE, PHASE_BREAK, PHASE_CHANGE, PHASE_DELAY, PHASE_FINAL, PHASE_PREGAME, classify_phase,
+)
+from relay_poller import KEEPALIVE_TIMEOUT, MAX_CONNECTIONS, REQUEST_TIMEOUT, MultiGamePoller
+
+# ===================================================================
+# 여러 화면(my_relay.html, 전광판 등)이 같이 쓰는 중계 프록시 (baseball-relay/server.js 대체)
+#   python relay_proxy.py --port 3000
+#   python relay_proxy.py --api-base http://127.0.0.1:8080      (가짜 서버)
+#  - GET /api/relay?gameId=..&inning=..   네이버 응답 그대로 (gameId 없으면 USER_INPUT_URL의 경기)
+#  - GET /schedule/games/<ID>/game-polling  네이버와 같은 주소 → relay_poller.py --api-base로 그대로 사용
+#  - GET /api/stream/<ID>                 SSE: 새 플레이만 (폴링할 필요 없음)
+#  - GET /api/ws/<ID>                     WebSocket: SSE와 같은 메시지
+#  - GET /stats                           캐시 적중 / 합친 요청 / 네이버 요청 수
+# 같은 (경기, 이닝) 요청이 동시에 여러 개 와도 네이버에는 한 번만 요청하고(single-flight),
+# 경기 상황별로 짧게 캐시 → 네이버 요청 수는 화면 수와 상관없이 경기 수에 비례
+# ===================================================================
+DEFAULT_PORT = 3000
+# 경기 단계별 캐시 시간 (초): 타석 진행 중에는 짧게, 쉬는 시간에는 길게
+PHASE_TTLS = {
+    PHASE_PREGAME: 10.0,
+    PHASE_ACTIVE: 1.0,
+    PHASE_CHANGE: 3.0,
+    PHASE_BREAK: 5.0,
+    PHASE_DELAY: 10.0,
+    PHASE_FINAL: 300.0,
+}
+PAST_INNING_TTL = 60.0  # 지난 이닝은 거의 바뀌지 않음
+ERROR_TTL = 2.0         # 네이버 오류 시 이 시간 동안은 지난 응답을 그대로 씀 (재시도 폭주 방지)
+MAX_ENTRIES = 1000      # 캐시 항목이 이보다 많으면 만료된 것부터 정리
+SUBSCRIBER_QUEUE = 64   # 구독자별 대기 메시지 수 (넘치면 최신 스냅샷으로 다시 맞춤)
+SNAPSHOT_PLAYS = 20     # 새 구독자에게 처음 보내는 최근 플레이 수
+HEARTBEAT = 15.0        # SSE / WebSocket 연결 유지용 (초)
+GAME_ID = re.compile(r'^\w+$')
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """(경기, 이닝) 응답 한 개"""
+    body: bytes
+    etag: str               # 화면들에게 주는 ETag (본문 해시)
+    upstream_etag: str      # 네이버가 준 ETag (다음 요청에 If-None-Match)
+    expires: float
+
+
+class RelayCache:
+    """game-polling 응답 캐시 + 동시 요청 합치기 (single-flight)"""
+
+    def __init__(self, api_base=API_BASE, clock=time.monotonic):
+        self.api_base = api_base
+        self.clock = clock
+        self.session = None
+        self.entries = {}
+        self.inflight = {}
+        self.upstream_requests = 0
+        self.hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.stale = 0
+
+    async def get(self, game_id, inning):
+        """(경기, 이닝) 응답 -> CacheEntry. 캐시가 지났으면 네이버에 한 번만 요청"""
+        key = (game_id, int(inning))
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires > self.clock():
+            self.hits += 1
+            return entry
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, entry))
+            self.inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        # 먼저 요청한 화면이 연결을 끊어도 요청은 끝까지 진행 (기다리던 다른 화면을 위해)
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        self.inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()    # 기다리던 쪽이 모두 사라졌어도 경고가 남지 않게
+
+    async def _refresh(self, key, old):
+        game_id, inning = key
+        headers = build_headers(game_id)
+        if old is not None and old.upstream_etag:
+            headers['If-None-Match'] = old.upstream_etag
+        self.upstream_requests += 1
+        try:
+            async with self.session.get(build_api_url(game_id, inning, self.api_base), headers=headers) as response:
+                if response.status == 304 and old is not None:
+                    body, upstream_etag = old.body, old.upstream_etag
+                else:
+                    response.raise_for_status()
+                    body = await response.read()
+                    upstream_etag = response.headers.get('ETag')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.errors += 1
+            print(f"[{time.strftime('%H:%M:%S')}] [{game_id}] 네이버 요청 실패: {e!r}")
+            if old is None:
+                raise
+            # 지난 응답이 있으면 잠깐 그대로 씀
+            self.stale += 1
+            old.expires = self.clock() + ERROR_TTL
+            return old
+
+        etag = old.etag if old is not None and body == old.body else \
+            '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        entry = CacheEntry(body, etag, upstream_etag, self.clock() + ttl_for(inning, body))
+        if len(self.entries) >= MAX_ENTRIES:
+            self._prune()
+        self.entries[key] = entry
+        return entry
+
+    def _prune(self):
+        now = self.clock()
+        for key in [k for k, e in self.entries.items() if e.expires <= now]:
+            del self.entries[key]
+
+    def stats(self):
+        return {
+            'upstream_requests': self.upstream_requests,
+            'hits': self.hits,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'stale': self.stale,
+            'entries': len(self.entries),
+        }
+
+
+def ttl_for(inning, body):
+    """응답 내용(경기 단계, 현재 이닝)으로 캐시 시간을 정함"""
+    try:
+        result = json.loads(body).get('result') or {}
+    except ValueError:
+        return ERROR_TTL
+    phase = classify_phase(result)
+    current = result.get('textRelayData', {}).get('inn')
+    if phase != PHASE_FINAL and isinstance(current, int) and inning < current:
+        return PAST_INNING_TTL
+    return PHASE_TTLS.get(phase, PHASE_TTLS[PHASE_ACTIVE])
+
+
+class CachedPoller(MultiGamePoller):
+    """RelayCache를 통해서 폴링하는 MultiGamePoller (여러 경기 구독을 그때그때 시작/정지)"""
+
+    def __init__(self, cache, on_result):
+        super().__init__([], on_result=on_result)
+        self.cache = cache
+
+    async def fetch(self, state):
+        """MultiGamePoller.fetch와 같은 (JSON, 요청 ms, 파싱 ms). 요청 시간은 캐시를 거친 시간"""
+        with Timer(FETCH_MS) as fetch:
+            entry = await self.cache.get(state.game_id, state.current_inning)
+        if state.ingestor.is_unchanged(entry.body, entry.etag):
+            return None, fetch.ms, 0.0
+        with Timer(PARSE_MS) as parse:
+            data = json.loads(entry.body)
+        return data, fetch.ms, parse.ms
+
+
+def play_json(play):
+    """Play -> SSE / WebSocket으로 보낼 dict"""
+    return dataclasses.asdict(play)
+
+
+class GameFeed:
+    """경기 하나를 구독 중인 화면들에게 새 플레이를 보냄 (구독자가 있을 때만 폴링)"""
+
+    def __init__(self, game_id, poller):
+        self.state = GameState(game_id)
+        self.poller = poller
+        self.subscribers = set()
+        self.task = None
+        self.last = None        # 마지막으로 보낸 상태 (스냅샷용)
+        self.messages = 0
+
+    def subscribe(self):
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        if self.last is not None:
+            queue.put_nowait(self.snapshot())
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.poller.poll_game(self.state))
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def snapshot(self):
+        return json.dumps(dict(self.last, type='snapshot',
+                               plays=[play_json(p) for p in self.state.play_log[-SNAPSHOT_PLAYS:]]),
+                          ensure_ascii=False)
+
+    def handle_result(self, result_data):
+        """폴러 콜백: 새 플레이나 상태 변화가 있으면 모든 구독자에게 한 번 인코딩해서 보냄"""
+        new_plays = apply_relay_result(self.state, result_data)
+        relay_data = result_data.get('textRelayData', {})
+        current = {
+            'game': self.state.game_id,
+            'inning': relay_data.get('inn'),
+            'homeOrAway': relay_data.get('homeOrAway'),
+            'status': result_data.get('game', {}).get('statusInfo'),
+            'state': relay_data.get('currentGameState'),
+        }
+        if not new_plays and current == self.last:
+            return
+        first = self.last is None
+        self.last = current
+        if first:
+            message = self.snapshot()
+        else:
+            message = json.dumps(dict(current, type='delta', plays=[play_json(p) for p in new_plays]),
+                                 ensure_ascii=False)
+        self.messages += 1
+        for queue in self.subscribers:
+            if queue.full():
+                # 느린 화면: 밀린 메시지를 버리고 최신 스냅샷으로 다시 맞춤
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot())
+            else:
+                queue.put_nowait(message)
+
+
+class RelayProxy:
+    """프록시 aiohttp 앱 (캐시 + 구독)"""
+
+    def __init__(self, api_base=API_BASE, default_game=None):
+        self.cache = RelayCache(api_base)
+        self.poller = CachedPoller(self.cache, lambda state, result: self.feeds[state.game_id].handle_result(result))
+        self.default_game = default_game or extract_game_id(USER_INPUT_URL)
+        self.feeds = {}
+        self.client_requests = 0
+
+    def feed(self, game_id):
+        feed = self.feeds.get(game_id)
+        if feed is None:
+            feed = self.feeds[game_id] = GameFeed(game_id, self.poller)
+        return feed
+
+    async def relay_response(self, request, game_id):
+        self.client_requests += 1
+        inning = request.query.get('inning', '1')
+        if not GAME_ID.match(game_id or '') or not inning.isdigit():
+            return web.json_response({'error': '잘못된 경기 ID 또는 이닝입니다.'}, status=400)
+        try:
+            entry = await self.cache.get(game_id, int(inning))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return web.json_response({'error': '네이버 API에서 데이터를 가져오는 데 실패했습니다.'}, status=502)
+        if request.headers.get('If-None-Match') == entry.etag:
+            return web.Response(status=304, headers={'ETag': entry.etag})
+        return web.Response(body=entry.body, content_type='application/json', headers={'ETag': entry.etag})
+
+    async def handle_relay(self, request):
+        return await self.relay_response(request, request.query.get('gameId') or self.default_game)
+
+    async def handle_polling(self, request):
+        return await self.relay_response(request, request.match_info['game_id'])
+
+    async def handle_stream(self, request):
+        """SSE: data: {"type": "snapshot"|"delta", "plays": [...], ...}"""
+        game_id = request.match_info['game_id']
+        if not GAME_ID.match(game_id):
+            return web.json_response({'error': '잘못된 경기 ID입니다.'}, status=400)
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache',
+                                               'Access-Control-Allow-Origin': '*'})
+        await response.prepare(request)
+        feed = self.feed(game_id)
+        queue = feed.subscribe()
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT)
+                except asyncio.TimeoutError:
+                    await response.write(b": ping\n\n")
+                    continue
+                await response.write(f"data: {message}\n\n".encode('utf-8'))
+        except ConnectionResetError:
+            pass
+        finally:
+            feed.unsubscribe(queue)
+        return response
+
+    async def handle_ws(self, request):
+        game_id = request.match_info['game_id']
+        if not GAME_ID.match(game_id):
+            return web.json_response({'error': '잘못된 경기 ID입니다.'}, status=400)
+        ws = web.WebSocketResponse(heartbeat=HEARTBEAT)
+        await ws.prepare(request)
+        feed = self.feed(game_id)
+        queue = feed.subscribe()
+        closed = asyncio.create_task(self._wait_closed(ws))
+        try:
+            while True:
+                message = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait((message, closed), return_when=asyncio.FIRST_COMPLETED)
+                if closed in done:
+                    message.cancel()
+                    break
+                await ws.send_str(message.result())
+        except ConnectionResetError:
+            pass
+        finally:
+            feed.unsubscribe(queue)
+            closed.cancel()
+        return ws
+
+    @staticmethod
+    async def _wait_closed(ws):
+        # 화면이 보내는 메시지는 쓰지 않음 (닫힘만 확인)
+        async for _ in ws:
+            pass
+
+    async def handle_stats(self, request):
+        return web.json_response(dict(
+            self.cache.stats(),
+            client_requests=self.client_requests,
+            feeds={gid: {'subscribers': len(f.subscribers), 'messages': f.messages} for gid, f in self.feeds.items()},
+        ))
+
+    @web.middleware
+    async def cors(self, request, handler):
+        # 로컬 테스트용: 모든 도메인 허용 (server.js의 cors()와 같음)
+        response = await handler(request)
+        if not response.prepared:   # SSE / WebSocket은 이미 헤더를 보냄
+            response.headers['Access-Control-Allow-Origin'] = '*'
+        return response
+
+    async def on_startup(self, app):
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        self.cache.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def on_cleanup(self, app):
+        for feed in self.feeds.values():
+            if feed.task is not None:
+                feed.task.cancel()
+        await self.cache.session.close()
+
+    def make_app(self):
+        app = web.Application(middlewares=[self.cors])
+        app.router.add_get('/api/relay', self.handle_relay)
+        app.router.add_get('/schedule/games/{game_id}/game-polling', self.handle_polling)
+        app.router.add_get('/api/stream/{game_id}', self.handle_stream)
+        app.router.add_get('/api/ws/{game_id}', self.handle_ws)
+        app.router.add_get('/stats', self.handle_stats)
+        app.on_startup.append(self.on_startup)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="야구 중계 프록시 (캐시 + 요청 합치기 + SSE/WebSocket)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--api-base', default=API_BASE, help="API 주소 (가짜 서버 테스트: http://127.0.0.1:8080)")
+    parser.add_argument('--game', help="gameId 없이 /api/relay를 요청했을 때의 경기 (기본: USER_INPUT_URL)")
+    args = parser.parse_args()
+
+    proxy = RelayProxy(args.api_base, args.game)
+    print(f"⚾ 야구 중계 프록시 서버가 http://{args.host}:{args.port} 에서 실행 중입니다.")
+    print(f"   기본 경기 {proxy.default_game} / 실시간: http://{args.host}:{args.port}/api/stream/<경기ID>")
+    web.run_app(proxy.make_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
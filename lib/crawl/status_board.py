@@ -0,0 +1,278 @@
+import asyncio
+import collections
+import functools
+import os
+import sys
+import time
+import unicodedata
+
+from crawl_baseball import apply_relay_result
+from relay_model import EventType, GAME_EVENT_TYPES
+
+# ===================================================================
+# 터미널 상황판 (여러 경기를 한 화면에 격자로)
+#   python relay_poller.py --board G1 G2 G3 ...
+#   python crawl_baseball.py  (한 경기, 폴링마다 flush()로 한 번 그림)
+#  - 화면을 지우지 않고 ANSI 커서 이동으로 바뀐 칸(패널의 한 줄)만 다시 씀
+#    → 이벤트마다 clear 프로세스를 띄우지 않고, SSH에서도 깜빡이지 않음
+#  - 투구가 몰려 들어와도 바로 그리지 않고, 첫 변경부터 MIN_REDRAW_INTERVAL 동안 모아서 한 번에 그림
+#    (패널 내용도 그릴 때 경기마다 마지막 응답으로 한 번만 만듦)
+#  - 패널 단위로 지난번 그린 것과 비교해서, 바뀐 패널의 바뀐 줄만 다시 씀
+#  - 터미널 크기가 바뀌면 다음 그리기에서 전체를 다시 그림
+# ===================================================================
+MIN_REDRAW_INTERVAL = 0.2   # 다시 그리는 최소 간격 (초)
+PANEL_WIDTH = 40            # 경기 패널 하나의 폭 (글자 칸, 한글은 2칸)
+PANEL_GAP = 2               # 패널 사이 빈 칸
+RECENT_PLAYS = 4            # 패널마다 보여줄 최근 플레이 수
+PANEL_HEIGHT = 7 + RECENT_PLAYS  # 제목/점수/상황/주자/투수/타자/구분선 + 최근 플레이
+
+CSI = '\x1b['
+CLEAR_SCREEN = CSI + '2J' + CSI + 'H'
+HIDE_CURSOR = CSI + '?25l'
+SHOW_CURSOR = CSI + '?25h'
+
+
+@functools.lru_cache(maxsize=None)
+def char_width(ch):
+    """터미널에서 차지하는 칸 수 (한글/이모지 2칸, 결합 문자 0칸)"""
+    if unicodedata.combining(ch) or ch == '\ufe0f':
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1
+
+
+@functools.lru_cache(maxsize=4096)     # 패널 줄은 대부분 지난번과 같은 문자열
+def fit(text, width):
+    """text를 정확히 width칸으로 자르거나 공백으로 채움"""
+    if text.isascii():
+        return text[:width].ljust(width)
+    out = []
+    used = 0
+    for ch in text:
+        w = char_width(ch)
+        if used + w > width:
+            break
+        out.append(ch)
+        used += w
+    return ''.join(out) + ' ' * (width - used)
+
+
+def text_width(text):
+    return len(text) if text.isascii() else sum(map(char_width, text))
+
+
+def changed_span(old, new):
+    """같은 칸의 이전/새 내용 -> (바뀐 부분의 시작 열 오프셋, 다시 쓸 글자) (같으면 None)
+    앞쪽 같은 부분과 뒤쪽 공백은 건너뛰어 쓰는 양을 줄임"""
+    if old == new:
+        return None
+    if old is None:
+        return 0, new
+    i = 0
+    for a, b in zip(old, new):
+        if a != b:
+            break
+        i += 1
+    offset = text_width(new[:i])
+    tail = new[i:].rstrip(' ')
+    cover = text_width(old[i:].rstrip(' '))     # 지난번 글자가 남지 않게 덮을 폭
+    return offset, tail + ' ' * max(0, cover - text_width(tail))
+
+
+def move_to(row, col):
+    """1부터 세는 (행, 열)로 커서 이동"""
+    return f"{CSI}{row};{col}H"
+
+
+def enable_ansi():
+    """윈도우 콘솔에서 ANSI 이스케이프를 켬 (한 번만, 다른 OS는 그대로)"""
+    if os.name == 'nt':
+        os.system('')
+
+
+def format_play(play, lineup):
+    """터미널 출력과 같은 모양의 플레이 한 줄 (출력하지 않는 종류면 None)"""
+    if play.type == EventType.PITCH:
+        return f"[{lineup.name(play.batter)}] {play.text}"
+    if play.type in GAME_EVENT_TYPES:
+        return play.text.replace(' : ', ': ')
+    return None
+
+
+def panel_lines(state, result_data, recent):
+    """경기 하나의 패널 내용 (PANEL_HEIGHT줄)"""
+    game = result_data.get('game', {})
+    data = result_data.get('textRelayData', {})
+    game_state = data.get('currentGameState') or {}
+    bases = ''.join(f"[{n}]" if game_state.get(f'base{n}') else "[ ]" for n in (1, 2, 3))
+    lines = [
+        f"⚾ {state.game_id}",
+        f"{game.get('awayTeamName', '원정')} {game_state.get('awayScore', 0)} : "
+        f"{game_state.get('homeScore', 0)} {game.get('homeTeamName', '홈')}",
+        f"{game.get('statusInfo', '')}  B:{game_state.get('ball', 0)} S:{game_state.get('strike', 0)} "
+        f"O:{game_state.get('out', 0)}",
+        f"주자 {bases}",
+        f"투수: {state.lineup.name(game_state.get('pitcher'))}",
+        f"타자: {state.lineup.name(game_state.get('batter'))}",
+        "-" * PANEL_WIDTH,
+    ]
+    plays = list(recent)[-RECENT_PLAYS:]
+    lines.extend(f"  {text}" for text in plays)
+    lines.extend([''] * (PANEL_HEIGHT - len(lines)))
+    return lines
+
+
+class StatusBoard:
+    """경기별 패널을 격자로 배치하고, 지난번에 그린 칸과 비교해서 바뀐 칸만 다시 씀"""
+
+    def __init__(self, out=None, min_interval=MIN_REDRAW_INTERVAL, size=None, clock=time.monotonic):
+        self.out = out or sys.stdout
+        self.min_interval = min_interval
+        self.size = size            # (열, 행) 고정 (None이면 매번 터미널 크기를 읽음)
+        self.clock = clock
+        self.panels = {}            # 경기 ID -> 패널 줄 목록 (추가된 순서대로 배치)
+        self.pending = {}           # 경기 ID -> (상태, 마지막 응답) 아직 패널로 만들지 않은 것
+        self.fitted = {}            # 경기 ID -> (폭, 패널, 폭에 맞춘 줄) (바뀐 패널만 다시 맞춤)
+        self.recent = {}            # 경기 ID -> 최근 플레이 문자열
+        self.message = ''           # 맨 아래 줄 (오류/종료 알림)
+        self.drawn = {}             # (행, 열) -> 그 자리에 그려 둔 줄 목록 (패널/맨 아래 줄, 다음 그리기와 비교)
+        self.drawn_size = None
+        self.dirty = False
+        self.due = 0.0              # 모아 둔 변경을 그릴 시각
+        self.wakeup = asyncio.Event()   # run()을 깨움 (첫 변경이 들어왔을 때)
+        self.redraws = 0
+        self.cells_written = 0
+        self.bytes_written = 0
+        enable_ansi()
+
+    # --- 데이터 갱신 (그리기는 render가 몰아서) ---
+
+    def on_result(self, state, result_data):
+        """MultiGamePoller의 on_result: 상태 갱신 후 그리기를 요청 (패널은 그릴 때 만듦)"""
+        new_plays = apply_relay_result(state, result_data)
+        recent = self.recent.setdefault(state.game_id, collections.deque(maxlen=RECENT_PLAYS))
+        for play in new_plays:
+            text = format_play(play, state.lineup)
+            if text:
+                recent.append(text)
+        if result_data.get('textRelayData', {}).get('textRelays'):
+            self.pending[state.game_id] = (state, result_data)
+            self.request_render()
+
+    def build_panels(self):
+        """모아 둔 응답을 경기마다 마지막 것 하나로만 패널로 만듦"""
+        for game_id, (state, result_data) in self.pending.items():
+            lines = panel_lines(state, result_data, self.recent[game_id])
+            if self.panels.get(game_id) != lines:
+                self.panels[game_id] = lines
+        self.pending.clear()
+
+    def log(self, message):
+        """맨 아래 알림 줄 (print 대신 써야 상황판이 밀리지 않음)"""
+        self.message = message
+        self.request_render()
+
+    def request_render(self):
+        """바로 그리지 않고 표시만 함: 첫 변경부터 min_interval 뒤에 run()이 모아서 한 번 그림"""
+        if not self.dirty:
+            self.dirty = True
+            self.due = self.clock() + self.min_interval
+            self.wakeup.set()
+
+    # --- 그리기 ---
+
+    def terminal_size(self):
+        if self.size:
+            return self.size
+        try:
+            size = os.get_terminal_size(self.out.fileno())
+            return size.columns, size.lines
+        except (AttributeError, ValueError, OSError):
+            return 80, 24
+
+    def layout(self, columns, lines):
+        """현재 패널들 -> {(행, 열): 그 자리의 줄 목록} (패널 하나 또는 맨 아래 줄)"""
+        per_row = max(1, (columns + PANEL_GAP) // (PANEL_WIDTH + PANEL_GAP))
+        width = min(PANEL_WIDTH, columns)
+        fit_rows = max(1, (lines - 1) // (PANEL_HEIGHT + 1))
+        visible = list(self.panels.items())[:per_row * fit_rows]
+
+        blocks = {}
+        for index, (game_id, panel) in enumerate(visible):
+            top = (index // per_row) * (PANEL_HEIGHT + 1) + 1
+            left = (index % per_row) * (PANEL_WIDTH + PANEL_GAP) + 1
+            blocks[(top, left)] = self.fit_panel(game_id, panel, width)
+
+        hidden = len(self.panels) - len(visible)
+        footer = f"경기 {len(self.panels)}개" + (f" (화면 밖 {hidden}개)" if hidden else "")
+        if self.message:
+            footer += f"  {self.message}"
+        blocks[(lines, 1)] = [fit(footer, max(1, columns - 1))]   # 마지막 칸에 쓰면 스크롤될 수 있음
+        return blocks
+
+    def fit_panel(self, game_id, panel, width):
+        cached = self.fitted.get(game_id)
+        if cached is None or cached[0] != width or cached[1] is not panel:
+            cached = self.fitted[game_id] = (width, panel, [fit(text, width) for text in panel])
+        return cached[2]
+
+    def render(self, force=False):
+        """바뀐 줄만 화면에 씀. 모으는 시간(due)이 안 끝났으면 미룸 -> 그렸으면 True"""
+        if not self.dirty and not force:
+            return False
+        if not force and self.clock() < self.due:
+            return False
+
+        self.build_panels()
+        size = self.terminal_size()
+        blocks = self.layout(*size)
+        parts = []
+        if size != self.drawn_size:
+            # 처음이거나 터미널 크기가 바뀌면 전부 지우고 다시
+            parts.append(HIDE_CURSOR + CLEAR_SCREEN)
+            self.drawn = {}
+            self.drawn_size = size
+        for (row, col), old in self.drawn.items():
+            if (row, col) not in blocks:
+                # 없어진 자리 (패널이 화면 밖으로 밀림 등)는 공백으로 덮음
+                for offset, text in enumerate(old):
+                    parts.append(move_to(row + offset, col) + ' ' * text_width(text))
+        written = 0
+        for (row, col), block in sorted(blocks.items()):
+            old = self.drawn.get((row, col))
+            if old == block:
+                continue        # 그대로인 패널은 줄마다 비교하지 않음
+            for offset, text in enumerate(block):
+                span = changed_span(old[offset] if old and offset < len(old) else None, text)
+                if span:
+                    parts.append(move_to(row + offset, col + span[0]) + span[1])
+                    written += 1
+
+        if parts:
+            frame = ''.join(parts)
+            self.out.write(frame)
+            self.out.flush()
+            self.bytes_written += len(frame.encode('utf-8'))
+        self.drawn = blocks
+        self.cells_written += written
+        self.redraws += 1
+        self.dirty = False
+        return True
+
+    async def run(self):
+        """모아 둔 변경을 그림 (폴러와 같은 이벤트 루프에서 실행, 변경이 없으면 잠들어 있음)"""
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            await asyncio.sleep(max(0.0, self.due - self.clock()))
+            self.render()
+
+    def flush(self):
+        """모아 둔 변경을 지금 그림 (이벤트 루프 없이 폴링마다 한 번 그리는 crawl_baseball.py 한 경기 모드)"""
+        return self.render(force=True) if self.dirty else False
+
+    def close(self):
+        """남은 변경을 그리고 커서를 상황판 아래로 돌려놓음"""
+        self.render(force=True)
+        _, lines = self.drawn_size or self.terminal_size()
+        self.out.write(move_to(lines, 1) + SHOW_CURSOR + '\n')
+        self.out.flush()
@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import collections
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+from aiohttp import web
+
+from clock_sync import Histogram
+from metrics import CONTENT_TYPE, LOG, REGISTRY
+
+# ===================================================================
+# 운영용 비동기 서버 (aiohttp + python-socketio AsyncServer)
+#   cd lib/sound_server && python async_server.py --port 5000
+#   cd demo && python ../lib/sound_server/async_server.py          (demo/server.py 사용)
+#  - server.py는 Flask 개발 서버 + 연결마다 스레드 → 운영에서는 이벤트 루프 하나가 모든 연결을 처리
+#  - 시나리오 / 방 / 시계 / UDP·시리얼 출력은 현재 폴더의 server.py 것을 그대로 씀 (process_* 함수)
+#  - update_ui는 방마다 한 번만 인코딩해서 방 인원 모두에게 한 번에 보냄 (AsyncServer.emit to=방)
+#  - --cue-threads N: time_update / seek 처리(방 잠금 + bisect)를 이 프로세스 안의 N개 스레드에서 실행
+#    (0이면 이벤트 루프에서 바로 처리. 처리가 가벼워서 보통 이쪽이 빠름)
+#    프로세스를 여러 개 띄우는 것이 아님 (방/시계/출력 상태가 프로세스 하나에 있으므로 여러 개로 나눌 수 없음)
+#  - Socket.IO(재생/탐색/cue_report)는 기본적으로 같은 주소에서 연 페이지만 접속 가능
+#    다른 주소의 페이지도 받으려면 --cors-origin http://화면주소:포트 (또는 CORS_ORIGINS 환경변수, 쉼표 구분)
+# ===================================================================
+DEFAULT_PORT = 5000
+LATENCY_WINDOW = 1000
+
+
+def load_core(path):
+    """Flask 서버 모듈(server.py)을 불러옵니다. (__main__이 아니라서 socketio.run은 실행되지 않음)"""
+    path = os.path.abspath(path)
+    spec = importlib.util.spec_from_file_location('server', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['server'] = module
+    spec.loader.exec_module(module)
+    # demo/server.py처럼 공용 server.py를 불러와 server 자리에 바꿔 끼운 경우 그 모듈을 씀
+    return sys.modules['server']
+
+
+class LoopSink:
+    """update_ui 전송을 작업 스레드 대신 이벤트 루프에서 (어느 스레드에서 submit해도 됨)
+    OutputDispatcher의 'ui' 장치 자리에 그대로 끼움"""
+
+    def __init__(self, loop, send):
+        self.loop = loop
+        self.send = send    # 코루틴 함수
+        self.sent = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.queue_ms = Histogram()     # 대기열 → 전송 (/metrics의 output_queue_ms{sink="ui"})
+
+    def submit(self, payload, key=None, at=None):
+        self.loop.call_soon_threadsafe(self._start, payload, time.perf_counter())
+        return True
+
+    def _start(self, payload, enqueued):
+        self.loop.create_task(self._send(payload, enqueued))
+
+    async def _send(self, payload, enqueued):
+        try:
+            await self.send(payload)
+            self.sent += 1
+            latency = time.perf_counter() - enqueued
+            self.latencies.append(latency)
+            self.queue_ms.observe(latency * 1000)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ [ui] 전송 실패: {e}")
+
+    def close(self, timeout=None):
+        pass
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+
+        def pick(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        return {
+            'sent': self.sent,
+            'dropped': 0,
+            'coalesced': 0,
+            'errors': self.errors,
+            'pending': 0,
+            'latency_ms': {'p50': pick(50), 'p95': pick(95), 'p99': pick(99), 'max': pick(100)},
+        }
+
+
+def create_app(core, cue_threads=0, cors_origins=None):
+    """cors_origins: 접속을 허용할 다른 출처 목록 (None이면 같은 출처만)"""
+    sio = socketio.AsyncServer(async_mode='aiohttp', cors_allowed_origins=cors_origins or None)
+    app = web.Application()
+    sio.attach(app)
+    pool = ThreadPoolExecutor(cue_threads, thread_name_prefix='cue') if cue_threads else None
+
+    async def run(fn, *args):
+        if pool is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    async def send_ui(item):
+        payload, room, at = item
+        await sio.emit('update_ui', (payload, at), to=room)
+        core.observe_emit(payload)
+
+    async def on_startup(app):
+        # Flask-SocketIO로 보내던 'ui' 장치 / 전체 알림을 이벤트 루프용으로 교체
+        loop = asyncio.get_running_loop()
+        old = core.outputs.sinks.get('ui')
+        core.outputs.sinks['ui'] = LoopSink(loop, send_ui)
+        core.outputs.register_metrics('ui', core.outputs.sinks['ui'])
+        if old is not None:
+            old.close()
+        core.broadcast = lambda name, data: loop.call_soon_threadsafe(
+            lambda: loop.create_task(sio.emit(name, data)))
+
+    async def on_cleanup(app):
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+
+    @sio.event
+    async def connect(sid, environ, auth=None):
+        core.sessions.connect(sid)
+
+    @sio.event
+    async def disconnect(sid, *args):
+        core.sessions.disconnect(sid)
+
+    @sio.on('join_room')
+    async def join(sid, data):
+        left, room = core.process_join(sid, data['room'])
+        if left:
+            await sio.leave_room(sid, left)
+        await sio.enter_room(sid, room.name)
+
+    @sio.on('leave_room')
+    async def leave(sid, data=None):
+        left = core.process_leave(sid)
+        if left:
+            await sio.leave_room(sid, left)
+
+    @sio.on('clock_ping')
+    async def clock_ping(sid, data):
+        received = time.time()
+        await sio.emit('clock_pong', core.process_clock_ping(data, received), to=sid)
+
+    @sio.on('cue_report')
+    async def cue_report(sid, data):
+        core.process_cue_report(data)
+
+    @sio.on('time_update')
+    async def time_update(sid, data):
+        await run(core.process_time_update, sid, data)
+
+    @sio.on('seek_event')
+    async def seek_event(sid, data):
+        await run(core.process_seek, sid, data)
+
+    @sio.on('playback_state')
+    async def playback_state(sid, data):
+        core.process_playback_state(sid, data)
+
+    @sio.on('cue_window')
+    async def cue_window(sid, data):
+        return core.process_cue_window(sid, data)
+
+    # Flask 앱과 같은 템플릿 폴더 (demo/server.py면 demo/templates)
+    index_path = os.path.join(core.app.root_path, core.app.template_folder, 'index.html')
+
+    async def index(request):
+        # index.html은 템플릿 변수가 없어서 파일 그대로 보냄
+        return web.FileResponse(index_path)
+
+    async def output_stats(request):
+        return web.json_response(core.outputs.stats())
+
+    async def clock_stats(request):
+        return web.json_response(core.clock.stats())
+
+    async def metrics(request):
+        return web.Response(body=REGISTRY.render().encode('utf-8'), headers={'Content-Type': CONTENT_TYPE})
+
+    app.router.add_get('/', index)
+    app.router.add_get('/stats/outputs', output_stats)
+    app.router.add_get('/stats/clock', clock_stats)
+    app.router.add_get('/metrics', metrics)
+    static_dir = core.app.static_folder     # Flask 앱과 같은 static 폴더 (있을 때만)
+    if static_dir and os.path.isdir(static_dir):
+        app.router.add_static('/static', static_dir)
+    app['sio'] = sio
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="야구 중계 시스템 서버 (운영용 비동기)")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cue-threads', type=int, default=0,
+                        help="time_update/seek 처리 스레드 수, 프로세스 수 아님 (0: 이벤트 루프에서 처리)")
+    parser.add_argument('--cors-origin', nargs='+', metavar='ORIGIN',
+                        default=[o for o in os.environ.get('CORS_ORIGINS', '').split(',') if o],
+                        help="Socket.IO 접속을 허용할 다른 출처 (기본: 같은 출처만)")
+    parser.add_argument('--core', default='server.py', help="시나리오/출력 설정을 가져올 server.py 경로 (현재 폴더 기준)")
+    parser.add_argument('--live', nargs='+', metavar='GAME_ID', help="실시간 문자중계 경기 ID")
+    parser.add_argument('--api-base', help="중계 API 주소 (가짜 서버 테스트: http://127.0.0.1:8080)")
+    parser.add_argument('--json-log', metavar='PATH', help="이벤트별 지연을 JSON 한 줄씩 기록 ('-'면 stderr)")
+    args = parser.parse_args()
+    if args.json_log:
+        LOG.open(args.json_log)
+
+    core = load_core(args.core)
+    if args.live:
+        core.start_live_feed(args.live, args.api_base)
+
+    print(f"⚾ 야구 중계 시스템 서버 시작 (비동기, cue 스레드 {args.cue_threads}개)")
+    print(f"👉 http://localhost:{args.port} 접속하세요")
+    app = create_app(core, args.cue_threads, args.cors_origin)
+    web.run_app(app, host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == '__main__':
+    main()
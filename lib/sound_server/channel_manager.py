@@ -0,0 +1,160 @@
+import os
+import time
+
+# ===================================================================
+# 여러 소리 동시 재생 (BGM / 관중 함성 / 선수 이름 콜)
+#  - mixer.music 한 채널만 쓰면 새 소리가 이전 소리를 끊어버림
+#  - 채널 여러 개를 미리 잡아두고(set_reserved) 그룹별 최대 동시 재생 수와 우선순위를 둠
+#  - 콜/함성이 나오는 동안 BGM 볼륨을 낮춤 (ducking), 끝나면 정확한 시각에 원래대로
+#  - 채널이 모자라면 같은 그룹의 가장 오래된 소리 → 우선순위 낮은 그룹의 소리 순으로 뺏어옴
+#  - 제한 시간(fadeout)은 소리(voice)마다 따로
+# ===================================================================
+GROUP_BGM = 'bgm'
+GROUP_CROWD = 'crowd'
+GROUP_CALLOUT = 'callout'
+DEFAULT_GROUP = GROUP_BGM
+
+NUM_CHANNELS = 8
+CHANNEL_GROUPS = {
+    # voices: 동시에 재생할 수 있는 수, priority: 높을수록 뺏기지 않음
+    # duck: 이 그룹이 재생 중일 때 다른 그룹의 볼륨 배율
+    GROUP_BGM: {'voices': 1, 'priority': 0, 'volume': 1.0, 'duck': {}},
+    GROUP_CROWD: {'voices': 3, 'priority': 1, 'volume': 1.0, 'duck': {GROUP_BGM: 0.5}},
+    GROUP_CALLOUT: {'voices': 2, 'priority': 2, 'volume': 1.0, 'duck': {GROUP_BGM: 0.25, GROUP_CROWD: 0.5}},
+}
+
+
+class Voice:
+    """채널 하나에서 재생 중인 소리 한 개"""
+
+    def __init__(self, channel, group, path, started, ends):
+        self.channel = channel
+        self.group = group
+        self.path = path
+        self.started = started
+        self.ends = ends        # 끝나는 시각 (무한 반복이면 None)
+
+
+class ChannelManager:
+    """그룹별 채널 배정 + ducking + voice stealing. TimelineScheduler의 재생 backend로 사용"""
+
+    def __init__(self, cache, groups=CHANNEL_GROUPS, num_channels=NUM_CHANNELS,
+                 channel_factory=None, clock=time.monotonic):
+        self.cache = cache
+        self.groups = groups
+        self.clock = clock
+        if channel_factory is None:
+            import pygame
+            # Sound.play()가 자동으로 고르는 채널과 겹치지 않게 전부 예약
+            pygame.mixer.set_num_channels(num_channels)
+            pygame.mixer.set_reserved(num_channels)
+            channel_factory = pygame.mixer.Channel
+        self.channels = [channel_factory(i) for i in range(num_channels)]
+        self.voices = {}    # channel 번호 -> Voice
+        self.stolen = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------
+    # 채널 고르기
+    # ------------------------------------------------------------
+    def _prune(self, now):
+        for idx, voice in list(self.voices.items()):
+            if not voice.channel.get_busy() or (voice.ends is not None and voice.ends <= now):
+                del self.voices[idx]
+
+    def _pick_channel(self, group):
+        """(채널 번호, 뺏은 Voice 또는 None). 줄 수 없으면 (None, None)"""
+        mine = [(v.started, idx) for idx, v in self.voices.items() if v.group == group]
+        if len(mine) >= self.groups[group]['voices']:
+            idx = min(mine)[1]
+            return idx, self.voices[idx]
+
+        for idx in range(len(self.channels)):
+            if idx not in self.voices:
+                return idx, None
+
+        # 빈 채널이 없으면 우선순위가 같거나 낮은 그룹에서 (낮은 것, 오래된 것 순으로)
+        priority = self.groups[group]['priority']
+        candidates = [
+            (self.groups[v.group]['priority'], v.started, idx)
+            for idx, v in self.voices.items()
+            if self.groups[v.group]['priority'] <= priority
+        ]
+        if not candidates:
+            return None, None
+        idx = min(candidates)[2]
+        return idx, self.voices[idx]
+
+    def _apply_volumes(self):
+        """재생 중인 그룹들의 duck 설정을 반영해 채널 볼륨을 다시 계산 (여러 개면 가장 작은 배율)"""
+        active = {v.group for v in self.voices.values()}
+        for voice in self.voices.values():
+            duck = min((self.groups[other]['duck'].get(voice.group, 1.0) for other in active), default=1.0)
+            voice.channel.set_volume(self.groups[voice.group]['volume'] * duck)
+
+    # ------------------------------------------------------------
+    # backend 인터페이스 (play / stop / fadeout / prepare / next_wakeup / tick)
+    # ------------------------------------------------------------
+    def play(self, file_path, loops=0, group=None):
+        group = group if group in self.groups else DEFAULT_GROUP
+        sound = self.cache.get(file_path)
+        if sound is None:
+            return None
+
+        now = self.clock()
+        self._prune(now)
+        idx, victim = self._pick_channel(group)
+        if idx is None:
+            self.dropped += 1
+            print(f"⚠️ 채널 부족: {os.path.basename(file_path)} 재생 안 함")
+            return None
+        if victim is not None:
+            self.stolen += 1
+
+        channel = self.channels[idx]
+        ends = None if loops < 0 else now + sound.get_length() * (loops + 1)
+        voice = Voice(channel, group, file_path, now, ends)
+        self.voices[idx] = voice
+        self._apply_volumes()
+        channel.play(sound, loops=loops)
+        return voice
+
+    def stop(self, group=None):
+        for idx, voice in list(self.voices.items()):
+            if group is None or voice.group == group:
+                voice.channel.stop()
+                del self.voices[idx]
+        self._apply_volumes()
+
+    def fadeout(self, ms, voice=None):
+        """voice가 아직 그 채널에서 재생 중일 때만 페이드아웃 (이미 뺏겼으면 무시)"""
+        if voice is None:
+            targets = list(self.voices.values())
+        else:
+            targets = [v for v in self.voices.values() if v is voice]
+        faded = False
+        for target in targets:
+            if target.channel.get_busy():
+                target.channel.fadeout(ms)
+                target.ends = self.clock() + ms / 1000
+                faded = True
+        return faded
+
+    def prepare(self, file_path):
+        self.cache.prefetch(file_path)
+
+    def next_wakeup(self):
+        """다음에 소리가 끝나는 시각 (그때 ducking을 풀어야 함)"""
+        ends = [v.ends for v in self.voices.values() if v.ends is not None]
+        return min(ends) if ends else None
+
+    def tick(self):
+        self._prune(self.clock())
+        self._apply_volumes()
+
+    def stats(self):
+        return {
+            'playing': {name: sum(1 for v in self.voices.values() if v.group == name) for name in self.groups},
+            'stolen': self.stolen,
+            'dropped': self.dropped,
+        }
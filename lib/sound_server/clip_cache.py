@@ -0,0 +1,121 @@
+import collections
+import os
+import threading
+
+# ===================================================================
+# 미리 디코딩해둔 효과음 캐시
+#  - mixer.music.load()는 재생 순간에 SD카드에서 MP3를 읽고 디코딩 → 라즈베리파이에서 수백 ms 지연
+#  - 시작할 때(또는 재생 몇 초 전에) pygame.mixer.Sound로 디코딩해서 메모리에 보관
+#  - 메모리 한도(바이트)를 넘으면 가장 오래 안 쓴 클립부터 버림 (LRU)
+# ===================================================================
+DEFAULT_BUDGET = 64 * 1024 * 1024   # 디코딩된 PCM 기준 64MB
+SOUND_EXTENSIONS = ('.mp3', '.ogg', '.wav')
+
+
+def sound_nbytes(sound):
+    """디코딩된 Sound가 차지하는 메모리 (mixer 형식 기준 추정)"""
+    import pygame
+    freq, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * freq) * (abs(size) // 8) * channels
+
+
+def list_clips(directory):
+    """폴더 안의 소리 파일 경로 목록 (예: sound/ 선수 이름 MP3)"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(SOUND_EXTENSIONS)
+    )
+
+
+class ClipCache:
+    """파일 경로 -> 디코딩된 Sound (LRU + 메모리 한도)"""
+
+    def __init__(self, budget=DEFAULT_BUDGET, loader=None, sizer=sound_nbytes):
+        if loader is None:
+            import pygame
+            loader = pygame.mixer.Sound
+        self.budget = budget
+        self.loader = loader
+        self.sizer = sizer
+        self.clips = collections.OrderedDict()   # path -> (sound, nbytes)
+        self.used = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, path):
+        return path in self.clips
+
+    def _load(self, path):
+        """디코딩 후 캐시에 넣습니다. 파일이 없거나 읽기 실패면 None"""
+        if not os.path.exists(path):
+            print(f"❌ 파일 없음: {path}")
+            return None
+        try:
+            sound = self.loader(path)
+        except Exception as e:
+            print(f"❌ 디코딩 에러: {path} ({e})")
+            return None
+
+        nbytes = self.sizer(sound)
+        with self.lock:
+            if path in self.clips:
+                return self.clips[path][0]
+            self.clips[path] = (sound, nbytes)
+            self.used += nbytes
+            self._evict_locked(keep=path)
+        return sound
+
+    def _evict_locked(self, keep):
+        while self.used > self.budget and len(self.clips) > 1:
+            path, (_, nbytes) = next(iter(self.clips.items()))
+            if path == keep:
+                self.clips.move_to_end(path)
+                continue
+            del self.clips[path]
+            self.used -= nbytes
+            self.evictions += 1
+
+    def get(self, path):
+        """재생할 Sound. 캐시에 없으면 이 자리에서 디코딩 (느림)"""
+        with self.lock:
+            entry = self.clips.get(path)
+            if entry is not None:
+                self.clips.move_to_end(path)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return self._load(path)
+
+    def preload(self, paths):
+        """시작할 때 미리 디코딩. 한도를 넘는 만큼은 앞쪽 것이 밀려남"""
+        loaded = 0
+        for path in paths:
+            with self.lock:
+                if path in self.clips:
+                    self.clips.move_to_end(path)   # 곧 쓸 클립은 밀려나지 않게
+                    continue
+            if self._load(path) is not None:
+                loaded += 1
+        return loaded
+
+    def prefetch(self, path):
+        """곧 재생할 클립: 있으면 최근 사용으로 표시, 없으면 별도 스레드에서 디코딩"""
+        if path in self.clips:
+            self.preload([path])
+        else:
+            threading.Thread(target=self.preload, args=([path],), daemon=True).start()
+
+    def stats(self):
+        return {
+            'clips': len(self.clips),
+            'used_mb': self.used / (1024 * 1024),
+            'budget_mb': self.budget / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
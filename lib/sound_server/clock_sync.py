@@ -0,0 +1,153 @@
+import bisect
+import collections
+import json
+import threading
+import time
+
+from sound_protocol import CMD_PING, CMD_PONG
+
+# ===================================================================
+# 시계 맞추기 (NTP 방식) + 지연 히스토그램
+#   t0: 보낸 시각(클라이언트)  t1: 받은 시각(서버)  t2: 답한 시각(서버)  t3: 답을 받은 시각(클라이언트)
+#   offset = ((t1 - t0) + (t2 - t3)) / 2   → 서버 시계 - 클라이언트 시계
+#   rtt    = (t3 - t0) - (t2 - t1)         → 왕복 네트워크 시간
+#  - 최근 측정값 중 RTT가 가장 짧은 것의 offset을 씀 (큐에 오래 머문 측정값은 부정확)
+#  - 브라우저(clock_ping/clock_pong)와 라즈베리파이(UDP ping/pong)가 같은 계산을 사용
+# ===================================================================
+SYNC_SAMPLES = 8            # 기억하는 최근 측정 수
+SYNC_INTERVAL = 10.0        # 다시 맞추는 주기 (초)
+SYNC_BURST = 5              # 처음 연결했을 때 연속으로 보내는 ping 수
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+# ClockService가 모으는 히스토그램 (ms, /metrics에는 server_ 접두사로 나감)
+CLOCK_HISTOGRAMS = {
+    'browser_rtt_ms': "브라우저 ping 왕복",
+    'time_update_ms': "브라우저가 보낸 time_update가 서버에 오기까지",
+    'dispatch_lead_ms': "신호를 재생 시각보다 얼마나 먼저 보냈는지",
+    'ui_late_ms': "화면이 예정 시각보다 늦게 반영한 정도 (브라우저 보고)",
+    'pi_late_ms': "라즈베리파이가 예정 시각보다 늦게 재생한 정도 (Pi 보고)",
+    'live_dispatch_ms': "실시간 중계: 플레이를 받은 뒤 신호를 내보내기까지",
+    'live_emit_ms': "실시간 중계: 플레이를 받은 뒤 화면으로 실제 전송하기까지",
+    'live_ui_ms': "실시간 중계: 플레이를 받은 뒤 화면에 반영되기까지 (브라우저 보고)",
+}
+
+
+def ntp_sample(t0, t1, t2, t3):
+    """ping/pong 한 번의 (offset, rtt) (초)"""
+    return ((t1 - t0) + (t2 - t3)) / 2, (t3 - t0) - (t2 - t1)
+
+
+class ClockSync:
+    """클라이언트 쪽: 서버 시계와의 차이 추정"""
+
+    def __init__(self, samples=SYNC_SAMPLES):
+        self.samples = collections.deque(maxlen=samples)   # (rtt, offset)
+        self.offset = 0.0
+        self.rtt = None
+
+    @property
+    def synced(self):
+        return self.rtt is not None
+
+    def add(self, t0, t1, t2, t3):
+        offset, rtt = ntp_sample(t0, t1, t2, t3)
+        self.samples.append((rtt, offset))
+        self.rtt, self.offset = min(self.samples)
+        return offset, rtt
+
+    def spread(self):
+        """최근 측정 offset들의 흔들림 (최대 - 최소, 초)"""
+        offsets = [o for _, o in self.samples]
+        return max(offsets) - min(offsets) if offsets else 0.0
+
+
+class Histogram:
+    """고정 구간(ms) 히스토그램"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)     # 마지막 칸은 가장 큰 구간 초과
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value_ms):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+            self.count += 1
+            self.total += value_ms
+            self.max = max(self.max, value_ms)
+
+    def quantile(self, q):
+        """구간 상한으로 어림한 분위수 (ms)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.max,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class ClockService:
+    """서버 쪽: ping에 답하고, 지연 히스토그램을 모읍니다. (server.py / demo/server.py 공용)"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.histograms = {name: Histogram() for name in CLOCK_HISTOGRAMS}
+        self.pi = {}    # 라즈베리파이가 마지막으로 알려준 offset / rtt
+
+    def pong(self, t0, received):
+        """ping 답장 (t0, t1, t2)"""
+        return {'t0': t0, 't1': received, 't2': self.clock()}
+
+    def observe(self, name, value_ms):
+        self.histograms[name].observe(value_ms)
+
+    def serve_udp(self, sock):
+        """라즈베리파이의 UDP ping에 답하는 루프 (스레드로 실행)"""
+        while True:
+            try:
+                data, addr = sock.recvfrom(4096)
+            except OSError:
+                return
+            received = self.clock()
+            try:
+                msg = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(msg, dict) or msg.get('cmd') != CMD_PING:
+                continue
+            reply = dict(self.pong(msg.get('t0'), received), cmd=CMD_PONG)
+            sock.sendto(json.dumps(reply).encode('utf-8'), addr)
+
+            for late in msg.get('late_ms', []):
+                self.observe('pi_late_ms', late)
+            if 'offset' in msg:
+                self.pi = {'addr': addr[0], 'offset_ms': msg['offset'] * 1000, 'rtt_ms': (msg.get('rtt') or 0) * 1000}
+
+    def start_udp(self, sock):
+        thread = threading.Thread(target=self.serve_udp, args=(sock,), name="clock-udp", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return {
+            'histograms': {name: h.snapshot() for name, h in self.histograms.items()},
+            'pi': self.pi,
+        }
+
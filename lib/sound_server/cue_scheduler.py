@@ -0,0 +1,135 @@
+import threading
+import time
+from dataclasses import dataclass
+
+# ===================================================================
+# 서버 쪽 신호 예약 (push 모드)
+#  브라우저는 time_update를 계속 보내지 않고 재생/일시정지/탐색/배속이 바뀔 때만
+#  playback_state(영상 시간, 그 순간의 서버 시각, 배속, 정지 여부)를 한 번 보냄
+#  → 서버는 그 기준점으로 "지금 영상 시간"을 계산해서 스피커/LED 신호를 직접 예약
+#  → 전광판은 브라우저가 cue_window로 앞으로 나올 이벤트를 받아 스스로 예약
+# ===================================================================
+CUE_WINDOW = 60.0        # 브라우저가 한 번에 받아가는 영상 구간 (초)
+CUE_WINDOW_MAX = 200     # 한 번에 보내는 최대 이벤트 수 (넘으면 구간을 줄임)
+IDLE_WAIT = 1.0          # 예약할 이벤트가 없을 때 다시 확인하는 간격 (초)
+
+
+@dataclass(slots=True)
+class PlaybackState:
+    """브라우저가 알려준 재생 기준점: 서버 시각 at에 영상이 video_time초였음"""
+    video_time: float
+    at: float
+    rate: float = 1.0
+    paused: bool = False
+
+    def video_at(self, t):
+        """서버 시각 t의 영상 시간"""
+        if self.paused:
+            return self.video_time
+        return self.video_time + (t - self.at) * self.rate
+
+    def server_time(self, video_time):
+        """영상 시간 video_time이 되는 서버 시각"""
+        return self.at + (video_time - self.video_time) / self.rate
+
+
+def cue_window(timeline, start, inclusive=False, span=CUE_WINDOW, limit=CUE_WINDOW_MAX):
+    """start초 이후 span초 안의 이벤트 원본(dict) 목록 -> cue_window 응답
+    inclusive: 정확히 start초인 이벤트도 포함 (처음 받을 때 / 탐색 직후)"""
+    lo = timeline.index_at(start) if inclusive else timeline.index_after(start)
+    hi = timeline.index_after(start + span, lo)
+    end = start + span
+    if hi - lo > limit:
+        # 같은 시간의 이벤트가 잘리지 않도록 그 시간까지는 모두 포함
+        end = timeline.times[lo + limit - 1]
+        hi = timeline.index_after(end, lo)
+    return {
+        'from': start,
+        'to': end,
+        'events': [event.payload for event in timeline.events[lo:hi]],
+        'last': hi >= len(timeline),   # 시나리오 끝까지 받았음
+    }
+
+
+class CueScheduler:
+    """push 모드 방들의 재생 기준점을 보고, 때가 된 이벤트를 dispatch(event, room, at)로 넘김
+    (lookahead초 먼저 넘기고 정확한 시각 at을 붙임 → 출력 분배기 / 라즈베리파이가 시각에 맞춰 실행)"""
+
+    def __init__(self, dispatch, lookahead=0.5, clock=time.time):
+        self.dispatch = dispatch
+        self.lookahead = lookahead
+        self.clock = clock
+        self.rooms = {}
+        self.cond = threading.Condition()
+        self.running = False
+        self.dirty = False      # 계산하는 동안 기준점이 바뀌었으면 기다리지 않고 다시 계산
+        self.thread = None
+
+    def update(self, room, state, seek=False):
+        """방의 재생 기준점을 바꿉니다. (seek이면 그 전 이벤트는 실행된 것으로 처리)"""
+        with room.lock:
+            room.playback = state
+            if seek or room.cursor.last_time is None:
+                room.cursor.seek(state.video_time, inclusive=True)
+        with self.cond:
+            self.rooms[room.name] = room
+            self.dirty = True
+            self.cond.notify()
+
+    def wake(self):
+        """시나리오가 바뀌었을 때 등 다음 예약 시각을 다시 계산"""
+        with self.cond:
+            self.dirty = True
+            self.cond.notify()
+
+    def run_once(self, now=None):
+        """때가 된 이벤트를 넘기고 다음에 깨어날 시각을 돌려줌 (없으면 None)"""
+        now = self.clock() if now is None else now
+        next_wake = None
+        with self.cond:
+            rooms = list(self.rooms.values())
+        for room in rooms:
+            if not room.members:
+                with self.cond:
+                    if self.rooms.get(room.name) is room:
+                        del self.rooms[room.name]
+                continue
+            state = room.playback
+            if state is None or state.paused:
+                continue
+            with room.lock:
+                due = room.cursor.take_until(state.video_at(now + self.lookahead))
+                position = room.cursor.position
+                times = room.cursor.timeline.times
+                upcoming = times[position] if position < len(times) else None
+            for event in due:
+                self.dispatch(event, room, max(now, state.server_time(event.time)))
+            if upcoming is not None:
+                wake = state.server_time(upcoming) - self.lookahead
+                next_wake = wake if next_wake is None else min(next_wake, wake)
+        return next_wake
+
+    def run(self):
+        while self.running:
+            with self.cond:
+                self.dirty = False
+            next_wake = self.run_once()
+            with self.cond:
+                if not self.running or self.dirty:
+                    continue
+                wait = IDLE_WAIT if next_wake is None else min(IDLE_WAIT, next_wake - self.clock())
+                if wait > 0:
+                    self.cond.wait(wait)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="cue-scheduler", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join(1.0)
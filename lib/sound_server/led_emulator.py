@@ -0,0 +1,111 @@
+import argparse
+import collections
+import os
+import select
+import tty
+
+from led_protocol import (
+    EFFECT_BALL, EFFECT_HIT, EFFECT_HOMERUN, EFFECT_NONE, EFFECT_OUT, EFFECT_SCORE, EFFECT_STRIKE,
+    OP_BASES, OP_CLEAR, OP_COUNT, OP_EFFECT, OP_INNING, OP_SCORE, FrameDecoder,
+)
+
+# ===================================================================
+# 아두이노 LED 전광판 에뮬레이터 (아두이노 없이 시험할 때)
+#   python led_emulator.py
+#   → 출력된 가상 포트로 서버 실행: LED_FRAMED=1 ARDUINO_PORT=/dev/pts/3 python server.py
+#  - 리눅스/macOS의 가상 터미널(pty)을 시리얼 포트처럼 열어 프레임을 받고 상태를 출력
+#  - 코드에서는 EmulatedBoard.feed를 LedLink의 write로 바로 연결해서 써도 됨 (loopback)
+# ===================================================================
+EFFECT_NAMES = {
+    EFFECT_STRIKE: '스트라이크', EFFECT_BALL: '볼', EFFECT_HIT: '안타',
+    EFFECT_HOMERUN: '홈런', EFFECT_OUT: '아웃', EFFECT_SCORE: '득점',
+}
+
+
+class EmulatedBoard:
+    """프레임을 받아 LED 상태를 바꾸는 가짜 아두이노 (펌웨어와 같은 순서로 해석)"""
+
+    def __init__(self):
+        self.decoder = FrameDecoder()
+        self.effects = collections.deque(maxlen=100)    # 재생한 효과 ID (최근 100개)
+        self._clear()
+
+    def feed(self, data):
+        """시리얼로 받은 바이트 -> 처리한 프레임 수"""
+        frames = self.decoder.feed(data)
+        for commands in frames:
+            for op, *args in commands:
+                self.apply(op, args)
+        return len(frames)
+
+    def apply(self, op, args):
+        if op == OP_CLEAR:
+            self._clear()
+        elif op == OP_BASES:
+            self.bases = args[0]
+        elif op == OP_COUNT:
+            self.balls, self.strikes, self.outs = args
+        elif op == OP_SCORE:
+            self.away, self.home = args
+        elif op == OP_INNING:
+            self.inning, self.half = args
+        elif op == OP_EFFECT:
+            if args[0] != EFFECT_NONE:
+                self.effects.append(args[0])
+
+    def _clear(self):
+        self.bases = 0
+        self.balls = self.strikes = self.outs = 0
+        self.away = self.home = 0
+        self.inning = self.half = 0
+
+    def render(self):
+        """한 줄 상태: 3회말  원정 0 : 2 홈  B●●○ S●○ O○○  주자 [1][ ][3]  ✨ 안타"""
+        def lights(count, size):
+            return '●' * min(count, size) + '○' * max(0, size - count)
+
+        bases = ''.join(f"[{n}]" if self.bases & (1 << (n - 1)) else "[ ]" for n in (1, 2, 3))
+        inning = f"{self.inning}회{'말' if self.half else '초'}" if self.inning else "경기 전"
+        effect = f"  ✨ {EFFECT_NAMES.get(self.effects[-1], self.effects[-1])}" if self.effects else ""
+        return (f"{inning}  원정 {self.away} : {self.home} 홈  "
+                f"B{lights(self.balls, 3)} S{lights(self.strikes, 2)} O{lights(self.outs, 2)}  주자 {bases}{effect}")
+
+
+def open_pty():
+    """가상 시리얼 포트 -> (읽을 파일 번호, 서버가 열 포트 경로)"""
+    master, slave = os.openpty()
+    tty.setraw(slave)   # 0x0A 등을 바꾸지 않도록 raw 모드
+    return master, os.ttyname(slave)
+
+
+def run(master, board):
+    last = None
+    while True:
+        readable, _, _ = select.select([master], [], [], 1.0)
+        if not readable:
+            continue
+        try:
+            data = os.read(master, 1024)
+        except OSError:
+            return
+        if board.feed(data):
+            line = board.render()
+            if line != last:
+                print(f"💡 {line}  (프레임 {board.decoder.frames}, 오류 {board.decoder.errors})")
+                last = line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="아두이노 LED 전광판 에뮬레이터")
+    parser.parse_args()
+    master, port = open_pty()
+    print(f"🔌 가상 아두이노 포트: {port}")
+    print(f"👉 LED_FRAMED=1 ARDUINO_PORT={port} python server.py")
+    try:
+        run(master, EmulatedBoard())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
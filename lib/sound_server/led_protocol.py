@@ -0,0 +1,236 @@
+import re
+from dataclasses import dataclass, replace
+
+# ===================================================================
+# 서버 → 아두이노(LED 전광판) 시리얼 프레임 형식
+#   [0xA5] [길이 N] [명령 바이트 N개] [체크섬]
+#  - 체크섬: 길이 + 명령 바이트 전부를 XOR (틀리면 아두이노는 그 프레임을 버리고 다음 0xA5를 찾음)
+#  - 한 프레임에 명령 여러 개: [OP_COUNT, 2, 1, 0, OP_BASES, 0b011, OP_EFFECT, EFFECT_HIT]
+#  - 서버는 바뀐 값만 보냄 → 보통 3~8바이트, 9600bps에서 10ms 안쪽
+#  - 아두이노 쪽은 led_emulator.py의 EmulatedBoard와 같은 순서로 해석하면 됨
+# 지금 펌웨어(한 글자: S/B/H/R, RESET은 0)는 LedLink(framed=False, 기본값)로 보냅니다.
+# ===================================================================
+BAUDRATE = 9600
+FRAME_START = 0xA5
+MAX_PAYLOAD = 32
+
+OP_CLEAR = 0x00     # 모든 LED 끄기 (인자 없음)
+OP_BASES = 0x01     # 주자: 비트0 1루, 비트1 2루, 비트2 3루
+OP_COUNT = 0x02     # 볼, 스트라이크, 아웃
+OP_SCORE = 0x03     # 원정, 홈 점수
+OP_INNING = 0x04    # 회, 초(0)/말(1)
+OP_EFFECT = 0x05    # 효과 ID 한 번 재생 (깜빡임 등)
+OP_ARGS = {OP_CLEAR: 0, OP_BASES: 1, OP_COUNT: 3, OP_SCORE: 2, OP_INNING: 2, OP_EFFECT: 1}
+
+EFFECT_NONE = 0
+EFFECT_STRIKE = 1
+EFFECT_BALL = 2
+EFFECT_HIT = 3
+EFFECT_HOMERUN = 4
+EFFECT_OUT = 5
+EFFECT_SCORE = 6
+
+# scenario.json의 led 코드 → 효과 (BASE_*, RESET, NONE은 효과 없이 상태만 바꿈)
+LED_EFFECTS = {
+    'STRIKE_RED': EFFECT_STRIKE,
+    'BALL_YELLOW': EFFECT_BALL,
+    'HIT_GREEN': EFFECT_HIT,
+    'HIT': EFFECT_HIT,
+    'HOMERUN': EFFECT_HOMERUN,
+    'HR': EFFECT_HOMERUN,
+    'OUT': EFFECT_OUT,
+    'SCORE': EFFECT_SCORE,
+}
+# 한 글자 명령 펌웨어용 (없는 효과는 보내지 않음)
+LEGACY_BYTES = {EFFECT_STRIKE: b'S', EFFECT_BALL: b'B', EFFECT_HIT: b'H', EFFECT_HOMERUN: b'R'}
+LEGACY_RESET = b'0'     # RESET: LED 모두 끄기
+
+BASE_LED = re.compile(r'^BASE((?:_[123])+)$')
+INNING_TEXT = re.compile(r'(\d+)회\s*(초|말)')
+
+
+def checksum(data):
+    value = 0
+    for byte in data:
+        value ^= byte
+    return value
+
+
+def encode_frame(commands):
+    """[(op, 인자...), ...] -> 프레임 바이트"""
+    payload = bytearray()
+    for op, *args in commands:
+        if len(args) != OP_ARGS[op]:
+            raise ValueError(f"명령 {op:#04x}의 인자 수가 틀림: {args}")
+        payload.append(op)
+        payload.extend(max(0, min(255, int(a))) for a in args)
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"프레임이 너무 깁니다: {len(payload)}바이트")
+    body = bytes([len(payload)]) + bytes(payload)
+    return bytes([FRAME_START]) + body + bytes([checksum(body)])
+
+
+def parse_commands(payload):
+    """명령 바이트 -> [(op, 인자...), ...]"""
+    commands = []
+    i = 0
+    while i < len(payload):
+        op = payload[i]
+        count = OP_ARGS.get(op)
+        if count is None or i + 1 + count > len(payload):
+            raise ValueError(f"잘못된 명령: {payload[i:].hex()}")
+        commands.append((op, *payload[i + 1:i + 1 + count]))
+        i += 1 + count
+    return commands
+
+
+class FrameDecoder:
+    """시리얼로 들어오는 바이트를 프레임 단위로 잘라 명령 목록으로 (아두이노 / 에뮬레이터 쪽)"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frames = 0
+        self.errors = 0
+
+    def feed(self, data):
+        """받은 바이트 -> 완성된 프레임들의 명령 목록"""
+        self.buffer.extend(data)
+        decoded = []
+        while True:
+            start = self.buffer.find(FRAME_START)
+            if start < 0:
+                self.buffer.clear()
+                return decoded
+            del self.buffer[:start]
+            if len(self.buffer) < 2:
+                return decoded
+            length = self.buffer[1]
+            if length > MAX_PAYLOAD:
+                self._resync()
+                continue
+            if len(self.buffer) < length + 3:
+                return decoded
+            body = bytes(self.buffer[1:length + 2])
+            if checksum(body) != self.buffer[length + 2]:
+                self._resync()
+                continue
+            try:
+                commands = parse_commands(body[1:])
+            except ValueError:
+                self._resync()
+                continue
+            del self.buffer[:length + 3]
+            self.frames += 1
+            decoded.append(commands)
+
+    def _resync(self):
+        # 시작 바이트 하나만 버리고 그 뒤에서 다시 0xA5를 찾음
+        self.errors += 1
+        del self.buffer[:1]
+
+
+@dataclass(frozen=True, slots=True)
+class LedState:
+    """LED 전광판 전체 상태 (서버가 보낸 마지막 상태와 비교해서 바뀐 것만 보냄)"""
+    bases: int = 0
+    balls: int = 0
+    strikes: int = 0
+    outs: int = 0
+    away: int = 0
+    home: int = 0
+    inning: int = 0
+    half: int = 0
+    effect: int = EFFECT_NONE
+    effect_seq: int = 0     # 같은 효과가 연달아 나와도 다시 재생하도록 효과마다 1씩 증가
+    reset_seq: int = 0      # RESET마다 1씩 증가 (한 글자 명령 펌웨어에 0을 보내도록)
+
+
+def state_commands(old, new):
+    """old 상태(처음이면 None)에서 new 상태로 가는 명령 목록"""
+    commands = []
+    if old is None:
+        commands.append((OP_CLEAR,))
+        old = LedState()
+    if new.bases != old.bases:
+        commands.append((OP_BASES, new.bases))
+    if (new.balls, new.strikes, new.outs) != (old.balls, old.strikes, old.outs):
+        commands.append((OP_COUNT, new.balls, new.strikes, new.outs))
+    if (new.away, new.home) != (old.away, old.home):
+        commands.append((OP_SCORE, new.away, new.home))
+    if (new.inning, new.half) != (old.inning, old.half):
+        commands.append((OP_INNING, new.inning, new.half))
+    if new.effect_seq != old.effect_seq and new.effect != EFFECT_NONE:
+        commands.append((OP_EFFECT, new.effect))
+    return commands
+
+
+class LedBoard:
+    """시나리오/실시간 이벤트(led 코드 + data)를 받아 LED 전광판 상태를 만들어 감 (서버 쪽)"""
+
+    def __init__(self):
+        self.state = LedState()
+
+    def apply(self, led, data=None):
+        """이벤트 하나를 반영 -> 새 LedState (바뀐 것이 없으면 None)"""
+        data = data or {}
+        old = self.state
+        changes = {}
+        if led == 'RESET':
+            # 새 이닝 / 공수교대: 주자와 카운트를 지우고 data에 있는 값만 다시 씀
+            changes.update(bases=0, balls=0, strikes=0, outs=0, reset_seq=old.reset_seq + 1)
+        match = BASE_LED.match(led or '')
+        if match:
+            changes['bases'] = sum(1 << (int(n) - 1) for n in match.group(1).split('_')[1:])
+        effect = LED_EFFECTS.get(led)
+        if effect == EFFECT_HOMERUN:
+            changes['bases'] = 0
+
+        bases = changes.get('bases', old.bases)
+        for n in (1, 2, 3):
+            value = data.get(f'base{n}')
+            if value is not None:
+                bases = bases | (1 << (n - 1)) if value else bases & ~(1 << (n - 1))
+        changes['bases'] = bases
+        for key, field in (('b', 'balls'), ('s', 'strikes'), ('o', 'outs'),
+                           ('away_score', 'away'), ('home_score', 'home'),
+                           ('score_jp', 'away'), ('score_kor', 'home')):
+            if data.get(key) is not None:
+                changes[field] = data[key]
+        match = INNING_TEXT.search(str(data.get('inning') or ''))
+        if match:
+            changes.update(inning=int(match.group(1)), half=1 if match.group(2) == '말' else 0)
+        if effect is not None:
+            changes.update(effect=effect, effect_seq=old.effect_seq + 1)
+
+        new = replace(old, **changes)
+        if new == old:
+            return None
+        self.state = new
+        return new
+
+
+class LedLink:
+    """LedState를 시리얼로 내보냄 (출력 분배기의 serial 작업 스레드에서 호출)
+    대기열에서 합쳐진(coalesce) 상태 여러 개도 마지막 것과의 차이만 한 프레임으로 보냄"""
+
+    def __init__(self, write, framed=False):
+        self.write = write
+        self.framed = framed
+        self.sent = None    # 아두이노에 마지막으로 보낸 상태
+        self.frames = 0
+        self.bytes = 0
+
+    def send(self, state):
+        if self.framed:
+            commands = state_commands(self.sent, state)
+            data = encode_frame(commands) if commands else b''
+        else:
+            sent = self.sent or LedState()
+            data = LEGACY_RESET if state.reset_seq != sent.reset_seq else b''
+            if self.sent is None or state.effect_seq != sent.effect_seq:
+                data += LEGACY_BYTES.get(state.effect, b'')
+        self.sent = state
+        if data:
+            self.write(data)
+            self.frames += 1
+            self.bytes += len(data)
@@ -1,8 +1,16 @@
+import argparse
 import pygame
 import time
 import os
-import math
-import struct
+
+from clip_cache import ClipCache, list_clips
+from scenario_compiler import FileWatcher, load_timeline
+from tone_synth import startup_chime, to_sound
+from channel_manager import GROUP_CALLOUT, ChannelManager
+from metrics import REGISTRY, setup as setup_metrics
+from sound_daemon import SoundDaemon
+from sound_protocol import DEFAULT_PORT, SERVER_SYNC_PORT
+from timeline_scheduler import FakeMixer, PygameMusicBackend, TimelineScheduler, clip_path
 
 # ==========================================
 # ⚙️ 설정값
@@ -11,171 +19,140 @@ os.environ["SDL_VIDEODRIVER"] = "dummy"
 VIDEO_DURATION = 3382.91  # 영상 총 길이 (초)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MP3_DIR = os.path.join(BASE_DIR, "mp3")
+SOUND_DIR = os.path.join(BASE_DIR, "sound")     # 선수 이름 MP3
+CLIP_DIRS = {GROUP_CALLOUT: SOUND_DIR}          # @callout 이벤트는 sound/ 에서 찾음
 TIMELINE_FILE = os.path.join(BASE_DIR, "rasptimeline.txt")
+CLIP_CACHE_MB = 64  # 미리 디코딩해 둘 소리의 메모리 한도
 
 # ==========================================
-# 🎵 부팅음 생성 함수
+# 🎵 부팅음 재생
 # ==========================================
-def make_tone(freq, duration):
-    sample_rate = 44100
-    n_samples = int(sample_rate * duration)
-    buffer = bytearray()
-    for i in range(n_samples):
-        val = int(32767.0 * math.sin(2.0 * math.pi * freq * i / sample_rate))
-        buffer += struct.pack('h', val)
-    return pygame.mixer.Sound(buffer=buffer)
-
 def play_startup_sound():
+    # 세 음을 하나의 버퍼로 미리 만들어 두고(디스크 캐시) 한 번에 재생
+    # 기다리지 않고 바로 돌아오므로, 부팅음이 나는 동안 클립 디코딩을 진행
     print("📢 부팅음 재생: 도 -> 레 -> 미")
-    tones = [261.63, 293.66, 329.63]
-    for freq in tones:
-        sound = make_tone(freq, 0.5)
-        sound.play()
-        time.sleep(0.6)
+    sound = to_sound(startup_chime(sample_rate=pygame.mixer.get_init()[0]))
+    sound.play()
 
 # ==========================================
 # 📝 텍스트 파싱 (새로운 포맷 대응)
+#   시간|파일명|옵션...   옵션: x2 (반복), 12s (제한 시간), @crowd (채널 그룹)
+#   예) 120|홈런함성|8s|@crowd   121|박해민|@callout   300|STOP|@bgm
 # ==========================================
 def parse_timeline(filepath):
-    events = []
-    
+    # 검사(없는 파일, 순서, 제한 시간 겹침)는 scenario_compiler.py가 한 번만 하고 결과를 캐시
     if not os.path.exists(filepath):
         print(f"❌ 오류: {filepath} 파일이 없습니다.")
         return []
 
     print(f"📂 타임라인 파일 로드 중...")
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    for line in lines:
-        line = line.strip()
-        # 주석(#)이나 빈 줄 건너뛰기
-        if not line or line.startswith("#"): 
-            continue
-
-        # '|' 기준으로 나누기
-        parts = line.split('|')
-        if len(parts) < 2:
-            continue
-
-        # 1. 시간 파싱
-        try:
-            start_time = int(parts[0].strip())
-        except ValueError:
-            continue # 숫자가 아니면 패스
-
-        # 2. 파일명/명령 파싱
-        name_cmd = parts[1].strip()
-        
-        # STOP 명령인 경우
-        if name_cmd.upper() == "STOP":
-            events.append({'time': start_time, 'type': 'stop', 'raw': line})
-            continue
-
-        # 3. 옵션 파싱 (x2, 10s 등)
-        loops = 0      # 기본 1회 재생 (pygame loops=0)
-        limit = None   # 재생 시간 제한 없음
-        
-        if len(parts) > 2:
-            opt = parts[2].strip().lower()
-            if opt.startswith('x'):       # 예: x2
-                try:
-                    loops = int(opt.replace('x', '')) - 1
-                except:
-                    loops = 0
-            elif opt.endswith('s'):       # 예: 12s
-                try:
-                    limit = int(opt.replace('s', ''))
-                except:
-                    limit = None
-
-        events.append({
-            'time': start_time,
-            'type': 'play',
-            'file': f"{name_cmd}.mp3",
-            'loops': loops,
-            'limit': limit,
-            'raw': line
-        })
-    
-    # 시간 순서대로 정렬
-    events.sort(key=lambda x: x['time'])
-    return events
+    return load_timeline(filepath, MP3_DIR, CLIP_DIRS)
 
 # ==========================================
 # 🚀 메인 실행 로직
 # ==========================================
-def main():
+def preload_clips(timeline):
+    """타임라인에 나오는 클립(앞쪽부터)과 선수 이름 MP3를 미리 디코딩 (타임라인이 없으면 mp3 폴더 전체)"""
+    cache = ClipCache(budget=CLIP_CACHE_MB * 1024 * 1024)
+    paths = []
+    for event in timeline or []:
+        if event['type'] == 'play':
+            path = clip_path(event, MP3_DIR, CLIP_DIRS)
+            if path not in paths:
+                paths.append(path)
+    if timeline is None:
+        paths += list_clips(MP3_DIR)
+    paths += list_clips(SOUND_DIR)
+
+    started = time.perf_counter()
+    # 한도를 넘으면 먼저 넣은 것부터 밀려나므로, 곧 쓸 클립이 마지막에 오도록 역순으로
+    cache.preload(reversed(paths))
+    stats = cache.stats()
+    print(f"🗂️ 클립 {stats['clips']}개 디코딩 완료 ({stats['used_mb']:.1f}MB, {time.perf_counter() - started:.1f}초)")
+    return cache
+
+def create_backend(timeline, fake_mixer=False, stream=False):
+    if fake_mixer:
+        # 스피커 없는 PC에서 타이밍만 확인
+        return FakeMixer()
+
     # 버퍼 사이즈를 줄여 딜레이 최소화
     pygame.mixer.pre_init(44100, -16, 1, 2048)
     pygame.init()
     pygame.mixer.init()
 
     play_startup_sound()
+    if stream:
+        return PygameMusicBackend()
+    # BGM / 함성 / 선수 콜을 각자 채널에서 겹쳐 재생
+    return ChannelManager(preload_clips(timeline))
+
+def listen(backend, port=DEFAULT_PORT, tcp_port=None, server=None):
+    """서버(server.py)가 보내는 명령을 받아 재생 (영상 위치는 서버가 앎)"""
+    server_addr = (server, SERVER_SYNC_PORT) if server else None
+    daemon = SoundDaemon(backend, MP3_DIR, CLIP_DIRS, port=port, tcp_port=tcp_port, server_addr=server_addr)
+    print("🎧 서버 명령 대기 모드")
+    try:
+        daemon.run()
+    finally:
+        print(f"📊 {daemon.stats()}")
+
+def reload_timeline(scheduler, path):
+    timeline = parse_timeline(path)
+    if timeline:
+        scheduler.reload(timeline)
+
+def main(fake_mixer=False, speed=1.0, stream=False, listen_port=None, tcp_port=None, server=None,
+         metrics_port=None, json_log=None):
+    # 지표(/metrics)와 JSON 로그: 서버 명령 모드는 SoundDaemon, 타임라인 모드는 TimelineScheduler가 기록
+    setup_metrics(metrics_port, json_log)
+    if listen_port:
+        listen(create_backend(None, fake_mixer, stream), listen_port, tcp_port, server)
+        return
 
     timeline = parse_timeline(TIMELINE_FILE)
     if not timeline:
         print("❌ 타임라인 데이터가 없습니다.")
         return
 
+    backend = create_backend(timeline, fake_mixer, stream)
     print(f"✅ 총 {len(timeline)}개의 이벤트 로드 완료.")
     print(f"🔄 영상 싱크 시작 (총 길이: {VIDEO_DURATION}초)")
 
+    # 0.05초마다 확인하지 않고, 다음 이벤트/제한 시간까지 정확히 잠듦
+    scheduler = TimelineScheduler(timeline, backend, MP3_DIR, VIDEO_DURATION, speed=speed, clip_dirs=CLIP_DIRS)
+    REGISTRY.histogram('pi_timeline_drift_ms', "타임라인 이벤트를 예정 시각보다 늦게 실행한 정도 (ms)",
+                       histogram=scheduler.drift.histogram)
+    # rasptimeline.txt를 고치면 서비스 재시작 없이 바로 반영 (잘못 고친 파일은 무시하고 기존 것 유지)
+    watcher = FileWatcher(TIMELINE_FILE, lambda path: reload_timeline(scheduler, path))
+    watcher.start()
+
     while True:
-        cycle_start_time = time.time()
-        event_idx = 0
-        current_limit_time = None
-        
         print("🎬 --- New Cycle Start ---")
+        finished = scheduler.run_cycle()
 
-        while True:
-            elapsed = time.time() - cycle_start_time
-            
-            if elapsed >= VIDEO_DURATION:
-                pygame.mixer.music.stop()
-                break
-
-            # 재생 시간 제한 체크 (예: 12초만 재생)
-            if current_limit_time and elapsed >= current_limit_time:
-                if pygame.mixer.music.get_busy():
-                    pygame.mixer.music.fadeout(500)
-                    print(f"   [Time: {elapsed:.1f}s] 지정 시간 종료 (Fadeout)")
-                current_limit_time = None
-
-            # 타임라인 이벤트 체크
-            if event_idx < len(timeline):
-                event = timeline[event_idx]
-                
-                if elapsed >= event['time']:
-                    print(f"⏰ [{elapsed:.1f}초] {event['raw']}")
-                    
-                    if event['type'] == 'stop':
-                        pygame.mixer.music.stop()
-                        current_limit_time = None
-                    
-                    elif event['type'] == 'play':
-                        file_path = os.path.join(MP3_DIR, event['file'])
-                        if os.path.exists(file_path):
-                            try:
-                                pygame.mixer.music.load(file_path)
-                                pygame.mixer.music.play(loops=event['loops'])
-                                
-                                if event['limit']:
-                                    current_limit_time = elapsed + event['limit']
-                                else:
-                                    current_limit_time = None
-                            except Exception as e:
-                                print(f"❌ 재생 에러: {e}")
-                        else:
-                            print(f"❌ 파일 없음: {file_path}")
-                    
-                    event_idx += 1
-
-            time.sleep(0.05) # 반응 속도를 위해 0.05초로 단축
+        drift = scheduler.drift.summary()
+        if drift['count']:
+            print(f"📊 지연: 평균 {drift['mean_ms']:.2f}ms / p95 {drift['p95_ms']:.2f}ms / 최대 {drift['max_ms']:.2f}ms ({drift['count']}건)")
+        if not finished:
+            break
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="라즈베리파이 타임라인 사운드 재생기")
+    parser.add_argument("--fake-mixer", action="store_true", help="소리 없이 타이밍만 확인 (PC 테스트용)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (테스트용, 기본 1)")
+    parser.add_argument("--stream", action="store_true", help="미리 디코딩하지 않고 mixer.music으로 재생 (메모리 절약)")
+    parser.add_argument("--listen", nargs="?", type=int, const=DEFAULT_PORT, metavar="PORT",
+                        help=f"타임라인 대신 서버 명령(UDP)을 받아 재생 (기본 포트 {DEFAULT_PORT})")
+    parser.add_argument("--tcp", type=int, metavar="PORT", help="--listen 때 TCP 연결도 받음")
+    parser.add_argument("--server", metavar="IP", help="--listen 때 시계를 맞출 서버 IP (없으면 첫 명령을 보낸 주소)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="지표를 http://라즈베리파이:PORT/metrics 로 내보냄")
+    parser.add_argument("--json-log", metavar="PATH", help="재생할 때마다 지연을 JSON 한 줄씩 기록 ('-'면 stderr)")
+    args = parser.parse_args()
+
     try:
-        main()
+        main(fake_mixer=args.fake_mixer, speed=args.speed, stream=args.stream,
+             listen_port=args.listen, tcp_port=args.tcp, server=args.server,
+             metrics_port=args.metrics_port, json_log=args.json_log)
     except KeyboardInterrupt:
         pygame.quit()
\ No newline at end of file
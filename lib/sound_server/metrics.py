@@ -0,0 +1,209 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from clock_sync import CLOCK_HISTOGRAMS, LATENCY_BUCKETS_MS, Histogram
+
+# ===================================================================
+# 지표(metrics) 모음 + Prometheus 텍스트 형식 출력 + JSON 로그
+#  - 크롤러 / 서버 / 라즈베리파이가 같은 REGISTRY에 카운터와 히스토그램(clock_sync.Histogram)을 등록
+#  - 서버: http://서버:5000/metrics   크롤러/라즈베리파이: --metrics-port 9100 → http://기기:9100/metrics
+#  - JSON 로그 (--json-log 파일, '-'면 stderr): 한 줄에 {"ts": ..., "event": ..., ...}
+#    → 라이브 경기 중 신호 지연이 어디서 생기는지 (요청/파싱/대기열/전송/재생) 나중에 맞춰 볼 수 있음
+# ===================================================================
+FAST_BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 500)   # 파싱 / 전송처럼 보통 1ms 안쪽인 것
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)                      # 폴링 한 번의 새 플레이 수 등
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    """늘어나기만 하는 수"""
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class Callback:
+    """읽을 때마다 fn()을 불러 값을 얻음 (이미 세고 있는 수를 그대로 내보낼 때)"""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    @property
+    def value(self):
+        try:
+            return self.fn()
+        except Exception:
+            return None
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{escape_label(v)}"' for k, v in items) + '}'
+
+
+def format_value(value):
+    if value is None:
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """이름(+라벨)별 지표. 같은 이름/라벨로 다시 부르면 이미 만든 것을 돌려줌"""
+
+    def __init__(self):
+        self.families = {}      # 이름 -> (종류, 설명, {라벨 튜플: 지표})
+        self.lock = threading.Lock()
+
+    def _get(self, kind, name, help_text, labels, make, replace=False):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = (kind, help_text, {})
+            elif family[0] != kind:
+                raise ValueError(f"지표 {name}는 이미 {family[0]}(으)로 등록됨")
+            metric = family[2].get(key)
+            if metric is None or replace:
+                metric = family[2][key] = make()
+            return metric
+
+    def counter(self, name, help_text, **labels):
+        return self._get('counter', name, help_text, labels, Counter)
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS_MS, histogram=None, **labels):
+        """(ms) 히스토그램. histogram을 주면 이미 쓰고 있는 Histogram을 그 자리에 등록 (장치를 바꿔 끼운 경우 등)"""
+        return self._get('histogram', name, help_text, labels, lambda: histogram or Histogram(buckets),
+                         replace=histogram is not None)
+
+    def callback(self, name, help_text, fn, kind='gauge', **labels):
+        """fn()의 값을 그대로 내보냄 (kind: 'gauge' 또는 늘어나기만 하는 'counter')"""
+        return self._get(kind, name, help_text, labels, lambda: Callback(fn), replace=True)
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self.lock:
+            families = [(name, kind, help_text, list(metrics.items()))
+                        for name, (kind, help_text, metrics) in sorted(self.families.items())]
+        for name, kind, help_text, metrics in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in metrics:
+                if kind != 'histogram':
+                    lines.append(f"{name}{format_labels(labels)} {format_value(metric.value)}")
+                else:
+                    with metric.lock:
+                        counts, count, total = list(metric.counts), metric.count, metric.total
+                    cumulative = 0
+                    for bound, n in zip(metric.buckets, counts):
+                        cumulative += n
+                        lines.append(f"{name}_bucket{format_labels(labels, ('le', bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{format_labels(labels, ('le', '+Inf'))} {count}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {format_value(float(total))}")
+                    lines.append(f"{name}_count{format_labels(labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class Timer:
+    """with Timer(히스토그램) as t: 블록 실행 시간(ms)을 기록하고 t.ms로도 읽음 (예외로 빠져나가면 기록하지 않음)"""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.ms = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.started) * 1000
+        if exc[0] is None:
+            self.histogram.observe(self.ms)
+        return False
+
+
+class JsonLog:
+    """구조화 로그 (꺼져 있으면 아무것도 하지 않음). LOG('이벤트', 키=값, ...)"""
+
+    def __init__(self):
+        self.stream = None
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.stream is not None
+
+    def open(self, path):
+        """path: 파일 경로 (이어 씀) 또는 '-' (stderr)"""
+        self.stream = sys.stderr if path == '-' else open(path, 'a', encoding='utf-8', buffering=1)
+
+    def __call__(self, event, **fields):
+        if self.stream is None:
+            return
+        line = json.dumps(dict(ts=round(time.time(), 6), event=event, **fields),
+                          ensure_ascii=False, separators=(',', ':'), default=str)
+        with self.lock:
+            self.stream.write(line + '\n')
+
+
+LOG = JsonLog()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass    # 수집기가 몇 초마다 긁어가므로 요청 로그는 찍지 않음
+
+
+def serve(port, host='0.0.0.0'):
+    """/metrics만 있는 작은 HTTP 서버를 스레드로 띄움 (Flask/aiohttp 서버가 없는 크롤러/라즈베리파이용)"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    print(f"📈 지표: http://{host}:{port}/metrics")
+    return server
+
+
+def register_clock(clock, prefix='server_'):
+    """ClockService가 모으던 지연 히스토그램을 그대로 내보냄"""
+    for name, histogram in clock.histograms.items():
+        REGISTRY.histogram(prefix + name, CLOCK_HISTOGRAMS[name], histogram=histogram)
+
+
+def setup(metrics_port=None, json_log=None):
+    """명령줄 옵션(--metrics-port, --json-log) 처리"""
+    if json_log:
+        LOG.open(json_log)
+    if metrics_port:
+        return serve(metrics_port)
+    return None
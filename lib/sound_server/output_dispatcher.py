@@ -0,0 +1,161 @@
+import collections
+import threading
+import time
+
+from clock_sync import Histogram
+from metrics import FAST_BUCKETS_MS, REGISTRY
+
+# ===================================================================
+# 출력 분배기: 전광판(UI) / 라즈베리파이(UDP) / 아두이노(Serial) 로 보내는 일을
+# 소켓 이벤트 핸들러에서 떼어내 장치별 작업 스레드가 처리하게 합니다.
+#  - 장치마다 크기가 정해진 대기열 → 느린 장치가 다른 장치를 막지 않음
+#  - 대기열이 꽉 차면 정책에 따라 버림 / 같은 종류 명령은 최신 것 하나로 합침(coalesce)
+#  - 장치별 전송 지연(대기열에 들어간 뒤 실제로 보낸 시간까지) 통계 + /metrics 히스토그램 (metrics.py)
+#  - at(서버 시계 epoch 초)을 주면 그 시각까지 기다렸다가 보냄 (미리 받은 LED 신호 등)
+# ===================================================================
+POLICY_DROP_OLDEST = 'drop_oldest'   # 꽉 차면 가장 오래된 것을 버림
+POLICY_DROP_NEWEST = 'drop_newest'   # 꽉 차면 새로 들어온 것을 버림
+POLICY_COALESCE = 'coalesce'         # 보낼 시각이 된 같은 키의 명령이 밀려 있으면 최신 것 하나만 남김
+                                     # (at이 아직 안 된 예약 명령은 합치지 않고 그대로 보냄)
+
+LATENCY_WINDOW = 1000   # 지연 통계에 쓰는 최근 전송 수
+
+
+class OutputSink:
+    """장치 하나의 대기열과 작업 스레드"""
+
+    def __init__(self, name, send, maxsize=64, policy=POLICY_DROP_OLDEST):
+        self.name = name
+        self.send = send
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queue = collections.deque()
+        self.cond = threading.Condition()
+        self.closed = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.queue_ms = Histogram()                 # 대기열 → 전송 (예약 전송이면 예정 시각 → 전송)
+        self.send_ms = Histogram(FAST_BUCKETS_MS)   # send() 한 번 (UDP sendto / 시리얼 write)
+
+        self.worker = threading.Thread(target=self._run, name=f"output-{name}", daemon=True)
+        self.worker.start()
+
+    def submit(self, payload, key=None, at=None):
+        """보낼 데이터를 대기열에 넣습니다. (바로 돌아옴)"""
+        item = (time.perf_counter(), key, payload, at)
+        with self.cond:
+            if self.policy == POLICY_COALESCE and self.queue:
+                now = time.time()
+                if at is None or at <= now:
+                    # 이미 보냈어야 할 명령만 새 명령으로 대체 (미래 시각에 예약된 LED 상태는 남김)
+                    before = len(self.queue)
+                    self.queue = collections.deque(
+                        i for i in self.queue if i[1] != key or (i[3] is not None and i[3] > now))
+                    self.coalesced += before - len(self.queue)
+            if len(self.queue) >= self.maxsize:
+                if self.policy == POLICY_DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(item)
+            self.cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queue and not self.closed:
+                    self.cond.wait()
+                if self.closed and not self.queue:
+                    return
+                at = self.queue[0][3]
+                if at is not None and not self.closed:
+                    wait = at - time.time()
+                    if wait > 0:
+                        # 기다리는 동안 더 새로운 명령으로 합쳐질 수 있으므로 다시 확인
+                        self.cond.wait(wait)
+                        continue
+                enqueued, key, payload, at = self.queue.popleft()
+
+            try:
+                started = time.perf_counter()
+                self.send(payload)
+                done = time.perf_counter()
+                self.send_ms.observe((done - started) * 1000)
+                self.sent += 1
+                # 예약 전송이면 예정 시각 대비 지연, 아니면 대기열에 들어온 뒤부터
+                latency = done - enqueued if at is None else max(0.0, time.time() - at)
+                self.latencies.append(latency)
+                self.queue_ms.observe(latency * 1000)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ [{self.name}] 전송 실패: {e}")
+
+    def close(self, timeout=1.0):
+        """남은 데이터를 보낸 뒤 작업 스레드를 멈춥니다."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.worker.join(timeout)
+
+    def stats(self):
+        """전송 수, 버린 수, 지연(ms) 통계"""
+        latencies = sorted(self.latencies)
+
+        def pick(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        return {
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'pending': len(self.queue),
+            'latency_ms': {'p50': pick(50), 'p95': pick(95), 'p99': pick(99), 'max': pick(100)},
+        }
+
+
+class OutputDispatcher:
+    """이름으로 장치(sink)를 등록하고 데이터를 나눠 보냅니다."""
+
+    def __init__(self):
+        self.sinks = {}
+
+    def add_sink(self, name, send, maxsize=64, policy=POLICY_DROP_OLDEST):
+        sink = OutputSink(name, send, maxsize, policy)
+        self.sinks[name] = sink
+        self.register_metrics(name, sink)
+        return sink
+
+    def register_metrics(self, name, sink):
+        """장치 하나의 지표를 /metrics에 등록 (async_server.py처럼 장치를 바꿔 끼우면 다시 부름)"""
+        for field, help_text in (('sent', "보낸 수"), ('dropped', "대기열이 꽉 차서 버린 수"),
+                                 ('coalesced', "최신 것 하나로 합쳐진 수"), ('errors', "전송 실패 수")):
+            REGISTRY.callback(f'output_{field}_total', f"장치별 {help_text}",
+                              lambda field=field: getattr(self.sinks.get(name), field, 0), kind='counter', sink=name)
+        REGISTRY.histogram('output_queue_ms', "대기열에 들어간 뒤(예약 전송은 예정 시각부터) 보낼 때까지 (ms)",
+                           histogram=sink.queue_ms, sink=name)
+        if hasattr(sink, 'send_ms'):
+            REGISTRY.histogram('output_send_ms', "장치로 한 번 보내는 데 걸린 시간 (ms)",
+                               FAST_BUCKETS_MS, histogram=sink.send_ms, sink=name)
+
+    def submit(self, name, payload, key=None, at=None):
+        """등록되지 않은 장치(예: 아두이노 미연결)면 조용히 무시"""
+        sink = self.sinks.get(name)
+        if sink is None:
+            return False
+        return sink.submit(payload, key, at)
+
+    def stats(self):
+        return {name: sink.stats() for name, sink in self.sinks.items()}
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
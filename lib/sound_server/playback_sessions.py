@@ -0,0 +1,76 @@
+import threading
+
+from scenario_timeline import PlaybackCursor
+
+# ===================================================================
+# 접속한 브라우저(소켓 세션)별 재생 커서
+#  - 처음 접속하면 자기 sid 이름의 방에 혼자 있음 → 다른 화면과 따로 재생 (diverge)
+#  - 같은 방(join_room)에 들어간 화면들은 커서 하나를 같이 씀 → 한 번만 실행 (share)
+#  - 잠금은 방마다 따로 있어서, 서로 다른 방의 time_update는 서로 기다리지 않음
+# ===================================================================
+
+
+class Room:
+    """방 하나의 재생 커서와 구성원"""
+
+    def __init__(self, name, timeline):
+        self.name = name
+        self.cursor = PlaybackCursor(timeline)
+        self.lock = threading.Lock()
+        self.members = set()
+        self.playback = None    # push 모드: 브라우저가 알려준 재생 기준점 (cue_scheduler.PlaybackState)
+
+
+class SessionRegistry:
+    """sid -> 방, 방 이름 -> Room"""
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.rooms = {}
+        self.session_rooms = {}
+        self._lock = threading.Lock()   # 입장/퇴장 때만 사용 (time_update 경로에서는 안 씀)
+
+    def set_timeline(self, timeline):
+        """시나리오 교체 (hot reload). 이미 있는 방들은 지금 재생 위치에서 이어감"""
+        with self._lock:
+            self.timeline = timeline
+            for room in self.rooms.values():
+                with room.lock:
+                    room.cursor.retarget(timeline)
+
+    def connect(self, sid):
+        """새 세션은 자기 sid 이름의 방에 혼자 들어감"""
+        self.join(sid, sid)
+
+    def join(self, sid, room_name):
+        """room_name 방으로 옮깁니다. 방이 없으면 새 커서로 만듭니다."""
+        with self._lock:
+            self._leave_locked(sid)
+            room = self.rooms.get(room_name)
+            if room is None:
+                room = self.rooms[room_name] = Room(room_name, self.timeline)
+            room.members.add(sid)
+            self.session_rooms[sid] = room
+            return room
+
+    def leave(self, sid):
+        """공유 방에서 나와 다시 자기 방으로 돌아갑니다."""
+        return self.join(sid, sid)
+
+    def disconnect(self, sid):
+        with self._lock:
+            self._leave_locked(sid)
+
+    def _leave_locked(self, sid):
+        room = self.session_rooms.pop(sid, None)
+        if room is not None:
+            room.members.discard(sid)
+            if not room.members:
+                del self.rooms[room.name]
+
+    def room_of(self, sid):
+        """세션이 속한 방 (connect 이벤트 전에 온 요청이면 새로 만듦)"""
+        room = self.session_rooms.get(sid)
+        if room is None:
+            room = self.join(sid, sid)
+        return room
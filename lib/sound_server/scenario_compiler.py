@@ -0,0 +1,381 @@
+import argparse
+import json
+import os
+import pickle
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+from channel_manager import CHANNEL_GROUPS
+from led_protocol import BASE_LED, LED_EFFECTS
+from timeline_scheduler import clip_path
+
+# ===================================================================
+# 시나리오(scenario.json) / 타임라인(rasptimeline.txt) 컴파일러
+#  - 한 번만 읽고 검사: 없는 소리 파일, 모르는 LED 코드, 시간 순서, 제한 시간 겹침
+#  - 검사가 끝난 결과를 .scenario_cache/ 에 pickle로 저장 → 다음부터는 파싱/검사 없이 바로 읽음
+#    (원본 파일과 소리 폴더가 바뀌면 자동으로 다시 컴파일)
+#  - 시나리오는 시간 배열(array) + 이벤트별 bytes로 저장 → 이벤트가 많아도 읽는 시간이 거의 같음
+#    (이벤트 내용은 재생 위치가 그 근처에 왔을 때 풀어서 씀)
+#  - FileWatcher: 파일이 바뀌면 서비스를 재시작하지 않고 다시 불러오기
+#   python scenario_compiler.py scenario.json rasptimeline.txt   (검사만 + 컴파일 결과 저장)
+# ===================================================================
+COMPILED_VERSION = 3
+CACHE_DIR_NAME = ".scenario_cache"
+WATCH_INTERVAL = 1.0    # 파일 변경 확인 주기 (초)
+
+# scenario.json의 led 값: LED로 보낼 수 있는 효과 + NONE(LED 변화 없음), RESET
+KNOWN_LEDS = frozenset(LED_EFFECTS) | {'NONE', 'RESET'}
+# 주자 상태(BASE_1, BASE_1_3 ...)는 led_protocol.BASE_LED로 확인 (LedBoard가 해석하는 것과 같은 패턴)
+REPORT_LIMIT = 10   # 한 파일에서 출력할 문제 수 (나머지는 개수만)
+# rasptimeline.txt의 @그룹, scenario.json의 group (스피커가 가진 채널 그룹)
+KNOWN_CHANNELS = frozenset(CHANNEL_GROUPS)
+
+ERROR = 'error'       # 그 항목은 버림
+WARNING = 'warning'   # 그대로 사용하지만 확인 필요
+
+
+@dataclass(slots=True)
+class Problem:
+    """검사에서 찾은 문제 한 개"""
+    level: str
+    where: str      # 예: "12번째 줄", "3번째 이벤트 (87초)"
+    message: str
+
+    def __str__(self):
+        icon = "❌" if self.level == ERROR else "⚠️"
+        return f"{icon} {self.where}: {self.message}"
+
+
+# ------------------------------------------------------------
+# scenario.json
+# ------------------------------------------------------------
+def _sound_exists(name, sound_dirs):
+    return any(os.path.exists(os.path.join(d, name)) for d in sound_dirs)
+
+
+def check_scenario(items, sound_dirs=()):
+    """scenario.json 항목 목록 검사 -> (쓸 수 있는 항목 목록(시간 순), 문제 목록)"""
+    problems = []
+    valid = []
+    # 소리 폴더가 하나도 없는 PC(서버만 실행)에서는 파일 검사를 생략
+    sound_dirs = [d for d in sound_dirs if os.path.isdir(d)]
+    if not isinstance(items, list):
+        return [], [Problem(ERROR, "파일", "최상위가 이벤트 목록(list)이 아닙니다.")]
+
+    last_time = None
+    for i, item in enumerate(items, 1):
+        where = f"{i}번째 이벤트"
+        if not isinstance(item, dict):
+            problems.append(Problem(ERROR, where, "객체(dict)가 아닙니다."))
+            continue
+        t = item.get('time')
+        if isinstance(t, bool) or not isinstance(t, (int, float)) or t < 0:
+            problems.append(Problem(ERROR, where, f"time 값이 올바르지 않습니다: {t!r}"))
+            continue
+        where = f"{i}번째 이벤트 ({t}초)"
+        if last_time is not None and t < last_time:
+            problems.append(Problem(WARNING, where, f"시간 순서가 아닙니다 (앞 이벤트 {last_time}초, 정렬해서 사용)"))
+        last_time = t if last_time is None else max(last_time, t)
+
+        led = item.get('led')
+        if led is not None and led not in KNOWN_LEDS and not BASE_LED.match(led):
+            problems.append(Problem(WARNING, where, f"모르는 LED 코드: {led}"))
+        group = item.get('group')
+        if group is not None and group not in KNOWN_CHANNELS:
+            problems.append(Problem(WARNING, where, f"모르는 채널 그룹: {group}"))
+        sound = item.get('sound')
+        if sound and sound_dirs and not _sound_exists(sound, sound_dirs):
+            problems.append(Problem(WARNING, where, f"소리 파일이 없습니다: {sound}"))
+        valid.append(item)
+
+    valid.sort(key=lambda item: item['time'])
+    return valid, problems
+
+
+class PackedScenario:
+    """시간 순 시나리오 항목: 시간은 array('d'), 항목은 하나씩 pickle한 bytes (로드 때 dict로 풀지 않음)"""
+
+    def __init__(self, items):
+        self.times = array('d', (item['time'] for item in items))
+        self.blobs = [pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL) for item in items]
+
+    def __len__(self):
+        return len(self.blobs)
+
+    def item(self, index):
+        return pickle.loads(self.blobs[index])
+
+
+def compile_scenario(path, sound_dirs=()):
+    """scenario.json 읽기 + 검사"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+    except ValueError as e:
+        return [], [Problem(ERROR, os.path.basename(path), f"JSON 형식 오류: {e}")]
+    return check_scenario(items, sound_dirs)
+
+
+# ------------------------------------------------------------
+# rasptimeline.txt
+#   시간|파일명|옵션...   옵션: x2 (반복), 12s (제한 시간), @crowd (채널 그룹)
+# ------------------------------------------------------------
+def _parse_time(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_timeline_lines(lines):
+    """타임라인 텍스트 줄 목록 -> (이벤트 목록(시간 순), 문제 목록)"""
+    events = []
+    problems = []
+    last_time = None
+
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        # 주석(#)이나 빈 줄 건너뛰기
+        if not line or line.startswith("#"):
+            continue
+        where = f"{lineno}번째 줄"
+
+        parts = line.split('|')
+        if len(parts) < 2:
+            problems.append(Problem(ERROR, where, f"'시간|파일명' 형식이 아닙니다: {line}"))
+            continue
+        try:
+            start_time = _parse_time(parts[0].strip())
+        except ValueError:
+            problems.append(Problem(ERROR, where, f"시간이 숫자가 아닙니다: {parts[0].strip()}"))
+            continue
+        if last_time is not None and start_time < last_time:
+            problems.append(Problem(WARNING, where, f"시간 순서가 아닙니다 (앞 줄 {last_time}초, 정렬해서 사용)"))
+        last_time = start_time if last_time is None else max(last_time, start_time)
+
+        name_cmd = parts[1].strip()
+        loops = 0      # 기본 1회 재생 (pygame loops=0)
+        limit = None   # 재생 시간 제한 없음
+        channel = None # 채널 그룹 (없으면 BGM)
+
+        for opt in parts[2:]:
+            opt = opt.strip().lower()
+            if not opt:
+                continue
+            try:
+                if opt.startswith('@'):       # 예: @callout
+                    channel = opt[1:]
+                    if channel not in KNOWN_CHANNELS:
+                        problems.append(Problem(WARNING, where, f"모르는 채널 그룹: @{channel} (BGM으로 재생)"))
+                elif opt.startswith('x'):     # 예: x2
+                    loops = int(opt[1:]) - 1
+                elif opt.endswith('s'):       # 예: 12s
+                    limit = _parse_time(opt[:-1])
+                else:
+                    problems.append(Problem(WARNING, where, f"모르는 옵션: {opt}"))
+            except ValueError:
+                problems.append(Problem(WARNING, where, f"옵션 숫자 오류: {opt} (무시)"))
+
+        # STOP 명령인 경우 (그룹을 지정하면 그 그룹만 정지)
+        if name_cmd.upper() == "STOP":
+            events.append({'time': start_time, 'type': 'stop', 'channel': channel, 'raw': line, 'line': lineno})
+            continue
+
+        events.append({
+            'time': start_time,
+            'type': 'play',
+            'file': f"{name_cmd}.mp3",
+            'loops': loops,
+            'limit': limit,
+            'channel': channel,
+            'raw': line,
+            'line': lineno,
+        })
+
+    events.sort(key=lambda x: x['time'])
+    return events, problems
+
+
+def check_timeline(events, mp3_dir, clip_dirs=None):
+    """없는 파일 / 제한 시간이 같은 그룹의 다음 재생과 겹치는 줄 검사 -> 문제 목록"""
+    problems = []
+    check_files = os.path.isdir(mp3_dir)
+    next_play = {}  # 그룹 -> 이후 가장 가까운 재생 시각 (뒤에서부터 훑음)
+    for event in reversed(events):
+        if event['type'] != 'play':
+            continue
+        where = f"{event['line']}번째 줄"
+        if check_files and not os.path.exists(clip_path(event, mp3_dir, clip_dirs)):
+            problems.append(Problem(WARNING, where, f"소리 파일이 없습니다: {event['file']}"))
+
+        group = event['channel'] or 'bgm'
+        following = next_play.get(group)
+        if event['limit'] and following is not None and event['time'] + event['limit'] > following:
+            problems.append(Problem(
+                WARNING, where,
+                f"제한 시간({event['limit']}s)이 같은 그룹의 다음 재생({following}초)과 겹칩니다"))
+        next_play[group] = event['time']
+
+    problems.reverse()
+    return problems
+
+
+def compile_timeline(path, mp3_dir, clip_dirs=None):
+    """rasptimeline.txt 읽기 + 검사"""
+    with open(path, 'r', encoding='utf-8') as f:
+        events, problems = parse_timeline_lines(f.readlines())
+    return events, problems + check_timeline(events, mp3_dir, clip_dirs)
+
+
+# ------------------------------------------------------------
+# 컴파일 결과 캐시
+# ------------------------------------------------------------
+def _fingerprint(path, dirs):
+    """원본 파일 + 소리 폴더(파일이 추가/삭제되면 폴더 mtime이 바뀜)의 상태"""
+    st = os.stat(path)
+    dir_state = []
+    for d in dirs:
+        try:
+            dir_state.append((d, os.stat(d).st_mtime_ns))
+        except OSError:
+            dir_state.append((d, None))
+    return (COMPILED_VERSION, st.st_mtime_ns, st.st_size, tuple(dir_state))
+
+
+def compiled_path(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME, os.path.basename(path) + ".pkl")
+
+
+def load_compiled(path, compile_fn, dirs=()):
+    """캐시가 원본과 같으면 그대로 읽고, 아니면 compile_fn()으로 다시 만들어 저장 -> (항목, 문제, 캐시 사용 여부)"""
+    fingerprint = _fingerprint(path, dirs)
+    cache_path = compiled_path(path)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['fingerprint'] == fingerprint:
+            return cached['items'], cached['problems'], True
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, AttributeError):
+        pass    # 캐시가 없거나 깨졌으면 다시 컴파일
+
+    items, problems = compile_fn()
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'fingerprint': fingerprint, 'items': items, 'problems': problems}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)   # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록
+    except OSError as e:
+        print(f"⚠️ 컴파일 결과 저장 실패: {e}")
+    return items, problems, False
+
+
+def report(path, problems, limit=REPORT_LIMIT):
+    """문제 목록 출력 (경고 수, 오류 수)"""
+    if not problems:
+        return
+    errors = sum(1 for p in problems if p.level == ERROR)
+    print(f"🔎 {os.path.basename(path)}: 오류 {errors}건 / 경고 {len(problems) - errors}건")
+    for problem in problems[:limit]:
+        print(f"   {problem}")
+    if limit is not None and len(problems) > limit:
+        print(f"   ... 외 {len(problems) - limit}건 (python scenario_compiler.py {os.path.basename(path)} --all)")
+
+
+def pack_scenario(path, sound_dirs=()):
+    items, problems = compile_scenario(path, sound_dirs)
+    return PackedScenario(items), problems
+
+
+def load_packed_scenario(path, sound_dirs=()):
+    """검사된 scenario.json (PackedScenario, 시간 순, 캐시 사용)"""
+    sound_dirs = tuple(sound_dirs)
+    packed, problems, _ = load_compiled(path, lambda: pack_scenario(path, sound_dirs), sound_dirs)
+    report(path, problems)
+    return packed
+
+
+def load_timeline(path, mp3_dir, clip_dirs=None):
+    """검사된 rasptimeline.txt 이벤트 목록 (시간 순, 캐시 사용)"""
+    dirs = (mp3_dir,) + tuple((clip_dirs or {}).values())
+    events, problems, _ = load_compiled(path, lambda: compile_timeline(path, mp3_dir, clip_dirs), dirs)
+    report(path, problems)
+    return events
+
+
+# ------------------------------------------------------------
+# 파일 변경 감시 (hot reload)
+# ------------------------------------------------------------
+class FileWatcher:
+    """파일의 mtime/크기가 바뀌면 on_change(path)를 호출 (주기적으로 stat만 함)"""
+
+    def __init__(self, path, on_change=None, interval=WATCH_INTERVAL):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self._state = self._stat()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def changed(self):
+        """지난번 확인 이후 바뀌었으면 True"""
+        state = self._stat()
+        if state is None or state == self._state:
+            return False    # 편집기가 저장 중이라 잠깐 없는 경우도 무시
+        self._state = state
+        return True
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            if self.changed():
+                print(f"🔁 {os.path.basename(self.path)} 변경 감지, 다시 불러옵니다.")
+                try:
+                    self.on_change(self.path)
+                except Exception as e:
+                    # 고치는 중인 파일이 잘못되어도 기존 시나리오로 계속 동작
+                    print(f"❌ 다시 불러오기 실패 (기존 내용 유지): {e}")
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name="file-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def main():
+    base = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="시나리오 / 타임라인 검사 + 컴파일")
+    parser.add_argument('files', nargs='+', help="scenario.json 또는 rasptimeline.txt")
+    parser.add_argument('--mp3-dir', default=os.path.join(base, "mp3"), help="효과음/BGM 폴더")
+    parser.add_argument('--sound-dir', default=os.path.join(base, "sound"), help="선수 이름 MP3 폴더 (@callout)")
+    parser.add_argument('--all', action='store_true', help="문제를 모두 출력")
+    args = parser.parse_args()
+
+    sound_dirs = (args.mp3_dir, args.sound_dir)
+    clip_dirs = {'callout': args.sound_dir}
+    failed = False
+    for path in args.files:
+        started = time.perf_counter()
+        if path.endswith('.json'):
+            items, problems, cached = load_compiled(path, lambda: pack_scenario(path, sound_dirs), sound_dirs)
+        else:
+            items, problems, cached = load_compiled(
+                path, lambda: compile_timeline(path, args.mp3_dir, clip_dirs), sound_dirs)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✅ {path}: 이벤트 {len(items)}개 ({'캐시' if cached else '컴파일'} {elapsed:.1f}ms)")
+        report(path, problems, limit=None if args.all else REPORT_LIMIT)
+        failed = failed or any(p.level == ERROR for p in problems)
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+from scenario_compiler import load_packed_scenario
+
+# ===================================================================
+# scenario.json 이벤트 모델
+# 서버 시작 시 한 번만 ScenarioEvent로 변환해두고, time_update 처리 중에는
+# event['time'] 같은 dict 조회 대신 속성으로 접근합니다. (__slots__로 메모리 절약)
+# ===================================================================
+
+
+@dataclass(slots=True)
+class ScenarioEvent:
+    """시나리오 이벤트 한 개"""
+    time: float
+    type: str
+    text: str
+    led: str = None
+    sound: str = None
+    data: dict = None
+    group: str = None       # 스피커 채널 그룹 (없으면 server.py가 type으로 정함)
+    payload: dict = None    # update_ui로 그대로 보낼 원본 dict (매번 새로 만들지 않음)
+
+    @classmethod
+    def from_json(cls, item):
+        """scenario.json 항목(dict) 하나를 ScenarioEvent로 변환합니다."""
+        return cls(
+            time=float(item['time']),
+            type=item.get('type', ''),
+            text=item.get('text', ''),
+            led=item.get('led'),
+            sound=item.get('sound') or None,
+            data=item.get('data'),
+            group=item.get('group'),
+            payload=item,
+        )
+
+
+class ScenarioEvents:
+    """컴파일된 시나리오(PackedScenario)를 꺼낼 때 ScenarioEvent로 풀어주는 목록 (한 번 푼 것은 보관)"""
+
+    def __init__(self, packed):
+        self.packed = packed
+        self.times = packed.times     # ScenarioTimeline이 정렬/색인 없이 그대로 씀
+        self._events = {}
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        event = self._events.get(index)
+        if event is None:
+            event = self._events[index] = ScenarioEvent.from_json(self.packed.item(index))
+        return event
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def load_scenario(path, sound_dirs=()):
+    """scenario.json을 읽어 시간 순 ScenarioEvent 목록으로 돌려줍니다.
+    (검사 + 정렬은 scenario_compiler가 한 번만 하고 캐시해 둠, 이벤트는 필요할 때 풂)"""
+    return ScenarioEvents(load_packed_scenario(path, sound_dirs))
@@ -0,0 +1,81 @@
+from bisect import bisect_left, bisect_right
+
+# ===================================================================
+# 시나리오 시간 색인 + 재생 커서
+# 시간 목록을 미리 정렬해두고 bisect로 탐색하므로, 이벤트가 수천 개여도
+# seek / time_update 한 번에 O(log n) + (실행할 이벤트 수) 만큼만 일합니다.
+# ===================================================================
+SCRUB_BACK_TOLERANCE = 0.5   # 이보다 작게 뒤로 간 time_update는 흔들림으로 보고 무시 (초)
+SCRUB_JUMP = 5.0             # 이보다 크게 앞/뒤로 뛴 time_update는 탐색(seek)으로 처리 (초)
+
+
+class ScenarioTimeline:
+    """시간 순으로 정렬된 시나리오 이벤트와 시간 색인"""
+
+    def __init__(self, events):
+        times = getattr(events, 'times', None)
+        if times is not None:
+            # load_scenario()의 결과는 이미 정렬 + 시간 배열이 있음 (이벤트는 꺼낼 때 풂)
+            self.events = events
+            self.times = times
+        else:
+            self.events = sorted(events, key=lambda e: e.time)
+            self.times = [e.time for e in self.events]
+
+    def __len__(self):
+        return len(self.events)
+
+    def index_after(self, t, lo=0):
+        """시간 t 이후(t 초과)의 첫 이벤트 위치"""
+        return bisect_right(self.times, t, lo)
+
+    def index_at(self, t, lo=0):
+        """시간 t 이상(같은 시간 포함)의 첫 이벤트 위치"""
+        return bisect_left(self.times, t, lo)
+
+
+class PlaybackCursor:
+    """영상 재생 위치를 따라가며 아직 실행하지 않은 이벤트를 꺼내주는 커서"""
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.position = 0       # 다음에 실행할 이벤트 위치
+        self.last_time = None   # 마지막으로 받은 영상 시간
+
+    @property
+    def last_event_index(self):
+        """마지막으로 실행된 이벤트 인덱스 (예전 전역 변수와 같은 의미, 없으면 -1)"""
+        return self.position - 1
+
+    def retarget(self, timeline):
+        """시나리오가 다시 로드되었을 때: 마지막 영상 시간 다음 이벤트부터 새 타임라인으로"""
+        self.timeline = timeline
+        self.position = 0 if self.last_time is None else timeline.index_after(self.last_time)
+
+    def seek(self, t, inclusive=False):
+        """t초로 탐색: t 이전(같은 시간 포함) 이벤트는 모두 실행된 것으로 처리
+        inclusive면 정확히 t초인 이벤트는 아직 실행하지 않은 것으로 남김"""
+        self.position = self.timeline.index_at(t) if inclusive else self.timeline.index_after(t)
+        self.last_time = t
+
+    def advance(self, t):
+        """영상 시간이 t가 되었을 때 실행할 이벤트 목록 (시간 순)"""
+        last = self.last_time
+        if last is not None:
+            if t < last - SCRUB_BACK_TOLERANCE or t > last + SCRUB_JUMP:
+                # seek_event보다 time_update가 먼저 온 되감기/건너뛰기
+                self.seek(t)
+                return []
+            if t < last:
+                return []
+        return self.take_until(t)
+
+    def take_until(self, t):
+        """t초까지 남은 이벤트를 모두 꺼냄 (되감기/건너뛰기 판단 없이: 재생 기준점을 아는 서버 예약용)"""
+        self.last_time = t
+        end = self.timeline.index_after(t, self.position)
+        if end <= self.position:
+            return []
+        due = self.timeline.events[self.position:end]
+        self.position = end
+        return due
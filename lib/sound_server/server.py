@@ -1,22 +1,53 @@
-import json
+import argparse
+import os
 import socket
 import serial
+import sys
 import time
-from flask import Flask, render_template
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, jsonify, render_template, request
+from flask_socketio import SocketIO, emit, join_room, leave_room
 
-app = Flask(__name__)
+from channel_manager import GROUP_BGM, GROUP_CALLOUT, GROUP_CROWD
+from clock_sync import ClockService
+from cue_scheduler import CueScheduler, PlaybackState, cue_window
+from led_protocol import BAUDRATE, LedBoard, LedLink
+from metrics import CONTENT_TYPE, LOG, REGISTRY, register_clock
+from output_dispatcher import POLICY_COALESCE, OutputDispatcher
+from playback_sessions import SessionRegistry
+from scenario_compiler import FileWatcher
+from scenario_model import ScenarioEvent, load_scenario
+from scenario_timeline import ScenarioTimeline
+from sound_protocol import SERVER_SYNC_PORT, UDP_REPEAT, CommandEncoder
+
+# 화면 템플릿 폴더 (demo/server.py는 demo/templates를 씀)
+app = Flask(__name__, template_folder=os.environ.get('TEMPLATE_DIR', 'templates'))
 socketio = SocketIO(app)
 
 # --- 설정 구간 ---
 # 1. 라즈베리파이 (스피커) 설정
 RPI_IP = "192.168.0.XX"  # 라즈베리파이 IP 주소 입력 필수!
 RPI_PORT = 12345
+# 스피커/LED를 따라갈 방 이름 (None이면 모든 방의 이벤트를 내보냄)
+# 예: "stage" 로 두고 무대 화면만 http://서버:5000/?room=stage 로 접속
+HARDWARE_ROOM = None
+# 이만큼(영상 초) 앞의 이벤트를 미리 보내고, 정확한 재생 시각을 같이 알려줌
+LOOKAHEAD = 0.5
+# 실시간 중계 모드 (python server.py --live 경기ID): 크롤러 폴더 위치
+CRAWL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'crawl')
+# 시나리오 파일 (고치면 서버를 재시작하지 않아도 다시 불러옴, demo/server.py는 demo/scenario.json)
+SCENARIO_FILE = os.environ.get('SCENARIO_FILE', 'scenario.json')
+# 시나리오의 sound 파일이 있는지 검사할 폴더 (라즈베리파이와 같은 구성일 때)
+SOUND_DIRS = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name) for name in ('mp3', 'sound')]
 
 # 2. 아두이노 (LED) 설정
 # 아두이노를 PC USB에 연결 후 장치관리자에서 포트 확인 (예: COM3)
+# 아두이노 없이 시험: python led_emulator.py 가 알려주는 포트를 ARDUINO_PORT로 지정
+ARDUINO_PORT = os.environ.get('ARDUINO_PORT', 'COM3')
+# 기본: 지금 아두이노 펌웨어가 읽는 한 글자 명령 (S/B/H/R, RESET은 0)
+# LED_FRAMED=1: 프레임 프로토콜 (주자/BSO/점수/이닝 + 효과, led_protocol.py) - 프레임을 읽는 펌웨어/에뮬레이터용
+LED_FRAMED = os.environ.get('LED_FRAMED') == '1'
 try:
-    arduino = serial.Serial('COM3', 9600, timeout=1) 
+    arduino = serial.Serial(ARDUINO_PORT, BAUDRATE, timeout=1)
     time.sleep(2) # 연결 대기
     print("✅ 아두이노 연결 성공")
 except:
@@ -25,77 +56,285 @@ except:
 
 # 3. 소켓(UDP) 준비 (라즈베리파이 통신용)
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+# 명령마다 seq 번호 + 재생 시각을 붙임 (라즈베리파이가 중복 제거 / 순서 정렬)
+sound_commands = CommandEncoder()
+# 라즈베리파이가 이 포트로 ping을 보내 시계를 맞춤 (명령도 이 포트에서 나감)
+sock.bind(('0.0.0.0', SERVER_SYNC_PORT))
+clock = ClockService()
+clock.start_udp(sock)
+register_clock(clock)   # 지연 히스토그램을 /metrics로도 내보냄
+
+# 이벤트 종류별 스피커 채널 그룹 (scenario.json 항목에 "group"이 있으면 그것을 씀)
+#  선수 이름 콜은 callout (라즈베리파이 sound/ 폴더), 이닝 시작 음악은 bgm, 나머지 효과음/함성은 crowd
+SOUND_GROUPS = {'batter_change': GROUP_CALLOUT, 'inning_start': GROUP_BGM}
+
+def sound_group(event):
+    return event.group or SOUND_GROUPS.get(event.type, GROUP_CROWD)
+
+def send_udp(msg):
+    # UDP는 잃어버릴 수 있어서 여러 번 보냄 (받는 쪽에서 seq로 중복 제거)
+    for _ in range(UDP_REPEAT):
+        sock.sendto(msg, (RPI_IP, RPI_PORT))
+
+# 출력 분배기: 전광판 / 스피커 / LED 전송은 장치별 작업 스레드가 처리
+# (느린 시리얼 포트 때문에 update_ui가 늦어지지 않도록)
+outputs = OutputDispatcher()
+def observe_emit(payload):
+    """실시간 중계 이벤트를 화면으로 보낸 순간 기록 (플레이를 받은 뒤 얼마 만에 나갔는지)"""
+    if payload.get('arrived'):
+        latency = (time.time() - payload['arrived']) * 1000
+        clock.observe('live_emit_ms', latency)
+        LOG('live_emit', game=payload.get('game'), seqno=payload.get('seqno'), latency_ms=round(latency, 2))
+
+def send_ui(item):
+    # update_ui(데이터, 반영할 서버 시각) 두 인자로 보냄
+    socketio.emit('update_ui', (item[0], item[2]), to=item[1])
+    observe_emit(item[0])
+
+outputs.add_sink('ui', send_ui, maxsize=256)
+outputs.add_sink('udp', send_udp, maxsize=32)
+# LED 전광판 상태 (이벤트마다 바뀐 부분만 반영)
+led_board = LedBoard()
+if arduino:
+    # 보낼 시각이 지난 상태가 몰리면 합쳐서 가장 최신 상태 하나만, 바뀐 값만 한 프레임으로 보냄
+    # (LOOKAHEAD 안에 미리 예약된 상태는 합치지 않으므로 대기열을 그만큼 넉넉하게)
+    led_link = LedLink(arduino.write, framed=LED_FRAMED)
+    outputs.add_sink('serial', led_link.send, maxsize=32, policy=POLICY_COALESCE)
 
-# 4. 시나리오 로드
-with open('scenario.json', 'r', encoding='utf-8') as f:
-    scenario = json.load(f)
+# 4. 시나리오 로드 (ScenarioEvent 목록 + bisect용 시간 색인, 검사 결과는 .scenario_cache에 저장)
+scenario = load_scenario(SCENARIO_FILE, SOUND_DIRS)
+timeline = ScenarioTimeline(scenario)
 
-# 마지막으로 실행된 이벤트 인덱스
-last_event_index = -1
+# 접속한 화면(세션)별 재생 커서. 같은 방에 들어간 화면끼리는 커서를 공유
+sessions = SessionRegistry(timeline)
+
+def reload_scenario(path):
+    """scenario.json이 바뀌면 새 시간 색인으로 교체 (각 방은 지금 재생 위치에서 이어감)"""
+    global scenario, timeline
+    scenario = load_scenario(path, SOUND_DIRS)
+    timeline = ScenarioTimeline(scenario)
+    sessions.set_timeline(timeline)
+    cues.wake()
+    # push 모드 화면은 받아둔 이벤트 구간을 다시 받아감
+    broadcast('scenario_reloaded', {'events': len(timeline)})
+    print(f"✅ 시나리오 다시 로드: 이벤트 {len(timeline)}개")
+
+def broadcast(name, data):
+    """모든 화면에 알림 (async_server.py는 이벤트 루프용으로 바꿔 끼움)"""
+    socketio.emit(name, data)
+
+scenario_watcher = FileWatcher(SCENARIO_FILE, reload_scenario)
+scenario_watcher.start()
 
 @app.route('/')
 def index():
     return render_template('index.html') # 웹페이지(전광판+영상) 렌더링
 
+# 장치별 전송 수 / 버린 수 / 지연 통계
+@app.route('/stats/outputs')
+def output_stats():
+    return jsonify(outputs.stats())
+
+# 시계 맞추기 / 신호 지연 히스토그램
+@app.route('/stats/clock')
+def clock_stats():
+    return jsonify(clock.stats())
+
+# Prometheus 수집용 (크롤러 --live를 같이 돌리면 crawl_* 지표도 여기에 나옴)
+@app.route('/metrics')
+def metrics():
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+def dispatch_event(event, room, at=None, ui=True):
+    """이벤트 하나를 방의 전광판 / 스피커 / LED 대기열에 넣습니다. (바로 돌아옴)
+    room: None이면 실시간 중계 이벤트 (모든 화면 + 스피커/LED)
+    at: 실제로 보여주고/재생할 서버 시각 (없으면 지금)
+    ui: False면 전광판은 건너뜀 (push 모드 화면은 cue_window로 받아 스스로 예약)"""
+    now = time.time()
+    at = now if at is None else at
+    clock.observe('dispatch_lead_ms', (at - now) * 1000)
+    room_name = room.name if room else None
+    print(f"⚾ 이벤트 발생! [{room_name or 'live'}] [{event.time}초] {event.text}")
+    LOG('dispatch', room=room_name, time=event.time, text=event.text, sound=event.sound, led=event.led,
+        lead_ms=round((at - now) * 1000, 2))
+    
+    # 1. PC 화면(전광판) 업데이트 신호 전송 (같은 방의 화면 모두에게, 실시간 중계는 전체에게)
+    if ui:
+        outputs.submit('ui', (event.payload, room_name, at))
+
+    if HARDWARE_ROOM is not None and room_name is not None and room_name != HARDWARE_ROOM:
+        return
+
+    # 2. 라즈베리파이(스피커)로 소리 재생 신호 전송 (UDP)
+    if event.sound:
+        # 예: {"seq": 3, "t": 1712345678.12, "cmd": "play", "sound": "hit.mp3", "group": "crowd", ...}
+        outputs.submit('udp', sound_commands.encode(event.sound, at=at, group=sound_group(event)))
+
+    # 3. 아두이노(LED)로 전광판 상태 전송 (Serial)
+    # led 코드(효과, BASE_1_3 같은 주자 상태) + data(B/S/O, 점수, 이닝)를 반영한 전체 상태
+    if arduino and (event.led or event.data):
+        state = led_board.apply(event.led, event.data)
+        if state is not None:
+            outputs.submit('serial', state, at=at)   # 아두이노는 시계가 없어서 서버가 시각에 맞춰 보냄
+
+# push 모드 방의 스피커/LED 신호는 브라우저 대신 서버가 직접 예약 (playback_state 기준)
+cues = CueScheduler(lambda event, room, at: dispatch_event(event, room, at, ui=False), LOOKAHEAD)
+cues.start()
+
+def dispatch_live(item):
+    """실시간 중계 이벤트(live_events.py가 만든 scenario.json 형식 dict)를 바로 내보냅니다."""
+    if item.get('arrived'):
+        latency = (time.time() - item['arrived']) * 1000
+        clock.observe('live_dispatch_ms', latency)
+        LOG('live_dispatch', game=item.get('game'), seqno=item.get('seqno'), latency_ms=round(latency, 2))
+    dispatch_event(ScenarioEvent.from_json(item), None)
+
+def start_live_feed(game_ids, api_base=None):
+    """경기 ID 목록을 폴링하는 스레드를 띄워 새 플레이마다 dispatch_live를 호출합니다."""
+    sys.path.insert(0, CRAWL_DIR)
+    from live_events import LiveFeed
+    options = {'api_base': api_base} if api_base else {}
+    feed = LiveFeed(game_ids, dispatch_live, **options)
+    feed.start()
+    print(f"📡 실시간 중계 연결: {', '.join(game_ids)}")
+    return feed
+
+# -------------------------------------------------------------------
+# 소켓 이벤트 처리 (sid만 받음 → async_server.py도 같은 함수를 씀)
+# -------------------------------------------------------------------
+def process_join(sid, room_name):
+    """sid를 room_name 방으로 옮김 -> (나와야 할 Socket.IO 방 이름 또는 None, 새 Room)"""
+    old_room = sessions.room_of(sid)
+    left = old_room.name if old_room.name != sid else None
+    room = sessions.join(sid, room_name)
+    print(f"🚪 {sid} → 방 '{room.name}' (인원 {len(room.members)})")
+    return left, room
+
+def process_leave(sid):
+    """공유 방에서 나옴 -> 나와야 할 Socket.IO 방 이름 또는 None"""
+    old_room = sessions.room_of(sid)
+    sessions.leave(sid)
+    return old_room.name if old_room.name != sid else None
+
+def process_clock_ping(data, received):
+    if data.get('rtt') is not None:
+        clock.observe('browser_rtt_ms', data['rtt'] * 1000)
+    return clock.pong(data['t0'], received)
+
+def process_cue_report(data):
+    clock.observe('ui_late_ms', data['late_ms'])
+    if data.get('live_ms') is not None:
+        clock.observe('live_ui_ms', data['live_ms'])
+
+def process_time_update(sid, data):
+    current_time = data['time'] # 영상의 현재 시간 (초)
+    room = sessions.room_of(sid)
+
+    # at: 브라우저가 이 영상 시간을 본 순간 (서버 시계로 환산), 없으면 받은 시각
+    now = time.time()
+    at = min(data.get('at') or now, now)
+    if data.get('at'):
+        clock.observe('time_update_ms', (now - at) * 1000)
+    rate = data.get('rate') or 1.0
+    lookahead = 0 if data.get('paused') else LOOKAHEAD * rate
+
+    # 커서 위치부터 (지금 + LOOKAHEAD) 안에 들어오는 이벤트를 꺼내서
+    # 각자 재생될 서버 시각을 붙여 미리 보냄 (되감기/건너뛰기는 커서가 알아서 재조정, 잠금은 방 단위)
+    with room.lock:
+        due = room.cursor.advance(current_time + lookahead)
+    for event in due:
+        dispatch_event(event, room, max(now, at + (event.time - current_time) / rate))
+
+def process_seek(sid, data):
+    seek_time = data['time']
+    room = sessions.room_of(sid)
+    # 탐색한 시간보다 이전에 있는 이벤트는 실행된 것으로 처리 (bisect)
+    with room.lock:
+        room.cursor.seek(seek_time)
+    print(f"영상 탐색됨: [{room.name}] {seek_time}초, 다음 이벤트 인덱스: {room.cursor.position}")
+
+def process_playback_state(sid, data):
+    """push 모드: 재생/일시정지/탐색/배속이 바뀌었을 때만 받는 재생 기준점"""
+    room = sessions.room_of(sid)
+    now = time.time()
+    state = PlaybackState(data['time'], min(data.get('at') or now, now),
+                          data.get('rate') or 1.0, bool(data.get('paused')))
+    cues.update(room, state, seek=bool(data.get('seek')))
+    if data.get('seek'):
+        print(f"영상 탐색됨: [{room.name}] {state.video_time}초, 다음 이벤트 인덱스: {room.cursor.position}")
+
+def process_cue_window(sid, data):
+    """push 모드: from초 이후 CUE_WINDOW초 동안의 이벤트 (브라우저가 직접 예약)"""
+    return cue_window(sessions.timeline, data.get('from') or 0.0, inclusive=bool(data.get('reset')))
+
+@socketio.on('connect')
+def handle_connect():
+    sessions.connect(request.sid)
+
+@socketio.on('disconnect')
+def handle_disconnect(*args):
+    sessions.disconnect(request.sid)
+
+# 여러 화면이 같은 재생 위치를 공유하고 싶을 때 같은 방에 들어감
+@socketio.on('join_room')
+def handle_join(data):
+    left, room = process_join(request.sid, data['room'])
+    if left:
+        leave_room(left)
+    join_room(room.name)
+
+@socketio.on('leave_room')
+def handle_leave(data=None):
+    left = process_leave(request.sid)
+    if left:
+        leave_room(left)
+
+# 브라우저 시계 맞추기: 보낸 시각(t0)에 서버가 받은/답한 시각을 붙여 돌려줌
+@socketio.on('clock_ping')
+def handle_clock_ping(data):
+    emit('clock_pong', process_clock_ping(data, time.time()))
+
+# 브라우저가 예약된 전광판 신호를 실제로 반영한 뒤 늦은 정도를 알려줌
+@socketio.on('cue_report')
+def handle_cue_report(data):
+    process_cue_report(data)
+
 # 브라우저에서 영상 시간이 업데이트 될 때마다 호출됨 (1초에 여러 번)
 @socketio.on('time_update')
 def handle_time_update(data):
-    global last_event_index
-    current_time = data['time'] # 영상의 현재 시간 (초)
-
-    # 시나리오를 순회하며 아직 실행 안 된 이벤트 중, 시간이 된 것을 찾음
-    # (순차적으로 실행되도록 로직 구성)
-    next_index = last_event_index + 1
-    
-    if next_index < len(scenario):
-        event = scenario[next_index]
-        
-        # 영상 시간이 이벤트 시간보다 같거나 커지면 실행
-        if current_time >= event['time']:
-            print(f"⚾ 이벤트 발생! [{event['time']}초] {event['text']}")
-            
-            # 1. PC 화면(전광판) 업데이트 신호 전송
-            emit('update_ui', event)
-
-            # 2. 라즈베리파이(스피커)로 소리 재생 신호 전송 (UDP)
-            if 'sound' in event and event['sound']:
-                msg = event['sound'] # 예: "hit.mp3"
-                try:
-                    sock.sendto(msg.encode(), (RPI_IP, RPI_PORT))
-                except:
-                    print("라즈베리파이 전송 실패")
-
-            # 3. 아두이노(LED)로 제어 신호 전송 (Serial)
-            if arduino and 'led' in event:
-                # LED 패턴 정의 (아두이노 코드와 맞춰야 함)
-                # S: 스트라이크(빨강), B: 볼(노랑), H: 안타(초록), R: 홈런(RGB)
-                cmd = b'0'
-                if event['led'] == 'STRIKE_RED': cmd = b'S'
-                elif event['led'] == 'BALL_YELLOW': cmd = b'B'
-                elif event['led'] == 'HIT_GREEN': cmd = b'H'
-                elif event['led'] == 'HOMERUN': cmd = b'R'
-                
-                if cmd != b'0':
-                    arduino.write(cmd)
-
-            last_event_index = next_index
+    process_time_update(request.sid, data)
 
 # 영상을 탐색(Seek)했을 때 싱크 재설정
 @socketio.on('seek_event')
 def handle_seek(data):
-    global last_event_index
-    seek_time = data['time']
-    # 탐색한 시간보다 이전에 있는 가장 마지막 이벤트로 인덱스 조정
-    new_index = -1
-    for i, event in enumerate(scenario):
-        if event['time'] <= seek_time:
-            new_index = i
-        else:
-            break
-    last_event_index = new_index
-    print(f"영상 탐색됨: {seek_time}초, 다음 이벤트 인덱스: {last_event_index + 1}")
+    process_seek(request.sid, data)
+
+# push 모드: 재생 상태가 바뀔 때만 호출됨 (time_update 대신)
+@socketio.on('playback_state')
+def handle_playback_state(data):
+    process_playback_state(request.sid, data)
+
+# push 모드: 앞으로 나올 이벤트 구간 요청 (응답은 ack로 돌려줌)
+@socketio.on('cue_window')
+def handle_cue_window(data):
+    return process_cue_window(request.sid, data)
+
+def main():
+    parser = argparse.ArgumentParser(description="야구 중계 시스템 서버")
+    parser.add_argument('--live', nargs='+', metavar='GAME_ID', help="실시간 문자중계 경기 ID (영상 시나리오와 함께 동작)")
+    parser.add_argument('--api-base', help="중계 API 주소 (가짜 서버 테스트: http://127.0.0.1:8080)")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--json-log', metavar='PATH', help="이벤트별 지연을 JSON 한 줄씩 기록 ('-'면 stderr)")
+    args = parser.parse_args()
+    if args.json_log:
+        LOG.open(args.json_log)
+    if args.live:
+        start_live_feed(args.live, args.api_base)
 
-if __name__ == '__main__':
     print("⚾ 야구 중계 시스템 서버 시작...")
-    print(f"👉 http://localhost:5000 접속하세요")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    print(f"👉 http://localhost:{args.port} 접속하세요 (운영용: python async_server.py)")
+    # 자동 재시작(reloader)을 끔: 켜져 있으면 모듈이 두 번 실행되어 시리얼/UDP 포트를 두 번 열려고 함
+    socketio.run(app, host='0.0.0.0', port=args.port, debug=True, use_reloader=False, allow_unsafe_werkzeug=True)
+
+if __name__ == '__main__':
+    main()
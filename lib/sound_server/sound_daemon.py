@@ -0,0 +1,371 @@
+import argparse
+import collections
+import heapq
+import json
+import os
+import socket
+import threading
+import time
+
+from channel_manager import CHANNEL_GROUPS, GROUP_CROWD
+from clock_sync import SYNC_BURST, SYNC_INTERVAL, ClockSync, Histogram
+from metrics import FAST_BUCKETS_MS, LOG, REGISTRY, Timer
+from sound_protocol import (CMD_PING, CMD_PLAY, CMD_PONG, CMD_STOP, DEFAULT_PORT, UDP_REPEAT,
+                            CommandEncoder, decode_command)
+from timeline_scheduler import FADEOUT_MS
+
+# ===================================================================
+# 라즈베리파이 사운드 데몬: 서버가 보낸 명령(UDP / TCP)을 받아 지정된 시각에 재생
+#  - 고정 타임라인을 혼자 돌리는 대신, 영상 재생 위치를 아는 서버가 보낸 명령을 따름
+#  - (src, seq)로 중복 제거, 도착 순서가 아니라 재생 시각(t) 순서로 실행
+#  - 재생 시각 = 서버 시각 t + PLAYOUT_DELAY (네트워크 흔들림 흡수) - 시계 차이(offset)
+#  - offset은 서버에 UDP ping을 보내 NTP 방식으로 측정 (clock_sync.py), 10초마다 다시 맞춤
+#   python main.py --listen --fake-mixer              # 받는 쪽 (소리 없이 테스트)
+#   python sound_daemon.py hit.mp3 --delay 1          # 보내는 쪽 (loopback)
+# ===================================================================
+# 서버 시각보다 이만큼 늦게 재생 (초). 서버가 LOOKAHEAD만큼 미리 보내므로 기본 0,
+# 서버가 재생 시각 = 보낸 시각으로 보내는 환경이면 네트워크 흔들림만큼 늘림
+PLAYOUT_DELAY = 0.0
+LATE_TOLERANCE = 0.5    # 재생 시각보다 이보다 늦게 도착한 명령은 버림 (초)
+DEDUP_WINDOW = 1024     # 서버(src)마다 기억하는 최근 seq 수
+LATE_REPORT_MAX = 256   # 서버로 보낼 늦음(ms) 기록을 이만큼만 모아 둠 (서버 주소를 모르면 계속 쌓이므로)
+CMD_FADE = 'fade'       # 데몬 안에서만 쓰는 제한 시간 종료 명령
+# group이 없는 play 명령(예전 형식 등)을 재생할 그룹: bgm(1채널)에 넣으면 재생 중인 소리를 끊으므로 효과음 그룹으로
+NO_GROUP_FALLBACK = GROUP_CROWD
+
+
+class CommandQueue:
+    """중복 제거 + 재생 시각 순 정렬 대기열 (받는 스레드 여러 개 → 재생 스레드 하나)"""
+
+    def __init__(self, playout_delay=PLAYOUT_DELAY, late_tolerance=LATE_TOLERANCE, clock=time.time):
+        self.playout_delay = playout_delay
+        self.late_tolerance = late_tolerance
+        self.clock = clock
+        self.offset = 0.0           # 서버 시계 - 이 기기 시계 (초)
+        self.heap = []
+        self.cond = threading.Condition()
+        self.closed = False
+        self._order = 0
+        self.seen = {}              # src -> (seq 집합, 들어온 순서)
+        self.max_seq = {}           # src -> 지금까지 본 가장 큰 seq
+
+        self.received = 0
+        self.duplicates = 0
+        self.late = 0
+        self.reordered = 0
+
+    def _is_duplicate(self, src, seq):
+        seqs, order = self.seen.setdefault(src, (set(), collections.deque()))
+        if seq in seqs:
+            return True
+        seqs.add(seq)
+        order.append(seq)
+        if len(order) > DEDUP_WINDOW:
+            seqs.discard(order.popleft())
+        if seq < self.max_seq.get(src, seq):
+            self.reordered += 1
+        self.max_seq[src] = max(seq, self.max_seq.get(src, seq))
+        return False
+
+    def due_time(self, command):
+        """명령의 재생 시각 (이 기기 시계 기준). t가 없으면(예전 형식) 지금"""
+        if 't' not in command:
+            return self.clock()
+        return float(command['t']) + self.playout_delay - self.offset
+
+    def push(self, command):
+        """받은 명령을 넣습니다. 중복이거나 너무 늦었으면 False"""
+        with self.cond:
+            self.received += 1
+            if 'seq' in command and self._is_duplicate(command.get('src'), command['seq']):
+                self.duplicates += 1
+                return False
+            due = self.due_time(command)
+            if due < self.clock() - self.late_tolerance:
+                self.late += 1
+                return False
+            self._push_locked(due, command)
+        return True
+
+    def schedule(self, due, command):
+        """데몬 내부 명령(제한 시간 종료 등)을 직접 넣습니다."""
+        with self.cond:
+            self._push_locked(due, command)
+
+    def _push_locked(self, due, command):
+        heapq.heappush(self.heap, (due, command.get('seq', 0), self._order, command))
+        self._order += 1
+        self.cond.notify()
+
+    def pop_due(self, wake_at=None):
+        """재생 시각이 된 명령을 모두 꺼냅니다. 없으면 다음 시각(또는 wake_at)까지 대기"""
+        with self.cond:
+            while not self.closed:
+                now = self.clock()
+                due = []
+                while self.heap and self.heap[0][0] <= now:
+                    when, _, _, command = heapq.heappop(self.heap)
+                    due.append((when, command))
+                if due or (wake_at is not None and wake_at <= now):
+                    return due
+                deadlines = [d for d in (self.heap[0][0] if self.heap else None, wake_at) if d is not None]
+                self.cond.wait(min(deadlines) - now if deadlines else None)
+            return []
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class SoundDaemon:
+    """UDP(+선택 TCP)로 명령을 받아 backend(ChannelManager 등)로 재생"""
+
+    def __init__(self, backend, mp3_dir, clip_dirs=None, host='0.0.0.0', port=DEFAULT_PORT,
+                 tcp_port=None, playout_delay=PLAYOUT_DELAY, server_addr=None):
+        self.backend = backend
+        self.mp3_dir = mp3_dir
+        self.clip_dirs = clip_dirs or {}
+        self.host = host
+        self.port = port
+        self.tcp_port = tcp_port
+        self.queue = CommandQueue(playout_delay)
+        self.running = False
+        self.threads = []
+        self.rejected = 0               # 모르는 채널 그룹이라 버린 명령 수
+
+        # 시계 맞추기: 서버 주소는 --server로 주거나, 명령을 보낸 주소로 알아냄
+        self.sync = ClockSync()
+        self.server_addr = server_addr
+        self.udp = None
+        self.late_ms = Histogram()      # 예정 시각보다 늦게 재생한 정도
+        self.lead_ms = Histogram()      # 명령이 재생 시각보다 얼마나 먼저 도착했는지
+        self._late_report = collections.deque(maxlen=LATE_REPORT_MAX)  # 다음 ping에 실어 서버로 보낼 늦음(ms)
+        self.play_ms = Histogram(FAST_BUCKETS_MS)   # backend.play() 호출 자체에 걸린 시간
+        self.register_metrics()
+
+    def register_metrics(self):
+        """라즈베리파이 쪽 지표 (main.py --listen --metrics-port로 내보냄)"""
+        REGISTRY.histogram('pi_trigger_late_ms', "예정 시각보다 늦게 재생한 정도 (ms)", histogram=self.late_ms)
+        REGISTRY.histogram('pi_command_lead_ms', "명령이 재생 시각보다 얼마나 먼저 도착했는지 (ms)", histogram=self.lead_ms)
+        REGISTRY.histogram('pi_play_call_ms', "backend.play() 호출 시간 (ms)", FAST_BUCKETS_MS, histogram=self.play_ms)
+        for field, help_text in (('received', "받은 명령 수"), ('duplicates', "중복이라 버린 명령 수"),
+                                 ('late', "너무 늦게 와서 버린 명령 수"), ('reordered', "순서가 바뀌어 도착한 명령 수")):
+            REGISTRY.callback(f'pi_commands_{field}_total', help_text,
+                              lambda field=field: getattr(self.queue, field), kind='counter')
+        REGISTRY.callback('pi_commands_rejected_total', "모르는 채널 그룹이라 버린 명령 수",
+                          lambda: self.rejected, kind='counter')
+        REGISTRY.callback('pi_clock_offset_ms', "서버 시계 - 라즈베리파이 시계 (ms)", lambda: self.sync.offset * 1000)
+        REGISTRY.callback('pi_clock_rtt_ms', "서버와의 왕복 시간 (ms)",
+                          lambda: None if self.sync.rtt is None else self.sync.rtt * 1000)
+
+    def clip_path(self, command):
+        directory = self.clip_dirs.get(command.get('group'), self.mp3_dir)
+        return os.path.join(directory, os.path.basename(command['sound']))   # 폴더 밖 경로 차단
+
+    # ------------------------------------------------------------
+    # 받기
+    # ------------------------------------------------------------
+    def _serve_udp(self):
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        udp.bind((self.host, self.port))
+        udp.settimeout(0.5)
+        self.udp = udp
+        print(f"📡 UDP 대기 중: {self.host}:{self.port}")
+        while self.running:
+            try:
+                data, addr = udp.recvfrom(4096)
+            except socket.timeout:
+                continue
+            command = decode_command(data)
+            if not command:
+                continue
+            if command['cmd'] == CMD_PONG:
+                self._on_pong(command)
+                continue
+            if 'seq' in command:
+                self.server_addr = addr
+            self._receive(command)
+        udp.close()
+
+    def check_group(self, command):
+        """play 명령의 채널 그룹 확인: 없으면 알리고 NO_GROUP_FALLBACK으로, 모르는 그룹이면 False (버림)"""
+        if command.get('cmd') != CMD_PLAY or not command.get('sound'):
+            return True
+        group = command.get('group')
+        if group is None:
+            print(f"⚠️ 채널 그룹 없는 명령: {command['sound']} → {NO_GROUP_FALLBACK} (seq {command.get('seq')})")
+            command['group'] = NO_GROUP_FALLBACK
+            return True
+        if group not in CHANNEL_GROUPS:
+            self.rejected += 1
+            print(f"❌ 모르는 채널 그룹 '{group}': {command['sound']} 재생 안 함 (seq {command.get('seq')})")
+            LOG('pi_reject', sound=command['sound'], group=group, seq=command.get('seq'))
+            return False
+        return True
+
+    def _receive(self, command):
+        if not self.check_group(command):
+            return
+        lead = (self.queue.due_time(command) - self.queue.clock()) * 1000
+        # 중복(재전송)이나 너무 늦어 버린 명령은 빼고 실제로 받아들인 명령만 기록
+        if self.queue.push(command):
+            self.lead_ms.observe(lead)
+
+    def _serve_tcp(self):
+        # 한 줄에 명령 하나 (JSON), 연결을 계속 유지
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((self.host, self.tcp_port))
+        server.listen()
+        server.settimeout(0.5)
+        print(f"📡 TCP 대기 중: {self.host}:{self.tcp_port}")
+        while self.running:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            threading.Thread(target=self._serve_tcp_conn, args=(conn,), daemon=True).start()
+        server.close()
+
+    def _serve_tcp_conn(self, conn):
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with conn, conn.makefile('rb') as lines:
+            for line in lines:
+                command = decode_command(line)
+                if command:
+                    self._receive(command)
+                if not self.running:
+                    break
+
+    # ------------------------------------------------------------
+    # 시계 맞추기
+    # ------------------------------------------------------------
+    def _send_ping(self):
+        late = [self._late_report.popleft() for _ in range(len(self._late_report))]
+        ping = {'cmd': CMD_PING, 't0': time.time(), 'offset': self.sync.offset, 'rtt': self.sync.rtt, 'late_ms': late}
+        try:
+            self.udp.sendto(json.dumps(ping).encode('utf-8'), self.server_addr)
+        except OSError as e:
+            print(f"⚠️ ping 전송 실패: {e}")
+
+    def _on_pong(self, pong):
+        self.sync.add(pong['t0'], pong['t1'], pong['t2'], time.time())
+        self.queue.offset = self.sync.offset
+        if len(self.sync.samples) == SYNC_BURST:
+            print(f"⏱️ 서버 시계 차이 {self.sync.offset * 1000:+.1f}ms (RTT {self.sync.rtt * 1000:.1f}ms)")
+
+    def _sync_loop(self):
+        burst = 0
+        while self.running:
+            if self.server_addr is None or self.udp is None:
+                time.sleep(0.5)
+                continue
+            self._send_ping()
+            # 처음에는 짧은 간격으로 여러 번, 그 뒤로는 SYNC_INTERVAL마다
+            burst += 1
+            time.sleep(0.2 if burst < SYNC_BURST else SYNC_INTERVAL)
+
+    # ------------------------------------------------------------
+    # 재생
+    # ------------------------------------------------------------
+    def _execute(self, due, command):
+        now = self.queue.clock()
+        cmd = command.get('cmd')
+        if cmd == CMD_FADE:
+            self.backend.fadeout(FADEOUT_MS, command['voice'])
+            return
+
+        late = (now - due) * 1000
+        self.late_ms.observe(late)
+        self._late_report.append(round(late, 2))
+        LOG('pi_execute', cmd=cmd, sound=command.get('sound'), seq=command.get('seq'), late_ms=round(late, 2))
+        if cmd == CMD_STOP:
+            self.backend.stop(command.get('group'))
+            print(f"⏹️ 정지 (seq {command.get('seq')})")
+        elif cmd == CMD_PLAY and command.get('sound'):
+            with Timer(self.play_ms):
+                voice = self.backend.play(self.clip_path(command), loops=int(command.get('loops', 0)),
+                                          group=command.get('group'))
+            print(f"🔊 {command['sound']} (seq {command.get('seq')}, 지연 {(now - due) * 1000:.1f}ms)")
+            if voice is not None and command.get('limit'):
+                self.queue.schedule(due + float(command['limit']), {'cmd': CMD_FADE, 'voice': voice})
+
+    def start(self):
+        self.running = True
+        targets = [self._serve_udp, self._sync_loop]
+        if self.tcp_port:
+            targets.append(self._serve_tcp)
+        for target in targets:
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def run(self):
+        """받기 스레드를 띄우고, 이 스레드에서 재생 시각에 맞춰 실행 (stop() 전까지)"""
+        self.start()
+        while self.running:
+            # backend의 다음 할 일 시각(ducking 해제 등)은 monotonic 기준이므로 남은 시간으로 변환
+            wakeup = self.backend.next_wakeup()
+            wake_at = None
+            if wakeup is not None:
+                wake_at = self.queue.clock() + max(0.0, wakeup - time.monotonic())
+            for due, command in self.queue.pop_due(wake_at):
+                self._execute(due, command)
+            self.backend.tick()
+
+    def stop(self):
+        self.running = False
+        self.queue.close()
+        for thread in self.threads:
+            thread.join(1.0)
+        self.backend.stop()
+
+    def stats(self):
+        q = self.queue
+        return {
+            'received': q.received,
+            'duplicates': q.duplicates,
+            'late': q.late,
+            'reordered': q.reordered,
+            'rejected': self.rejected,
+            'pending': len(q.heap),
+            'offset_ms': self.sync.offset * 1000,
+            'rtt_ms': None if self.sync.rtt is None else self.sync.rtt * 1000,
+            'late_ms': self.late_ms.snapshot(),
+            'lead_ms': self.lead_ms.snapshot(),
+        }
+
+
+def send(args):
+    """loopback 테스트용 송신기: 명령을 seq/시각을 붙여 보냄"""
+    encoder = CommandEncoder()
+    at = time.time() + args.delay
+    cmd = CMD_STOP if args.sound.upper() == 'STOP' else CMD_PLAY
+    msg = encoder.encode(None if cmd == CMD_STOP else args.sound, cmd=cmd, at=at,
+                         group=args.group, limit=args.limit)
+    if args.tcp:
+        with socket.create_connection((args.host, args.tcp)) as conn:
+            conn.sendall(msg + b'\n')
+    else:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp:
+            for _ in range(UDP_REPEAT):
+                udp.sendto(msg, (args.host, args.port))
+    print(f"📤 {json.loads(msg)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사운드 데몬으로 명령 한 개 보내기 (테스트용)")
+    parser.add_argument('sound', help="파일 이름 (예: hit.mp3) 또는 STOP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--tcp', type=int, help="UDP 대신 이 TCP 포트로 보냄")
+    parser.add_argument('--group', choices=list(CHANNEL_GROUPS), default=GROUP_CROWD, help="채널 그룹")
+    parser.add_argument('--limit', type=float, help="재생 제한 시간 (초)")
+    parser.add_argument('--delay', type=float, default=0.0, help="지금부터 몇 초 뒤에 재생할지")
+    send(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import itertools
+import json
+import time
+import uuid
+
+# ===================================================================
+# 서버 → 라즈베리파이 사운드 명령 형식
+#   {"src": "서버 실행 ID", "seq": 12, "t": 1712345678.123, "cmd": "play",
+#    "sound": "hit.mp3", "group": "crowd", "limit": 8, "loops": 0}
+#  - seq: 서버가 보낼 때마다 1씩 증가 → 라즈베리파이가 중복(재전송) 제거
+#  - t  : 재생해야 할 시각 (서버 시계 기준 epoch 초) → 늦게/순서 바뀌어 와도 제 시각에 재생
+#  - src: 서버가 다시 켜지면 바뀜 (seq가 1부터 다시 시작해도 중복으로 보지 않게)
+# 예전 형식(그냥 "hit.mp3" 문자열)도 그대로 받아서 바로 재생합니다.
+# ===================================================================
+DEFAULT_PORT = 12345
+UDP_REPEAT = 2   # UDP는 잃어버릴 수 있어서 같은 명령을 두 번 보냄 (받는 쪽에서 중복 제거)
+
+CMD_PLAY = 'play'
+CMD_STOP = 'stop'
+CMD_PING = 'ping'   # 라즈베리파이 → 서버: 시계 맞추기 (clock_sync.py)
+CMD_PONG = 'pong'   # 서버 → 라즈베리파이
+SERVER_SYNC_PORT = 12346    # 서버가 명령을 보내고 ping을 받는 UDP 포트
+
+
+def decode_command(data):
+    """받은 바이트 -> 명령 dict. 예전 형식(파일 이름만)이면 seq/t 없는 play 명령"""
+    text = data.decode('utf-8', errors='replace').strip()
+    if not text:
+        return None
+    if not text.startswith('{'):
+        return {'cmd': CMD_PLAY, 'sound': text}
+    try:
+        command = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(command, dict):
+        return None
+    command.setdefault('cmd', CMD_PLAY)
+    return command
+
+
+class CommandEncoder:
+    """seq 번호를 붙여 명령을 만드는 쪽 (server.py)"""
+
+    def __init__(self, src=None, clock=time.time):
+        self.src = src or uuid.uuid4().hex[:8]
+        self.clock = clock
+        self._seq = itertools.count(1)
+
+    def encode(self, sound=None, cmd=CMD_PLAY, at=None, **options):
+        """명령 한 개를 JSON 바이트로. at이 없으면 지금 시각"""
+        command = {
+            'src': self.src,
+            'seq': next(self._seq),
+            't': round(self.clock() if at is None else at, 4),
+            'cmd': cmd,
+        }
+        if sound:
+            command['sound'] = sound
+        command.update({k: v for k, v in options.items() if v is not None})
+        return json.dumps(command, ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,282 @@
+import collections
+import heapq
+import os
+from bisect import bisect_right
+import threading
+import time
+
+from clock_sync import Histogram
+from metrics import LOG
+
+# ===================================================================
+# 마감 시간(deadline) 기반 타임라인 스케줄러
+#  - 0.05초마다 깨어나 확인하는 대신, 다음 이벤트(또는 재생 제한 종료)까지 정확히 잠듦
+#  - time.monotonic() 사용 → 시스템 시계가 바뀌어도 흔들리지 않음
+#  - 같은 시각에 몰린 이벤트는 한 번에 모두 실행
+#  - 실제 실행 시각과 예정 시각의 차이(drift) 통계를 남김
+# ===================================================================
+KIND_LIMIT = 0      # 재생 제한 시간 종료 (같은 시각이면 새 이벤트보다 먼저 처리)
+KIND_EVENT = 1      # 타임라인 이벤트
+KIND_PRELOAD = 2    # 재생 몇 초 전에 클립 미리 디코딩
+FADEOUT_MS = 500
+PRELOAD_AHEAD = 5.0  # 재생 예정 시각보다 이만큼 먼저 디코딩 (초)
+DRIFT_WINDOW = 1000  # p95 계산에 쓰는 최근 지연 수 (데몬을 오래 켜 둬도 메모리가 늘지 않게)
+
+
+def clip_path(event, mp3_dir, clip_dirs=None):
+    """이벤트의 소리 파일 경로 (채널 그룹별 폴더가 있으면 그 폴더, 예: 선수 콜 → sound/)"""
+    directory = (clip_dirs or {}).get(event.get('channel'), mp3_dir)
+    return os.path.join(directory, event['file'])
+
+
+class SingleChannelBackend:
+    """채널 하나만 쓰는 재생기 공통 부분: 새 소리가 이전 소리를 끊음 (group 무시)
+
+    play()는 재생 번호(voice)를 돌려주고, fadeout(ms, voice)는 그 소리가 아직
+    재생 중일 때만 적용됩니다. (뒤에 시작한 소리를 예전 제한 시간이 끄지 않게)
+    """
+
+    def __init__(self):
+        self.generation = 0
+
+    def play(self, file_path, loops=0, group=None):
+        if not self._start(file_path, loops):
+            return None
+        self.generation += 1
+        return self.generation
+
+    def stop(self, group=None):
+        self.generation += 1
+        self._stop()
+
+    def fadeout(self, ms, voice=None):
+        if voice is not None and voice != self.generation:
+            return False
+        return self._fadeout(ms)
+
+    def prepare(self, file_path):
+        pass
+
+    def next_wakeup(self):
+        return None
+
+    def tick(self):
+        pass
+
+
+class PygameMusicBackend(SingleChannelBackend):
+    """pygame.mixer.music 으로 재생 (스트리밍, 메모리 적게 씀)"""
+
+    def __init__(self):
+        import pygame
+        super().__init__()
+        self.music = pygame.mixer.music
+
+    def _start(self, file_path, loops):
+        if not os.path.exists(file_path):
+            print(f"❌ 파일 없음: {file_path}")
+            return False
+        try:
+            self.music.load(file_path)
+            self.music.play(loops=loops)
+            return True
+        except Exception as e:
+            print(f"❌ 재생 에러: {e}")
+            return False
+
+    def _stop(self):
+        self.music.stop()
+
+    def _fadeout(self, ms):
+        if self.music.get_busy():
+            self.music.fadeout(ms)
+            return True
+        return False
+
+
+class FakeMixer(SingleChannelBackend):
+    """소리를 내지 않고 호출만 기록하는 믹서 (리눅스 PC 테스트용)"""
+
+    def __init__(self, clock=time.monotonic):
+        super().__init__()
+        self.clock = clock
+        self.calls = []
+        self.playing = None
+
+    def play(self, file_path, loops=0, group=None):
+        self.calls.append((self.clock(), 'play', os.path.basename(file_path), loops))
+        return super().play(file_path, loops, group)
+
+    def _start(self, file_path, loops):
+        self.playing = file_path
+        return True
+
+    def _stop(self):
+        self.calls.append((self.clock(), 'stop', None, None))
+        self.playing = None
+
+    def _fadeout(self, ms):
+        self.calls.append((self.clock(), 'fadeout', self.playing, ms))
+        busy = self.playing is not None
+        self.playing = None
+        return busy
+
+    def prepare(self, file_path):
+        self.calls.append((self.clock(), 'prepare', os.path.basename(file_path), None))
+
+
+class DriftStats:
+    """예정 시각 대비 실제 실행 지연 (ms). 건수/평균/최대는 전체, p95는 최근 window건 기준"""
+
+    def __init__(self, window=DRIFT_WINDOW):
+        self.samples = collections.deque(maxlen=window)
+        self.histogram = Histogram()    # /metrics의 pi_timeline_drift_ms (main.py에서 등록)
+
+    def add(self, drift):
+        self.samples.append(drift * 1000)
+        self.histogram.observe(drift * 1000)
+
+    def summary(self):
+        if not self.samples:
+            return {'count': 0}
+        values = sorted(self.samples)
+        histogram = self.histogram
+        return {
+            'count': histogram.count,
+            'mean_ms': histogram.total / histogram.count,
+            'p95_ms': values[min(len(values) - 1, int(len(values) * 0.95))],
+            'max_ms': histogram.max,
+        }
+
+
+class TimelineScheduler:
+    """parse_timeline() 결과를 한 주기(cycle_length초) 동안 정확한 시각에 실행합니다."""
+
+    def __init__(self, timeline, backend, mp3_dir, cycle_length, speed=1.0, clock=time.monotonic,
+                 preload_ahead=PRELOAD_AHEAD, clip_dirs=None):
+        self.timeline = timeline
+        self.backend = backend
+        self.mp3_dir = mp3_dir
+        self.clip_dirs = clip_dirs
+        self.cycle_length = cycle_length
+        self.speed = speed          # 1보다 크면 빨리 감기 (테스트용)
+        self.clock = clock
+        self.preload_ahead = preload_ahead
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()     # stop() / reload() 때 대기 중인 run_cycle을 깨움
+        self._pending_timeline = None
+        self.drift = DriftStats()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def reload(self, timeline):
+        """타임라인 교체 (재생 중이면 지금 위치 다음 이벤트부터 새 타임라인으로 이어감)"""
+        self._pending_timeline = timeline
+        self.wake_event.set()
+
+    def _deadline(self, start, seconds):
+        return start + seconds / self.speed
+
+    def run_cycle(self):
+        """타임라인 한 바퀴를 실행합니다. 중간에 stop()이 불리면 False."""
+        if self._pending_timeline is not None:
+            self.timeline, self._pending_timeline = self._pending_timeline, None
+        start = self.clock()
+        cycle_end = self._deadline(start, self.cycle_length)
+        heap = []
+        seq = 0
+        next_idx = 0
+        preload_idx = 0
+
+        def push_next_preload():
+            # 다음 'play' 이벤트의 디코딩 시각 (이미 지났으면 바로)
+            nonlocal preload_idx, seq
+            while preload_idx < len(self.timeline):
+                event = self.timeline[preload_idx]
+                preload_idx += 1
+                if event['type'] == 'play':
+                    deadline = self._deadline(start, max(0.0, event['time'] - self.preload_ahead))
+                    heapq.heappush(heap, (deadline, KIND_PRELOAD, seq, event))
+                    seq += 1
+                    return
+
+        def push_next_event():
+            nonlocal next_idx, seq
+            if next_idx < len(self.timeline):
+                event = self.timeline[next_idx]
+                heapq.heappush(heap, (self._deadline(start, event['time']), KIND_EVENT, seq, event))
+                seq += 1
+                next_idx += 1
+
+        push_next_event()
+        push_next_preload()
+
+        while True:
+            now = self.clock()
+            if now >= cycle_end:
+                self.backend.stop()
+                return True
+
+            # 시간이 된 항목은 모두 한 번에 처리
+            while heap and heap[0][0] <= now:
+                deadline, kind, _, item = heapq.heappop(heap)
+                if kind == KIND_PRELOAD:
+                    self.backend.prepare(clip_path(item, self.mp3_dir, self.clip_dirs))
+                    push_next_preload()
+                    continue
+
+                self.drift.add(now - deadline)
+                elapsed = (now - start) * self.speed
+
+                if kind == KIND_LIMIT:
+                    # item = 그 소리의 voice (이미 다른 소리로 바뀌었으면 backend가 무시)
+                    if self.backend.fadeout(FADEOUT_MS, item):
+                        print(f"   [Time: {elapsed:.1f}s] 지정 시간 종료 (Fadeout)")
+                    continue
+
+                print(f"⏰ [{elapsed:.1f}초] {item['raw']}")
+                LOG('pi_timeline', elapsed=round(elapsed, 3), raw=item['raw'], drift_ms=round((now - deadline) * 1000, 2))
+                if item['type'] == 'stop':
+                    self.backend.stop(item.get('channel'))
+                elif item['type'] == 'play':
+                    file_path = clip_path(item, self.mp3_dir, self.clip_dirs)
+                    voice = self.backend.play(file_path, loops=item['loops'], group=item.get('channel'))
+                    if voice is not None and item['limit']:
+                        # 제한 시간은 실제 실행 시각이 아니라 예정 시각 기준
+                        limit_deadline = deadline + item['limit'] / self.speed
+                        heapq.heappush(heap, (limit_deadline, KIND_LIMIT, seq, voice))
+                        seq += 1
+                push_next_event()
+
+            # 소리가 끝나는 시각(ducking 해제 등)이 되면 backend에 알림
+            wakeup = self.backend.next_wakeup()
+            if wakeup is not None and wakeup <= now:
+                self.backend.tick()
+                wakeup = self.backend.next_wakeup()
+
+            # 다음 마감 시간(또는 주기 끝)까지 정확히 대기
+            next_deadline = heap[0][0] if heap else cycle_end
+            if wakeup is not None:
+                next_deadline = min(next_deadline, wakeup)
+            wait = min(next_deadline, cycle_end) - self.clock()
+            if wait > 0:
+                self.wake_event.wait(wait)
+                self.wake_event.clear()
+            if self.stop_event.is_set():
+                self.backend.stop()
+                return False
+
+            if self._pending_timeline is not None:
+                # 새 타임라인으로 교체: 재생 중인 소리와 제한 시간은 그대로 두고,
+                # 아직 실행하지 않은 이벤트/미리 읽기만 새 타임라인의 현재 위치부터 다시 잡음
+                self.timeline, self._pending_timeline = self._pending_timeline, None
+                # now: 마지막으로 처리한 시각 (이 시각까지 예정된 이벤트는 이미 실행함)
+                elapsed = (now - start) * self.speed
+                heap = [entry for entry in heap if entry[1] == KIND_LIMIT]
+                heapq.heapify(heap)
+                next_idx = preload_idx = bisect_right([e['time'] for e in self.timeline], elapsed)
+                push_next_event()
+                push_next_preload()
+                print(f"🔁 타임라인 교체: {len(self.timeline)}개 이벤트, {elapsed:.1f}초부터 이어서 재생")
@@ -0,0 +1,137 @@
+import hashlib
+import math
+import os
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:     # numpy가 없으면 array('h')로 계산 (느리지만 동작함)
+    np = None
+
+# ===================================================================
+# 부팅음/알림음 합성
+#  - 샘플 하나씩 math.sin + struct.pack 하던 것을 numpy로 한 번에 계산
+#  - 시작/끝 페이드(envelope)로 딸깍 소리 제거, 여러 음을 겹친 화음 지원
+#  - 같은 설정으로 만든 소리는 디스크에 저장해두고 다음 부팅 때 그대로 읽음
+#  - 결과는 int16 PCM 버퍼 → bytes로 바꾸지 않고 pygame.mixer.Sound(buffer=...)에 그대로 넘김
+# ===================================================================
+SAMPLE_RATE = 44100
+AMPLITUDE = 32767
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tone_cache")
+
+# 부팅음: 도 -> 레 -> 미 (각 0.5초, 0.1초 간격)
+STARTUP_CHIME = [(261.63,), (293.66,), (329.63,)]
+STARTUP_TONE_SEC = 0.5
+STARTUP_GAP_SEC = 0.1
+STARTUP_ATTACK_SEC = 0.01    # 시작/끝 페이드 (딸깍 소리 제거)
+STARTUP_RELEASE_SEC = 0.05
+
+
+def render_tone(freqs, duration, sample_rate=SAMPLE_RATE, volume=1.0, attack=0.0, release=0.0):
+    """주파수(하나 또는 여러 개=화음)를 duration초 동안 합성한 int16 샘플"""
+    if isinstance(freqs, (int, float)):
+        freqs = (freqs,)
+    n_samples = int(sample_rate * duration)
+    attack_n = min(n_samples, int(sample_rate * attack))
+    release_n = min(n_samples - attack_n, int(sample_rate * release))
+    gain = AMPLITUDE * volume / len(freqs)
+
+    if np is not None:
+        t = np.arange(n_samples) / sample_rate
+        wave = np.zeros(n_samples)
+        for freq in freqs:
+            wave += np.sin(2.0 * np.pi * freq * t)
+        if attack_n:
+            wave[:attack_n] *= np.linspace(0.0, 1.0, attack_n, endpoint=False)
+        if release_n:
+            wave[n_samples - release_n:] *= np.linspace(1.0, 0.0, release_n)
+        return (wave * gain).astype(np.int16)
+
+    sin = math.sin
+    step = 2.0 * math.pi * freqs[0] / sample_rate
+    wave = [sin(step * i) * gain for i in range(n_samples)]
+    for freq in freqs[1:]:
+        step = 2.0 * math.pi * freq / sample_rate
+        wave = [w + sin(step * i) * gain for i, w in enumerate(wave)]
+    # 앞뒤 페이드 구간만 따로 곱함
+    for i in range(attack_n):
+        wave[i] *= i / attack_n
+    for k in range(release_n):
+        wave[n_samples - release_n + k] *= 1.0 - k / max(1, release_n - 1)
+    return array('h', map(int, wave))
+
+
+def render_sequence(notes, tone_sec, gap_sec, sample_rate=SAMPLE_RATE, **kwargs):
+    """음(화음) 여러 개를 간격을 두고 이어 붙인 버퍼 (부팅음처럼 한 번에 재생)"""
+    gap = int(sample_rate * gap_sec)
+    parts = []
+    for i, freqs in enumerate(notes):
+        parts.append(render_tone(freqs, tone_sec, sample_rate, **kwargs))
+        if gap and i < len(notes) - 1:
+            parts.append(np.zeros(gap, dtype=np.int16) if np is not None else array('h', bytes(2 * gap)))
+    if np is not None:
+        return np.concatenate(parts)
+    out = array('h')
+    for part in parts:
+        out.extend(part)
+    return out
+
+
+def cache_key(*params):
+    """합성 설정 -> 캐시 파일 이름"""
+    return hashlib.sha1(repr(params).encode('utf-8')).hexdigest()[:16]
+
+
+def cached_render(key_params, render, cache_dir=CACHE_DIR):
+    """디스크 캐시에 있으면 읽고, 없으면 render()로 만든 뒤 저장 (raw int16 PCM)"""
+    path = os.path.join(cache_dir, cache_key(*key_params) + ".pcm")
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if np is not None:
+            return np.frombuffer(data, dtype=np.int16)
+        samples = array('h')
+        samples.frombytes(data)
+        return samples
+
+    samples = render()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 임시 파일에 다 쓴 뒤 이름을 바꿈 → 쓰다가 꺼지거나 동시에 켜져도 잘린 .pcm을 읽지 않음
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(samples.tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"⚠️ 소리 캐시 저장 실패: {e}")
+    return samples
+
+
+def to_sound(samples):
+    """int16 모노 샘플 -> pygame Sound (mixer가 스테레오면 양쪽에 복사)"""
+    import pygame
+    _, _, channels = pygame.mixer.get_init()
+    if channels > 1:
+        if np is not None:
+            samples = np.repeat(samples, channels)
+        else:
+            samples = array('h', (s for s in samples for _ in range(channels)))
+    return pygame.mixer.Sound(buffer=samples)
+
+
+def startup_chime(sample_rate=SAMPLE_RATE, cache_dir=CACHE_DIR):
+    """부팅음 (도-레-미) 버퍼. 한 번 만들면 디스크 캐시에서 읽음"""
+    # 소리를 바꾸는 설정은 모두 키에 넣음 (하나라도 빠지면 고쳐도 예전 캐시를 읽음)
+    params = ('chime', tuple(STARTUP_CHIME), STARTUP_TONE_SEC, STARTUP_GAP_SEC, sample_rate,
+              STARTUP_ATTACK_SEC, STARTUP_RELEASE_SEC, AMPLITUDE)
+    return cached_render(
+        params,
+        lambda: render_sequence(STARTUP_CHIME, STARTUP_TONE_SEC, STARTUP_GAP_SEC, sample_rate,
+                                attack=STARTUP_ATTACK_SEC, release=STARTUP_RELEASE_SEC),
+        cache_dir,
+    )